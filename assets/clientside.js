@@ -0,0 +1,163 @@
+// Callbacks clientside (mode F1_CLIENTSIDE=1, voir f1dash/clientside.py), chargement
+// progressif des images de la bar race de l'accueil (f1dash/barrace.py), et largeur du
+// graphique de télémétrie (réduction LTTB côté serveur, voir f1dash/telemetry.py).
+// Les figures sont reconstruites à partir des agrégats envoyés une fois dans les
+// dcc.Store "pit-store" et "duel-store" : aucune requête serveur au changement de GP
+// ou d'écurie. Les figures de référence contiennent une valeur factice (SENTINEL)
+// remplacée ici par le GP, l'écurie ou le pilote.
+(function () {
+    var SENTINEL = "__f1_key__";
+
+    // Copie profonde d'un gabarit où chaque occurrence de SENTINEL devient `value`
+    function instantiate(template, value) {
+        var escaped = JSON.stringify(String(value)).slice(1, -1);
+        return JSON.parse(JSON.stringify(template).split(SENTINEL).join(escaped));
+    }
+
+    function withTemplate(store, layout) {
+        layout.template = store.template;
+        return layout;
+    }
+
+    function pitFigure(gp, store) {
+        if (!store) {
+            return window.dash_clientside.no_update;
+        }
+        var stops = store.gps[gp];
+        if (!stops) {
+            return {data: [], layout: withTemplate(store, instantiate(store.empty, gp))};
+        }
+        // Une trace empilée par pneu : [pneu, couleur, écuries, nb d'arrêts]
+        var data = stops.map(function (stop) {
+            var trace = instantiate(store.trace, stop[0]);
+            trace.marker.color = stop[1];
+            trace.x = stop[2];
+            trace.y = stop[3];
+            return trace;
+        });
+        return {data: data, layout: withTemplate(store, instantiate(store.layout, gp))};
+    }
+
+    function duel(team, store) {
+        var no_update = window.dash_clientside.no_update;
+        if (!store) {
+            return [no_update, no_update, no_update, no_update, no_update];
+        }
+        var bundle = store.teams[team];
+        if (!bundle) {  // 0 ou 1 pilote
+            var empty = {data: [], layout: withTemplate(store, instantiate(store.empty, team))};
+            return [empty, empty, null, null, null];
+        }
+        var bar = instantiate(store.bar.trace, team);
+        bar.marker.color = bundle.color;
+        bar.x = bundle.points;
+        bar.y = bundle.names;
+        bar.text = bundle.points;
+        // Une courbe par pilote : [pilote, couleur, GP, points cumulés]
+        var bump = bundle.cumul.map(function (serie) {
+            var trace = instantiate(store.bump.trace, serie[0]);
+            trace.line.color = serie[1];
+            trace.x = serie[2];
+            trace.y = serie[3];
+            return trace;
+        });
+        return [
+            {data: [bar], layout: withTemplate(store, instantiate(store.bar.layout, team))},
+            {data: bump, layout: withTemplate(store, instantiate(store.bump.layout, team))},
+            bundle.cards[0],
+            bundle.cards[1],
+            bundle.cards[2]
+        ];
+    }
+
+    // Images compactes de la bar race (voir f1dash/barrace.py) -> images Plotly
+    function decodeFrames(chunk, store) {
+        return chunk.frames.map(function (frame) {
+            var data = frame[1].map(function (trace) {
+                if (!Array.isArray(trace)) {
+                    return trace;  // trace envoyée telle quelle
+                }
+                var full = instantiate(store.meta[trace[0]], frame[0]);
+                full.x = trace[1];
+                full.y = trace[2].map(function (i) { return store.labels[i]; });
+                return full;
+            });
+            return {name: frame[0], data: data};
+        });
+    }
+
+    // Graphique Plotly dessiné dans le dcc.Graph `id` (attendu tant qu'il ne l'est pas)
+    function plotted(id) {
+        return new Promise(function (resolve, reject) {
+            var tries = 0;
+            (function wait() {
+                var outer = document.getElementById(id);
+                var gd = outer && (outer.classList.contains("js-plotly-plot") ? outer : outer.querySelector(".js-plotly-plot"));
+                if (gd && gd._fullLayout && window.Plotly) {
+                    resolve(gd);
+                } else if (++tries > 200) {
+                    reject(new Error("graphique " + id + " absent"));
+                } else {
+                    setTimeout(wait, 50);
+                }
+            })();
+        });
+    }
+
+    // Les paquets peuvent arriver dans le désordre (ou un GP live avant la fin du
+    // chargement) : chaque image est insérée à sa place dans l'ordre de la saison.
+    function barRaceFrames(chunk, store) {
+        if (!chunk || !store) {
+            return window.dash_clientside.no_update;
+        }
+        var frames = decodeFrames(chunk, store);
+        return plotted("fig-bar-race").then(function (gd) {
+            var ready = Promise.resolve();
+            if (chunk.reset || !gd._f1Slots) {
+                gd._f1Slots = {};
+                if (chunk.reset) {
+                    // Une image à la fois, de la dernière à la première (deleteFrames trie
+                    // ses indices comme des chaînes : 10 passerait avant 2)
+                    for (var i = gd._transitionData._frames.length - 1; i >= 0; i--) {
+                        ready = ready.then(Plotly.deleteFrames.bind(null, gd, [i]));
+                    }
+                }
+            }
+            return ready.then(function () {
+                var slots = gd._f1Slots;
+                var loaded = Object.keys(slots).map(function (name) { return slots[name]; });
+                var added = [], positions = [];
+                frames.forEach(function (frame, i) {
+                    var slot = chunk.start + i;
+                    if (!(frame.name in slots)) {
+                        // Position finale : images déjà chargées (ou de ce paquet) qui la précèdent
+                        positions.push(loaded.filter(function (s) { return s < slot; }).length);
+                        loaded.push(slot);
+                        slots[frame.name] = slot;
+                    } else {
+                        positions.push(null);  // même nom : Plotly remplace l'image existante
+                    }
+                    added.push(frame);
+                });
+                return Plotly.addFrames(gd, added, positions);
+            }).then(function () {
+                return Object.keys(gd._f1Slots).length;
+            });
+        });
+    }
+
+    // Largeur en pixels du graphique `id` : le serveur n'envoie pas plus de points par trace
+    function plotWidth(_, id) {
+        var el = document.getElementById(id);
+        return Math.round(el ? el.getBoundingClientRect().width : window.innerWidth) || null;
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        f1: {
+            pit_figure: pitFigure,
+            duel: duel,
+            bar_race_frames: barRaceFrames,
+            plot_width: plotWidth
+        }
+    });
+})();
@@ -0,0 +1,114 @@
+# Magasin Arrow projeté en mémoire (f1dash/arrowstore.py) vs lecture Parquet dans chaque
+# processus. N processus chargent toutes les tables de toutes les saisons (load_table,
+# toutes colonnes) et les gardent en mémoire, comme N workers. Mémoire lue dans
+# /proc/<pid>/smaps_rollup (Linux) : RSS, PSS (pages partagées réparties entre les
+# processus) et USS (pages propres au processus) ; la ligne "import seul" donne le
+# socle (interpréteur, pandas, pyarrow) commun aux deux modes.
+# --scale recopie chaque table k fois dans un DATA_DIR temporaire, pour mesurer à une
+# taille d'archive plus réaliste que le jeu de données de démonstration.
+#
+#   python benchmarks/bench_arrow_store.py --data-dir data --processes 4 --scale 200
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+from f1dash import data
+tables = []
+if sys.argv[1] == "load":
+    for name in data.TABLES:
+        for season in data.seasons(name):
+            df = data.load_table(name, season=season)
+            df.select_dtypes("number").sum()  # parcourt les colonnes numériques (pages chargées)
+            tables.append(df)
+line = json.dumps({"pid": os.getpid(), "load_s": time.perf_counter() - t0, "rows": sum(len(t) for t in tables)})
+os.write(1, (line + "\n").encode())
+sys.stdin.readline()
+"""
+
+
+def memory(pid):
+    """RSS, PSS et USS (Mo) d'un processus."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":"):
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    uss = fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0)
+    return {"rss_mb": fields["Rss"], "pss_mb": fields["Pss"], "uss_mb": uss}
+
+
+def run(n, data_dir, store, action="load"):
+    env = dict(os.environ, F1_DATA_DIR=data_dir, PYTHONPATH=ROOT, F1_ARROW_STORE="1" if store else "0")
+    procs = [
+        subprocess.Popen([sys.executable, "-c", PROBE, action], env=env, cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(n)
+    ]
+    try:
+        reports = [json.loads(proc.stdout.readline()) for proc in procs]
+        return [dict(r, **memory(r["pid"])) for r in reports]
+    finally:
+        for proc in procs:
+            proc.communicate("stop\n")
+
+
+def scaled_copy(data_dir, factor):
+    """DATA_DIR temporaire (fichiers à plat) où chaque saison de chaque table est répétée `factor` fois."""
+    sys.path.insert(0, ROOT)
+    os.environ["F1_DATA_DIR"] = data_dir
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from f1dash import data
+
+    target = tempfile.mkdtemp(prefix="f1-store-")
+    for name, prefix in data.TABLES.items():
+        for season in data.seasons(name):
+            table = data._read_source(name, None, season, None).drop_columns(["season"])
+            pq.write_table(pa.concat_tables([table] * factor), os.path.join(target, f"{prefix}_{season}.parquet"))
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mémoire de N processus : magasin Arrow projeté vs Parquet")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--scale", type=int, default=1, help="nombre de copies de chaque table")
+    args = parser.parse_args()
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("/proc/<pid>/smaps_rollup introuvable : mesure réservée à Linux")
+    data_dir = os.path.abspath(args.data_dir)
+    scratch = scaled_copy(data_dir, args.scale) if args.scale > 1 else None
+    try:
+        source = scratch or data_dir
+        t0 = time.perf_counter()
+        run(1, source, store=True)  # écrit le magasin s'il n'existe pas encore
+        print(f"magasin prêt en {time.perf_counter() - t0:.2f} s ({source})")
+        base = run(1, source, store=False, action="import")[0]
+        print(f"import seul             RSS {base['rss_mb']:6.0f} Mo  USS {base['uss_mb']:6.0f} Mo")
+        for store, label in ((False, "Parquet par processus"), (True, "magasin Arrow (mmap)")):
+            reports = run(args.processes, source, store)
+            pss = sum(r["pss_mb"] for r in reports)
+            print(f"{args.processes} processus, {label} : {reports[0]['rows']} lignes chacun, PSS total {pss:.0f} Mo")
+            for r in reports:
+                print(
+                    f"  chargement {r['load_s']:6.2f} s  RSS {r['rss_mb']:6.0f} Mo  PSS {r['pss_mb']:6.0f} Mo"
+                    f"  USS {r['uss_mb']:6.0f} Mo (données {r['uss_mb'] - base['uss_mb']:+6.0f} Mo)"
+                )
+    finally:
+        if scratch:
+            shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# Bar race de l'accueil : figure animée complète (version d'origine) vs livraison
+# progressive (figure de base, puis images compactes par paquets, voir f1dash/barrace.py).
+# Pour chaque saison : octets envoyés (bruts et gzip), sérialisation côté serveur,
+# JSON.parse côté navigateur (mesuré avec node s'il est installé) et estimation du délai
+# avant premier affichage à un débit donné. Le rendu Plotly de la première image est le
+# même dans les deux cas et n'est pas compté. Vérifie aussi que les images reconstruites
+# (même décodage que assets/clientside.js) sont identiques à celles de plotly express.
+#
+#   python benchmarks/bench_bar_race.py --data-dir data --mbps 10
+import argparse
+import base64
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NODE_PARSE = r"""
+const text = require("fs").readFileSync(process.argv[1], "utf8");
+const repeat = 20;
+let best = Infinity;
+for (let i = 0; i < repeat; i++) {
+    const t = process.hrtime.bigint();
+    JSON.parse(text);
+    best = Math.min(best, Number(process.hrtime.bigint() - t) / 1e6);
+}
+console.log(best);
+"""
+
+
+def decode_arrays(obj):
+    """Remplace les tableaux binaires plotly ({"dtype", "bdata"}) par des listes."""
+    if isinstance(obj, dict):
+        if set(obj) >= {"dtype", "bdata"}:
+            values = np.frombuffer(base64.b64decode(obj["bdata"]), dtype=obj["dtype"]).tolist()
+            return [None if v != v else v for v in values]
+        return {k: decode_arrays(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [decode_arrays(v) for v in obj]
+    return obj
+
+
+def expand_frames(frames, meta, labels, sentinel):
+    """Équivalent Python de decodeFrames (assets/clientside.js)."""
+    out = []
+    for name, traces in frames:
+        data = []
+        for trace in traces:
+            if isinstance(trace, dict):
+                data.append(trace)
+                continue
+            escaped = json.dumps(name)[1:-1]
+            full = json.loads(json.dumps(meta[trace[0]]).replace(sentinel, escaped))
+            full["x"] = trace[1]
+            full["y"] = [labels[i] for i in trace[2]]
+            data.append(full)
+        out.append({"name": name, "data": data})
+    return out
+
+
+def best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def node_parse_ms(text):
+    if shutil.which("node") is None:
+        return None
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        f.write(text)
+    try:
+        out = subprocess.run(["node", "-e", NODE_PARSE, f.name], capture_output=True, text=True, check=True)
+        return float(out.stdout)
+    finally:
+        os.remove(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poids et délai de premier affichage de la bar race")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--mbps", type=float, default=10.0, help="débit descendant supposé (Mbit/s)")
+    args = parser.parse_args()
+    os.environ["F1_DATA_DIR"] = os.path.abspath(args.data_dir)
+    sys.path.insert(0, ROOT)
+    from plotly.io.json import to_json_plotly
+
+    import dashboard
+    from f1dash.barrace import CHUNK_FRAMES, chunk, split_bar_race
+    from f1dash.clientside import SENTINEL
+    from f1dash.data import seasons
+
+    def transfer_ms(n_bytes):
+        return n_bytes * 8 / (args.mbps * 1e6) * 1e3
+
+    print(f"débit supposé {args.mbps:g} Mbit/s ; délai = sérialisation + transfert + JSON.parse")
+    for season in seasons():
+        fig = dashboard.bar_race_anim(season)
+        t_split, (base, meta, labels, frames) = best_of(lambda: split_bar_race(fig))
+        reference = decode_arrays(json.loads(to_json_plotly(fig)))
+        assert expand_frames(frames, meta, labels, SENTINEL) == reference.pop("frames"), season
+        assert decode_arrays(base) == reference, season
+
+        store = {"season": season, "meta": meta, "labels": labels}
+        t_full, full_text = best_of(lambda: to_json_plotly(fig))
+        t_first, first_text = best_of(lambda: to_json_plotly([base, store]))
+        chunks = [to_json_plotly(chunk(frames, i)) for i in range(-(-len(frames) // CHUNK_FRAMES))]
+        rest = sum(len(c.encode()) for c in chunks)
+
+        print(f"saison {season} : {len(fig.frames)} GP, {len(labels)} pilotes (découpage {t_split * 1e3:.1f} ms, une fois par version)")
+        rows = [("avant : figure complète", full_text, t_full), ("après : base + gabarits", first_text, t_first)]
+        for label, text, t_ser in rows:
+            raw = len(text.encode())
+            parse = node_parse_ms(text)
+            ttfr = t_ser * 1e3 + transfer_ms(raw) + (parse or 0.0)
+            print(
+                f"  {label:<26} {raw / 1e3:8.1f} ko (gzip {len(gzip.compress(text.encode())) / 1e3:7.1f} ko)"
+                f"  sérialisation {t_ser * 1e3:6.2f} ms  parse {'n/a' if parse is None else f'{parse:6.2f} ms'}"
+                f"  premier affichage ≈ {ttfr:7.1f} ms"
+            )
+        print(f"  {'images, en arrière-plan':<26} {rest / 1e3:8.1f} ko en {len(chunks)} paquet(s) de {CHUNK_FRAMES} images")
+
+
+if __name__ == "__main__":
+    main()
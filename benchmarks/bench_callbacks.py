@@ -0,0 +1,168 @@
+# Latence des callbacks interactifs : implémentation d'origine vs version indexée/mémorisée.
+# Vérifie aussi, pour chaque valeur possible du dropdown, que les figures sont identiques,
+# et compare les octets envoyés par les callbacks serveur à ceux du mode clientside.
+#
+#   python benchmarks/bench_callbacks.py --data-dir data
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_update_pit_plot(dashboard, gp):
+    """update_pit_plot d'origine : filtre complet + groupby + px.bar à chaque appel."""
+    import plotly.graph_objects as go
+
+    pits_valid = dashboard.get_model().pits
+    data = pits_valid[pits_valid["event"] == gp]
+    if data.empty:
+        fig_pit = go.Figure()
+        fig_pit.update_layout(title=f"Aucune donnée d'arrêts pour {gp}", template='plotly_dark', height=550)
+        return fig_pit
+    bar_data = data.groupby(['TeamName', 'CompoundIn']).size().reset_index(name='NbArrets')
+    bar_data["TeamTotal"] = bar_data.groupby("TeamName")["NbArrets"].transform("sum")
+    bar_data = bar_data.sort_values(["TeamTotal", "TeamName"], ascending=[False, True])
+    return dashboard.create_pit_fig(gp, bar_data)
+
+
+def legacy_update_duel(dashboard, team):
+    """update_duel d'origine : filtres, groupby et pivot recalculés à chaque sélection."""
+    import dash_bootstrap_components as dbc
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from dash import html
+
+    model = dashboard.get_model()
+    df_results, df_drv_stand, team_colors = model.results, model.standings, model.team_colors
+    sub = df_results[df_results["TeamName"] == team]
+    score = sub.groupby('FullName')['Points'].sum().sort_values(ascending=False)
+    pilotes = score.index.tolist()
+    bar = px.bar(
+        score, x=score.values, y=score.index, orientation='h',
+        color_discrete_sequence=[team_colors.get(team, "#fff")]*len(pilotes),
+        text=score.values, labels={'y': 'Pilote', 'x': 'Points'},
+        title=f"<b>Points par Pilote – {team}</b>"
+    )
+    bar.update_layout(
+        template="plotly_dark", showlegend=False, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False, autorange="reversed"),
+        height=350, uniformtext_minsize=8, uniformtext_mode='hide', title_x=0.5
+    )
+    bar.update_traces(marker_line_width=0, marker_cornerradius=8, textposition='outside')
+    cumul = (df_drv_stand[df_drv_stand["TeamName"] == team].sort_values(['FullName', 'round'])
+             .groupby(['FullName', 'round'])['Points'].sum().groupby(level=0).cumsum().reset_index(name='PointsCum'))
+    cumul['event'] = cumul['round'].map(df_results.set_index('round')['event'].to_dict())
+    pilot_color_map = {p: c for p, c in zip(pilotes, px.colors.qualitative.Plotly)}
+    bump = px.line(
+        cumul, x='event', y='PointsCum', color='FullName', markers=True,
+        title=f"<b>Progression Saison – {team}</b>",
+        labels={'event': 'Grand Prix', 'PointsCum': 'Points Cumulés', 'FullName': 'Pilote'},
+        color_discrete_map=pilot_color_map
+    )
+    bump.update_layout(
+        template="plotly_dark", height=350, paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)', xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=False, zeroline=False), title_x=0.5
+    )
+
+    def create_driver_card_content(p_name, p_score):
+        row = sub[sub["FullName"] == p_name].iloc[0]
+        url = dashboard.pilot_img_url(row)
+        return [
+            html.Img(src=url, className="mb-3 mx-auto d-block", style={
+                "width": "120px", "height": "120px", "borderRadius": "50%",
+                "objectFit": "cover", "border": f"5px solid {team_colors.get(team, '#fff')}"
+            }),
+            html.H4(p_name, className="mb-2"),
+            html.Div([
+                html.Span("Points", className="text-muted d-block"),
+                html.H3(p_score, className="font-weight-bold")
+            ])
+        ]
+
+    if len(pilotes) == 2:
+        p1, p2 = pilotes[0], pilotes[1]
+        h2h_races = sub.pivot(index='event', columns='FullName', values='Position').dropna()
+        p1_wins = (h2h_races[p1] < h2h_races[p2]).sum()
+        p2_wins = (h2h_races[p2] < h2h_races[p1]).sum()
+        col1 = dbc.Card(create_driver_card_content(p1, score[p1]), className="styled-card text-center p-3 h-100")
+        col3 = dbc.Card(create_driver_card_content(p2, score[p2]), className="styled-card text-center p-3 h-100")
+        col2 = dbc.Card([
+            html.H5("Face-à-Face en Course", className="mb-3"),
+            html.H1(f"{p1_wins} - {p2_wins}", className="my-auto display-4")
+        ], className="styled-card text-center p-3 h-100 d-flex flex-column justify-content-center")
+        return bar, bump, col1, col2, col3
+    elif len(pilotes) >= 3:
+        cols = [dbc.Card(create_driver_card_content(p, score[p]), className="styled-card text-center p-3 h-100") for p in pilotes[:3]]
+        return bar, bump, cols[0], cols[1], cols[2]
+    empty_fig = go.Figure().update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', annotations=[dict(text="Pas assez de données", showarrow=False)])
+    return empty_fig, empty_fig, None, None, None
+
+
+def as_json(value):
+    import json
+
+    from plotly.utils import PlotlyJSONEncoder
+    return json.dumps(value, cls=PlotlyJSONEncoder, sort_keys=True)
+
+
+def latencies(func, values, rounds):
+    out = []
+    for _ in range(rounds):
+        for value in values:
+            t = time.perf_counter()
+            func(value)
+            out.append((time.perf_counter() - t) * 1e3)
+    return out
+
+
+def report(label, values):
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+    print(f"  {label:<28} moyenne={statistics.mean(values):8.3f} ms  p50={statistics.median(values):8.3f} ms  p95={p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence des callbacks du dashboard")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    os.environ["F1_DATA_DIR"] = os.path.abspath(args.data_dir)
+    # Figures comparées et mesurées en go.Figure, sans la mise en forme de f1dash.transport
+    os.environ["F1_TRANSPORT"] = "0"
+    sys.path.insert(0, ROOT)
+    import dashboard
+
+    gps = list(dashboard.get_model().gp_order)
+    for gp in gps:
+        assert legacy_update_pit_plot(dashboard, gp).to_json() == dashboard.update_pit_plot(gp).to_json(), gp
+    teams = sorted(dashboard.get_model().results["TeamName"].unique())
+    for team in teams:
+        assert as_json(legacy_update_duel(dashboard, team)) == as_json(dashboard.update_duel(team)), team
+    dashboard.FIGURE_CACHE.clear()
+
+    print(f"update_pit_plot ({len(gps)} GP, {args.rounds} passages)")
+    report("avant (filtre + groupby)", latencies(lambda gp: legacy_update_pit_plot(dashboard, gp), gps, args.rounds))
+    report("après, 1er appel par GP", latencies(dashboard.update_pit_plot, gps, 1))
+    report("après, appels suivants", latencies(dashboard.update_pit_plot, gps, args.rounds))
+
+    print(f"update_duel ({len(teams)} écuries, {args.rounds} passages)")
+    report("avant (filtres + pivot)", latencies(lambda team: legacy_update_duel(dashboard, team), teams, args.rounds))
+    report("après, 1er appel par écurie", latencies(dashboard.update_duel, teams, 1))
+    report("après, appels suivants", latencies(dashboard.update_duel, teams, args.rounds))
+
+    # Mode clientside (F1_CLIENTSIDE=1) : un Store par page, puis plus aucune requête
+    print("octets envoyés au navigateur (serveur : parcours de toutes les valeurs du dropdown)")
+    for label, store, func, values in [
+        ("pneus par GP", dashboard.pit_store_data, dashboard.update_pit_plot, gps),
+        ("duels", dashboard.duel_store_data, dashboard.update_duel, teams),
+    ]:
+        server = sum(len(as_json(func(value))) for value in values)
+        print(f"  {label:<14} serveur={server / 1e3:8.1f} ko ({len(values)} requêtes)  clientside={len(as_json(store())) / 1e3:8.1f} ko (Store, 0 requête)")
+
+
+if __name__ == "__main__":
+    main()
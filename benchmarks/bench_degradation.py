@@ -0,0 +1,73 @@
+# Dégradation des pneus : ajustement relais par relais (groupby + np.polyfit, une droite par
+# relais) vs moteur par lots de f1dash.degradation (sommes des moindres carrés accumulées par
+# np.bincount sur tous les relais à la fois), sur le magasin des tours rapides de N saisons
+# synthétiques (benchmarks/synthetic.py). Vérifie que les deux donnent les mêmes pentes, puis
+# mesure le moteur complet (écart des tours aberrants, second ajustement) et les agrégats de la page.
+#
+#   python benchmarks/bench_degradation.py --seasons 1,10,40
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(func, repeat=1):
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = func()
+        ms = (time.perf_counter() - t) * 1e3
+        best = ms if best is None else min(best, ms)
+    return out, best
+
+
+def polyfit_stints(laps, fuel):
+    """Ancienne approche : une régression np.polyfit par relais, dans une boucle Python."""
+    rows = []
+    for key, stint in laps.groupby(["season", "round", "Driver", "Stint"], sort=True):
+        if len(stint) < 5:
+            continue
+        y = stint["LapTime"].to_numpy() + fuel * (stint["LapNumber"].to_numpy() - 1)
+        deg, base = np.polyfit(stint["TyreLife"].to_numpy(), y, 1)
+        rows.append((*key, deg, base))
+    return pd.DataFrame(rows, columns=["season", "round", "Driver", "Stint", "deg", "base"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dégradation : np.polyfit par relais vs ajustement par lots")
+    parser.add_argument("--seasons", default="1,10,40", help="tailles d'archive (saisons) à mesurer")
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--events", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import synthetic
+    from f1dash import degradation
+
+    sizes = [int(n) for n in args.seasons.split(",")]
+    store = pd.concat([
+        synthetic.season_tables(s, args.drivers, args.events)["laps"].assign(season=s)
+        for s in range(2025 - max(sizes) + 1, 2026)
+    ], ignore_index=True)
+    for n in sizes:
+        laps = store[store["season"] > 2025 - n]
+        legacy, legacy_ms = timed(lambda: polyfit_stints(laps, degradation.FUEL_S_PER_LAP))
+        batched, batched_ms = timed(lambda: degradation.fit_stints(laps, trim=False), args.repeat)
+        same = len(legacy) == len(batched) and np.allclose(legacy["deg"], batched["deg"]) and np.allclose(legacy["base"], batched["base"])
+        stints, full_ms = timed(lambda: degradation.fit_stints(laps), args.repeat)
+        _, summary_ms = timed(lambda: (degradation.summarize(stints, ["Team", "Compound"]), degradation.summarize(stints, ["event", "Compound"])), args.repeat)
+        print(f"{n:>3} saison(s) : {len(laps):>8} tours, {len(stints):>6} relais")
+        print(f"    np.polyfit par relais       {legacy_ms:9.1f} ms")
+        print(f"    par lots (bincount)         {batched_ms:9.1f} ms   x{legacy_ms / batched_ms:.0f}   mêmes pentes : {'oui' if same else 'NON'}")
+        print(f"    moteur complet (2 passes)   {full_ms:9.1f} ms   agrégats écurie/circuit {summary_ms:.1f} ms")
+        print("    dégradation moyenne : " + ", ".join(f"{c} {d:.3f} s/tour" for c, d in degradation.summarize(stints, "Compound")[["Compound", "deg"]].itertuples(index=False)))
+
+
+if __name__ == "__main__":
+    main()
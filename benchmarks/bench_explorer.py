@@ -0,0 +1,81 @@
+# Nuages de l'Explorer à grand nombre de points : un marqueur SVG par résultat (px.scatter
+# d'origine) vs rendu automatique (f1dash.scatter : SVG, WebGL au-delà de F1_WEBGL_ROWS,
+# densité agrégée au-delà de F1_DENSITY_ROWS). Pour chaque taille : construction de la
+# figure, octets JSON envoyés au navigateur (to_json_plotly, comme Dash), et en mode densité
+# le rebinning d'une zone zoomée (callback update_explorer).
+#
+#   python benchmarks/bench_explorer.py --rows 1000,10000,100000,1000000
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def points(n, seed=0):
+    """`n` résultats aléatoires avec les colonnes des nuages (départ/arrivée et PCA)."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    grid = rng.integers(1, 21, n)
+    position = np.clip(grid + rng.integers(-6, 7, n), 1, 20)
+    return pd.DataFrame({
+        "GridPosition": grid.astype(float),
+        "Position": position.astype(float),
+        "Points": np.where(position <= 10, 26 - 2 * position, 0).clip(0).astype(float),
+        "TeamName": np.char.add("Team", (rng.integers(0, 10, n)).astype(str)),
+        "FullName": np.char.add("Driver ", (rng.integers(0, 40, n)).astype(str)),
+        "event": np.char.add("GP", (rng.integers(1, 25, n)).astype(str)),
+        "PC1": rng.normal(0, 1.5, n),
+        "PC2": rng.normal(0, 1.0, n),
+    })
+
+
+def legacy_scatter(df):
+    import plotly.express as px
+
+    return px.scatter(
+        df, x="GridPosition", y="Position", color="TeamName",
+        size="Points", hover_name="FullName", hover_data=['event'], render_mode="svg",
+    )
+
+
+def measure(build):
+    from plotly.io.json import to_json_plotly
+
+    from f1dash.transport import pack_figure
+
+    t = time.perf_counter()
+    fig = pack_figure(build())
+    ms = (time.perf_counter() - t) * 1e3
+    return ms, len(to_json_plotly(fig)) / 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nuages de l'Explorer : SVG d'origine vs rendu selon le volume")
+    parser.add_argument("--rows", default="1000,10000,100000,1000000")
+    parser.add_argument("--legacy-max", type=int, default=100000, help="taille au-delà de laquelle le SVG d'origine n'est plus mesuré")
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    import dashboard
+    from f1dash.scatter import render_mode
+
+    for n in (int(r) for r in args.rows.split(",")):
+        df = points(n)
+        print(f"{n} points (mode {render_mode(n)})")
+        if n <= args.legacy_max:
+            ms, kb = measure(lambda: legacy_scatter(df))
+            print(f"  départ/arrivée SVG d'origine  {ms:9.1f} ms  {kb:10.1f} ko")
+        for kind, build in dashboard.EXPLORER_FIGS.items():
+            ms, kb = measure(lambda: build(df, {}))
+            print(f"  {kind:<8} automatique          {ms:9.1f} ms  {kb:10.1f} ko")
+        if render_mode(n) == "density":
+            zoom = {"x": (3.0, 9.0), "y": (1.0, 8.0)}
+            ms, kb = measure(lambda: dashboard.explorer_scatter_fig(df, {}, zoom))
+            print(f"  zoom départ/arrivée (rebinning) {ms:7.1f} ms  {kb:10.1f} ko")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Benchmark de la heatmap grille -> arrivée : ancienne double boucle vs builder vectorisé.
+# Vérifie aussi que les deux produisent exactement les mêmes matrices et textes.
+#
+#   python benchmarks/bench_heatmap.py
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from f1dash.heatmap import build_heatmap_data  # noqa: E402
+
+
+def legacy_heatmap_data(df_results, gp_order):
+    """Implémentation d'origine de strategie_layout (trois pivots + boucle par cellule)."""
+    pilot_order = df_results.groupby("FullName")["Position"].sum().sort_values().index.tolist()
+    pivot = df_results.pivot_table(index='FullName', columns='event', values='delta').reindex(index=pilot_order, columns=gp_order)
+    gridpos = df_results.pivot_table(index='FullName', columns='event', values='GridPosition').reindex(index=pilot_order, columns=gp_order)
+    arrpos = df_results.pivot_table(index='FullName', columns='event', values='Position').reindex(index=pilot_order, columns=gp_order)
+    hovertext = np.empty(pivot.shape, dtype=object)
+    textvals = np.empty(pivot.shape, dtype=object)
+    for i, name in enumerate(pivot.index):
+        for j, ev in enumerate(pivot.columns):
+            val = pivot.iloc[i, j]
+            grid = gridpos.iloc[i, j]
+            arr = arrpos.iloc[i, j]
+            sign = "+" if pd.notna(val) and val > 0 else ""
+            textvals[i, j] = f"{sign}{int(val) if pd.notna(val) else ''}"
+            hovertext[i, j] = (
+                f"Grand Prix : <b>{ev}</b><br>"
+                f"Pilote : <b>{name}</b><br>"
+                f"Positions gagnées/perdues : <b>{sign}{val if pd.notna(val) else 'N/A'}</b><br>"
+                f"Position départ : <b>{int(grid) if pd.notna(grid) else 'N/A'}</b><br>"
+                f"Position arrivée : <b>{int(arr) if pd.notna(arr) else 'N/A'}</b>"
+            )
+    return pivot, textvals, hovertext
+
+
+def synthetic_results(n_drivers, n_events, seed=0):
+    rng = np.random.default_rng(seed)
+    drivers = [f"Pilote {i:04d}" for i in range(n_drivers)]
+    events = [f"GP {j:04d}" for j in range(n_events)]
+    df = pd.DataFrame({
+        "FullName": np.repeat(drivers, n_events),
+        "event": np.tile(events, n_drivers),
+        "round": np.tile(np.arange(1, n_events + 1), n_drivers),
+        "GridPosition": rng.integers(1, 21, n_drivers * n_events).astype(float),
+        "Position": rng.integers(1, 21, n_drivers * n_events).astype(float),
+    })
+    # Trous réalistes : pilotes absents de certains GP, positions non classées
+    df = df.sample(frac=0.9, random_state=seed)
+    df.loc[df.sample(frac=0.05, random_state=seed + 1).index, "Position"] = np.nan
+    # Quelques doublons (pilote, GP) : le pivot fait la moyenne -> deltas non entiers
+    dup = df.sample(frac=0.01, random_state=seed + 2).assign(Position=lambda d: d["Position"] + 1)
+    df = pd.concat([df, dup], ignore_index=True)
+    df["delta"] = df["GridPosition"] - df["Position"]
+    return df, events
+
+
+def timed(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = func(*args)
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def main():
+    print(f"{'pilotes':>8} {'GP':>6} {'cellules':>10} {'boucle (s)':>11} {'vectorisé (s)':>14} {'gain':>7}")
+    for n_drivers, n_events in [(20, 24), (40, 48), (80, 120), (160, 240), (320, 480)]:
+        df, events = synthetic_results(n_drivers, n_events)
+        t_old, old = timed(legacy_heatmap_data, df, events, repeat=1 if n_drivers * n_events > 20000 else 3)
+        t_new, new = timed(build_heatmap_data, df, events)
+        pd.testing.assert_frame_equal(old[0], new[0])
+        assert (old[1] == new[1]).all() and (old[2] == new[2]).all(), "sorties différentes"
+        print(f"{n_drivers:>8} {n_events:>6} {n_drivers * n_events:>10} {t_old:>11.3f} {t_new:>14.4f} {t_old / t_new:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
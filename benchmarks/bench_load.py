@@ -0,0 +1,280 @@
+# Test de charge local : combien de visiteurs simultanés une instance du serveur tient-elle ?
+# Des visiteurs simulés rejouent des sessions réalistes contre le serveur lancé sur
+# 127.0.0.1 : chargement d'une page (GET /, /strategie, /duels, /records, /co2 ou
+# /explorer puis callback display_page), navigation vers les autres pages (display_page),
+# choix de GP sur la page stratégie (callback dropdown-gp) et d'écuries sur la page duels
+# (callback select-team), le tout en POST sur /_dash-update-component comme le navigateur.
+# Une configuration = N workers x T threads :
+#   - gunicorn (gunicorn.conf.py : préchargement puis fork, worker gthread) s'il est installé ;
+#   - sinon serveur werkzeug pré-forké équivalent : le maître précharge le dashboard, puis
+#     N processus acceptent sur la même socket, T requêtes à la fois chacun.
+# Les visiteurs enchaînent les requêtes sans pause (charge maximale) et tournent dans des
+# processus clients séparés ; sur une machine de test, ils prennent du CPU au serveur.
+# Résultat par configuration : débit (requêtes et sessions par seconde), erreurs et
+# latences p50/p95/p99, au total et par type de requête.
+#
+#   python benchmarks/bench_load.py --data-dir data --workers 1,2,4 --threads 1,4 --users 16 --duration 20
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["/", "/strategie", "/duels", "/records", "/co2", "/explorer"]
+PAGE_OUTPUT = "..page-content.children...main-container.className.."
+PIT_OUTPUT = "fig-pit-gp.figure"
+DUEL_OUTPUT = "..fig-bar-duel.figure...fig-bump-duel.figure...duel-col-1.children...duel-col-2.children...duel-col-3.children.."
+KINDS = ["page", "display_page", "update_pit_plot", "update_duel"]
+
+# Serveur werkzeug pré-forké (si gunicorn est absent) : mêmes étapes que gunicorn.conf.py
+SERVER = r"""
+import concurrent.futures, gc, os, signal, socket, sys
+port, workers, threads = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+import dashboard
+from werkzeug.serving import BaseWSGIServer
+
+class PooledServer(BaseWSGIServer):
+    # T requêtes traitées à la fois par worker, comme le worker gthread de gunicorn
+    def serve_forever(self, poll_interval=0.5):
+        self.pool = concurrent.futures.ThreadPoolExecutor(threads)
+        super().serve_forever(poll_interval)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+dashboard.preload()
+sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+sock.bind(("127.0.0.1", port))
+sock.listen(1024)
+gc.collect()
+gc.freeze()
+children = []
+for _ in range(workers):
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, lambda *_: os._exit(0))
+        PooledServer("127.0.0.1", port, dashboard.server, fd=sock.fileno()).serve_forever()
+        os._exit(0)
+    children.append(pid)
+
+def stop(*_):
+    for pid in children:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    sys.exit(0)
+
+signal.signal(signal.SIGTERM, stop)
+signal.pause()
+"""
+
+
+def outputs(output):
+    """Chaîne "output" d'une dépendance Dash -> sorties attendues dans le corps de la requête."""
+    if output.startswith(".."):
+        return [dict(zip(("id", "property"), part.rsplit(".", 1))) for part in output[2:-2].split("...")]
+    component, prop = output.rsplit(".", 1)
+    return {"id": component, "property": prop}
+
+
+def callback_body(output, component, prop, value, inputs=(), state=()):
+    """Corps JSON d'un POST /_dash-update-component déclenché par `component.prop`."""
+    return json.dumps({
+        "output": output,
+        "outputs": outputs(output),
+        "inputs": [{"id": component, "property": prop, "value": value}, *inputs],
+        "changedPropIds": [f"{component}.{prop}"],
+        "state": list(state),
+    })
+
+
+SEASON = {"id": "season-select", "property": "value", "value": None}  # saison la plus récente
+
+
+def session_requests(rng, gps, teams, clicks):
+    """Requêtes d'une visite : (type, méthode, chemin, corps)."""
+    landing = rng.choice(PAGES)
+    order = [landing] + rng.sample([p for p in PAGES if p != landing], len(PAGES) - 1)
+    out = [("page", "GET", landing, None)]
+    for page in order:
+        out.append(("display_page", "POST", "/_dash-update-component",
+                    callback_body(PAGE_OUTPUT, "url", "pathname", page, inputs=[SEASON])))
+        if page == "/strategie":
+            out += [("update_pit_plot", "POST", "/_dash-update-component",
+                     callback_body(PIT_OUTPUT, "dropdown-gp", "value", rng.choice(gps), state=[SEASON]))
+                    for _ in range(clicks)]
+        elif page == "/duels":
+            out += [("update_duel", "POST", "/_dash-update-component",
+                     callback_body(DUEL_OUTPUT, "select-team", "value", rng.choice(teams), state=[SEASON]))
+                    for _ in range(clicks)]
+    return out
+
+
+def send(port, method, path, body):
+    """Une requête sur une connexion neuve (Connection: close) ; retourne le code HTTP."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    try:
+        headers = {"Accept-Encoding": "gzip", "Connection": "close"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return 0
+    finally:
+        conn.close()
+
+
+def client(spec):
+    """Processus client : spec["users"] visiteurs (threads) jusqu'à spec["stop"] (horloge time.time)."""
+    samples, sessions, lock = [], [], threading.Lock()
+
+    def visitor(seed):
+        rng = random.Random(seed)
+        while time.time() < spec["stop"]:
+            for kind, method, path, body in session_requests(rng, spec["gps"], spec["teams"], spec["clicks"]):
+                if time.time() >= spec["stop"]:
+                    return
+                start = time.time()
+                status = send(spec["port"], method, path, body)
+                with lock:
+                    samples.append((kind, start, (time.time() - start) * 1e3, status))
+            with lock:
+                sessions.append(time.time())  # fin de la visite
+
+    threads = [threading.Thread(target=visitor, args=(spec["seed"] + i,)) for i in range(spec["users"])]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(json.dumps({"samples": samples, "sessions": sessions}), flush=True)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, port, workers, threads, env, timeout):
+    """Lance le serveur et attend qu'il réponde (préchargement compris)."""
+    if kind == "gunicorn":
+        env = dict(env, F1_BIND=f"127.0.0.1:{port}", F1_WORKERS=str(workers), F1_THREADS=str(threads))
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning"]
+    else:
+        cmd = [sys.executable, "-c", SERVER, str(port), str(workers), str(threads)]
+    proc = subprocess.Popen(cmd, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"serveur arrêté au démarrage (code {proc.returncode})")
+        if send(port, "GET", "/_dash-dependencies", None) == 200:
+            return proc
+        time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"serveur pas prêt après {timeout:.0f} s")
+
+
+def percentile(values, q):
+    """Rang le plus proche (values triées)."""
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))] if values else float("nan")
+
+
+def run(args, kind, workers, threads, gps, teams, env):
+    port = free_port()
+    server = start_server(kind, port, workers, threads, env, args.startup_timeout)
+    try:
+        begin = time.time() + 1.0  # le temps de lancer les clients
+        measured = begin + args.warmup
+        stop = measured + args.duration
+        per_proc = [args.users // args.client_procs + (i < args.users % args.client_procs) for i in range(args.client_procs)]
+        clients = []
+        for i, users in enumerate(u for u in per_proc if u):
+            spec = dict(port=port, users=users, stop=stop, gps=gps, teams=teams, clicks=args.clicks, seed=1000 * i)
+            clients.append(subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--client", json.dumps(spec)],
+                env=env, cwd=ROOT, stdout=subprocess.PIPE, text=True,
+            ))
+        reports = [json.loads(c.communicate()[0].splitlines()[-1]) for c in clients]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    samples = [s for r in reports for s in r["samples"] if s[1] >= measured]
+    return samples, sum(t >= measured for r in reports for t in r["sessions"])
+
+
+def report(label, samples, sessions, duration):
+    ok = sorted(ms for _, _, ms, status in samples if status == 200)
+    errors = len(samples) - len(ok)
+    print(f"{label} : {len(samples) / duration:7.1f} req/s  {sessions / duration:5.2f} sessions/s  erreurs {errors}"
+          f"  p50 {percentile(ok, 50):7.1f} ms  p95 {percentile(ok, 95):7.1f} ms  p99 {percentile(ok, 99):7.1f} ms")
+    for kind in KINDS:
+        values = sorted(ms for k, _, ms, status in samples if k == kind and status == 200)
+        if values:
+            print(f"    {kind:<16} {len(values) / duration:7.1f} req/s  p50 {percentile(values, 50):7.1f} ms"
+                  f"  p95 {percentile(values, 95):7.1f} ms  p99 {percentile(values, 99):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit et latences du serveur sous N visiteurs simultanés")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--workers", default="1,2", help="nombres de workers à comparer (ex. 1,2,4)")
+    parser.add_argument("--threads", default="1,4", help="threads par worker à comparer")
+    parser.add_argument("--users", type=int, default=16, help="visiteurs simultanés")
+    parser.add_argument("--clicks", type=int, default=3, help="choix de GP / d'écurie par visite")
+    parser.add_argument("--duration", type=float, default=20.0, help="durée mesurée par configuration (s)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="durée ignorée en début de configuration (s)")
+    parser.add_argument("--client-procs", type=int, default=2, help="processus clients (visiteurs répartis)")
+    parser.add_argument("--server", choices=["auto", "gunicorn", "werkzeug"], default="auto")
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    parser.add_argument("--client", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.client:
+        client(json.loads(args.client))
+        return
+
+    data_dir = os.path.abspath(args.data_dir)
+    os.environ["F1_DATA_DIR"] = data_dir
+    sys.path.insert(0, ROOT)
+    from f1dash.features import get_model
+
+    model = get_model()
+    gps, teams = list(model.pits_by_gp), list(model.duels)
+    kind = args.server
+    if kind == "auto":
+        import importlib.util
+        kind = "gunicorn" if importlib.util.find_spec("gunicorn") else "werkzeug"
+    if not hasattr(os, "fork"):
+        sys.exit("serveur pré-forké : Linux/macOS uniquement")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    print(f"serveur {kind}, {args.users} visiteurs, {args.duration:.0f} s mesurées par configuration "
+          f"({len(gps)} GP, {len(teams)} écuries, {args.clicks} clics par page interactive)")
+    for workers in (int(w) for w in args.workers.split(",")):
+        for threads in (int(t) for t in args.threads.split(",")):
+            samples, sessions = run(args, kind, workers, threads, gps, teams, env)
+            report(f"{workers} worker(s) x {threads} thread(s)", samples, sessions, args.duration)
+
+
+if __name__ == "__main__":
+    main()
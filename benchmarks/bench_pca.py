@@ -0,0 +1,90 @@
+# PCA de l'Explorer : PCA complète recalculée sur toute l'archive (lecture des
+# caractéristiques + standardisation + PCA.fit_transform) vs f1dash.projection (IncrementalPCA
+# par lots, état et coordonnées gardés sur disque), sur une archive synthétique
+# (benchmarks/synthetic.py). Le dernier GP de la dernière saison est retenu puis écrit après
+# l'apprentissage initial, comme un rafraîchissement des données : seul ce GP doit être
+# appris et projeté. Compare aussi la variance expliquée et l'alignement des composantes
+# (|cos|) avec la PCA complète.
+#
+#   python benchmarks/bench_pca.py --seasons 10 --drivers 20 --events 24
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(func):
+    t = time.perf_counter()
+    out = func()
+    return out, (time.perf_counter() - t) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PCA de l'Explorer : PCA complète vs apprentissage incrémental")
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--events", type=int, default=24)
+    parser.add_argument("--batch", type=int, default=None, help="lignes par lot (F1_PCA_BATCH)")
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import numpy as np
+    import pandas as pd
+    import synthetic
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+
+    from f1dash import data, projection
+
+    if args.batch:
+        projection.BATCH_ROWS = args.batch
+    folder = tempfile.mkdtemp(prefix="f1-pca-")
+    try:
+        synthetic.generate(folder, args.seasons, args.drivers, args.events)
+        season_list = data.seasons()
+        last, rd = season_list[-1], args.events
+        held = {}
+        for name in projection.FEATURE_TABLES:
+            path = data.round_path(name, last, rd)
+            held[name] = pd.read_parquet(os.path.join(path, "part-0.parquet"))
+            shutil.rmtree(path)
+
+        def full_pca():
+            feats = pd.concat([projection.race_features(s) for s in data.seasons()], ignore_index=True)
+            scaled = np.nan_to_num(StandardScaler().fit_transform(feats[projection.FEATURES].to_numpy()))
+            pca = PCA(n_components=projection.N_COMPONENTS)
+            return pca, pca.fit_transform(scaled)
+
+        (_, coords), full_ms = timed(full_pca)
+        learned, first_ms = timed(projection.update)
+        print(f"{len(season_list)} saison(s), {len(coords)} résultats, {len(projection.FEATURES)} caractéristiques")
+        print(f"  PCA complète (tout relu, tout recalculé)  {full_ms:8.1f} ms")
+        print(f"  apprentissage initial incrémental         {first_ms:8.1f} ms   ({learned} lignes)")
+
+        for name, df in held.items():
+            data.write_partition(name, df, last, rd)
+        (pca, coords), full_ms = timed(full_pca)
+        learned, update_ms = timed(projection.update)
+        _, noop_ms = timed(projection.update)
+        print(f"après ajout du GP {rd} de {last} :")
+        print(f"  PCA complète                              {full_ms:8.1f} ms")
+        print(f"  mise à jour incrémentale                  {update_ms:8.1f} ms   ({learned} lignes)  {full_ms / update_ms:5.1f}x")
+        print(f"  mise à jour sans données nouvelles        {noop_ms:8.1f} ms")
+
+        ipca = projection._state["ipca"]
+        stored = pd.concat([projection.season_projection(s) for s in season_list], ignore_index=True)
+        assert len(stored) == len(coords), "résultats non projetés"
+        cosine = np.abs(np.sum(pca.components_ * ipca.components_, axis=1))
+        print("  variance expliquée   complète " + " ".join(f"{r:.3f}" for r in pca.explained_variance_ratio_)
+              + "   incrémentale " + " ".join(f"{r:.3f}" for r in ipca.explained_variance_ratio_))
+        print("  |cos| entre composantes " + " ".join(f"{c:.3f}" for c in cosine))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Benchmark de la détection des arrêts aux stands : ancienne boucle iterrows par pilote
+# vs détecteur vectorisé (f1dash.acquisition.extract_real_pitstops).
+# Vérifie aussi, sur des tables de tours synthétiques (une saison ou plus d'un coup), que
+# l'appel vectorisé produit exactement les arrêts de l'ancienne boucle appliquée course par
+# course (mêmes lignes, colonnes, valeurs et types).
+#
+#   python benchmarks/bench_pitstops.py
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from f1dash.acquisition import extract_real_pitstops  # noqa: E402
+
+COMPOUNDS = np.array(["SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"], dtype=object)
+
+
+def legacy_extract_real_pitstops(laps_df):
+    """Implémentation d'origine du notebook d'acquisition."""
+    pitstops = []
+    for driver, d in laps_df.groupby('Driver'):
+        d = d.sort_values('LapNumber')
+        prev_row = None
+        for idx, row in d.iterrows():
+            # Sauter si info stint ou compound absente
+            if prev_row is not None and pd.notna(row['Stint']) and pd.notna(prev_row['Stint']):
+                stint_change = row['Stint'] != prev_row['Stint']
+                compound_change = row['Compound'] != prev_row['Compound']
+                if stint_change and compound_change:
+                    pitstops.append({
+                        'Driver': driver,
+                        'DriverNumber': row['DriverNumber'],
+                        'TeamName': row['Team'],
+                        'LapIn': prev_row['LapNumber'],
+                        'LapOut': row['LapNumber'],
+                        'PitInTime': prev_row['PitInTime'],
+                        'PitOutTime': row['PitOutTime'],
+                        'CompoundIn': prev_row['Compound'],
+                        'CompoundOut': row['Compound'],
+                        'TyreLifeIn': prev_row['TyreLife'],
+                        'TyreLifeOut': row['TyreLife'],
+                        'PositionIn': prev_row['Position'],
+                        'PositionOut': row['Position'],
+                        'event': row['event'],
+                        'round': row['round']
+                    })
+            prev_row = row
+    return pd.DataFrame(pitstops)
+
+
+def synthetic_laps(n_rows, seed=0, n_drivers=20, n_laps=60):
+    """Tours au format FastF1 (types compris) sur autant de GP que nécessaire pour `n_rows`."""
+    rng = np.random.default_rng(seed)
+    n_races = max(1, n_rows // (n_drivers * n_laps))
+    frames = []
+    for rd in range(1, n_races + 1):
+        drivers = np.repeat([f"D{i:02d}" for i in range(n_drivers)], n_laps)
+        lap = np.tile(np.arange(1, n_laps + 1, dtype=float), n_drivers)
+        # 1 à 3 arrêts par pilote : le stint augmente aux tours tirés au hasard
+        stops = rng.random(n_drivers * n_laps) < 2.0 / n_laps
+        stops[lap == 1] = False
+        stint = 1.0 + pd.Series(stops).groupby(drivers).cumsum().to_numpy()
+        compound = COMPOUNDS[(stint.astype(int) + rng.integers(0, 2, len(stint))) % 3]
+        df = pd.DataFrame({
+            "Driver": drivers,
+            "DriverNumber": np.char.mod("%d", np.repeat(np.arange(1, n_drivers + 1), n_laps)).astype(object),
+            "Team": np.repeat([f"Team{i // 2}" for i in range(n_drivers)], n_laps),
+            "LapNumber": lap,
+            "Stint": stint,
+            "Compound": compound,
+            "TyreLife": lap - pd.Series(lap).groupby([drivers, stint]).transform("min").to_numpy() + 1,
+            "Position": rng.integers(1, n_drivers + 1, len(lap)).astype(float),
+            "PitInTime": pd.to_timedelta(np.where(np.roll(stops, -1), lap * 90.0, np.nan), unit="s"),
+            "PitOutTime": pd.to_timedelta(np.where(stops, lap * 90.0 + 25, np.nan), unit="s"),
+            "LapTime": pd.to_timedelta(rng.normal(90, 2, len(lap)), unit="s"),
+            "IsPersonalBest": rng.random(len(lap)) < 0.05,
+            "event": f"GP{rd:02d}",
+            "round": rd,
+        })
+        frames.append(df)
+    laps = pd.concat(frames, ignore_index=True)
+    # Trous réalistes : stints ou pneus inconnus, tours dans le désordre, pilote sans nom
+    laps.loc[laps.sample(frac=0.01, random_state=seed).index, "Stint"] = np.nan
+    laps.loc[laps.sample(frac=0.01, random_state=seed + 1).index, "Compound"] = None
+    laps.loc[laps.sample(frac=0.005, random_state=seed + 2).index, "Compound"] = np.nan
+    laps.loc[laps.sample(frac=0.001, random_state=seed + 3).index, "Driver"] = None
+    return laps.sample(frac=1.0, random_state=seed + 4)
+
+
+def legacy_by_race(laps):
+    """Usage d'origine : une extraction par course (boucle du notebook), puis concaténation."""
+    return pd.concat(
+        [legacy_extract_real_pitstops(race) for _, race in laps.groupby("round")], ignore_index=True
+    )
+
+
+def timed(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = func(*args)
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def main():
+    # Une course (20 pilotes x 60 tours = 1 200 tours) jusqu'à ~20 saisons
+    print(f"{'tours':>9} {'arrêts':>8} {'boucle (s)':>11} {'vectorisé (s)':>14} {'gain':>7}")
+    for n_rows in [1_200, 30_000, 100_000, 300_000, 600_000]:
+        laps = synthetic_laps(n_rows, seed=n_rows)
+        t_old, old = timed(legacy_by_race, laps, repeat=1 if n_rows > 50_000 else 3)
+        t_new, new = timed(extract_real_pitstops, laps)
+        pd.testing.assert_frame_equal(old, new)
+        print(f"{len(laps):>9} {len(new):>8} {t_old:>11.3f} {t_new:>14.4f} {t_old / t_new:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Records : boucle d'origine de create_streak (un filtre par pilote puis parcours Python des
+# courses) vs moteur de séries f1dash.records (une passe sur tableaux triés), sur des
+# archives synthétiques de plusieurs saisons (benchmarks/synthetic.py). Vérifie que les
+# séries de points sont identiques, puis mesure tous les critères, par pilote et par écurie.
+#
+#   python benchmarks/bench_records.py --seasons 1,10,40 --drivers 20 --events 24
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_points_streaks(results):
+    """create_streak d'origine, étendu aux saisons mises bout à bout (tri saison puis GP)."""
+    import pandas as pd
+
+    df_results_sorted = results.sort_values(['FullName', 'season', 'round'])
+    df_results_sorted['has_points'] = df_results_sorted['Points'] > 0
+    streaks = {}
+    for pilot in df_results_sorted['FullName'].unique():
+        s = df_results_sorted[df_results_sorted['FullName'] == pilot]['has_points'].values
+        max_streak = 0
+        current = 0
+        for v in s:
+            if v:
+                current += 1
+                max_streak = max(max_streak, current)
+            else:
+                current = 0
+        streaks[pilot] = max_streak
+    return pd.Series(streaks)
+
+
+def timed(func, repeat):
+    out = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func()
+        out.append((time.perf_counter() - t) * 1e3)
+    return statistics.median(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Séries de records : boucle par pilote vs moteur run-length")
+    parser.add_argument("--seasons", default="1,10,40", help="tailles d'archive (nombre de saisons) à mesurer")
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--events", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import pandas as pd
+    import synthetic
+
+    from f1dash import records
+
+    for n in (int(s) for s in args.seasons.split(",")):
+        # Noms de pilotes propres à chaque saison tous les 5 ans : l'archive compte plus de pilotes
+        results = pd.concat([
+            synthetic.season_tables(season, args.drivers, args.events)["results"]
+            .assign(season=season, FullName=lambda d, s=season: d["FullName"] + f" ({s // 5})")
+            for season in range(2025 - n + 1, 2026)
+        ], ignore_index=True)
+        pilots = results["FullName"].nunique()
+        legacy = legacy_points_streaks(results).sort_index()
+        engine = records.longest_streaks(results, "points")["streak"]
+        assert (legacy == engine).all(), "séries de points différentes"
+        print(f"{n} saison(s) : {len(results)} résultats, {pilots} pilotes")
+        before = timed(lambda: legacy_points_streaks(results), args.repeat)
+        after = timed(lambda: records.longest_streaks(results, "points"), args.repeat)
+        print(f"  séries de points par pilote  avant {before:9.1f} ms  après {after:7.1f} ms  ({before / after:5.1f}x)")
+        for by in ("driver", "team"):
+            for predicate in records.PREDICATES:
+                if by == "team" and predicate == "beat_teammate":
+                    continue  # toujours vrai pour une écurie dont deux pilotes sont classés
+                ms = timed(lambda: records.longest_streaks(results, predicate, by), args.repeat)
+                best = records.top(records.longest_streaks(results, predicate, by)["streak"], 1)
+                print(f"  {by:<6} {predicate:<14} {ms:7.1f} ms   record : {best.index[0]} ({best.iloc[0]} courses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Mesure du démarrage à froid du dashboard : import du module puis premier rendu de l'accueil.
+# Chaque mesure tourne dans un processus neuf (comme un worker qui démarre).
+#
+#   python benchmarks/bench_startup.py --data-dir data --repeat 5
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import dashboard
+t1 = time.perf_counter()
+dashboard.home_layout()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_s": t1 - t0,
+    "first_home_s": t2 - t1,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": sorted(m for m in ("fastf1", "sklearn") if m in sys.modules),
+}))
+"""
+
+
+def run_once(data_dir):
+    env = dict(os.environ, F1_DATA_DIR=data_dir, PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", PROBE], env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure du démarrage à froid du dashboard")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    runs = [run_once(os.path.abspath(args.data_dir)) for _ in range(args.repeat)]
+    for key in ("import_s", "first_home_s", "rss_mb"):
+        values = [r[key] for r in runs]
+        print(f"{key:<14} médiane={statistics.median(values):8.3f}  min={min(values):8.3f}  max={max(values):8.3f}")
+    print("modules lourds chargés à l'import :", runs[-1]["heavy_modules"] or "aucun")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# Suite de référence : chaque page (home, stratégie, duels, records, CO2, explorer) et
+# chaque callback (update_pit_plot sur tous les GP, update_duel sur toutes les écuries),
+# plus la construction du modèle, mesurés sur des saisons synthétiques de taille croissante
+# (benchmarks/synthetic.py : même schéma que les Parquet, saisons/pilotes/GP variables).
+# Chaque scénario tourne dans un processus neuf. Mesures par appel :
+#   - froid : caches vidés (FIGURE_CACHE, LAYOUT_CACHE, fig_cache sur disque ; le modèle
+#     en plus pour "modele") ; chaud : médiane des appels suivants, caches remplis ;
+#   - pic mémoire : tracemalloc pendant l'appel à froid (allocations Python et numpy ;
+#     les tampons pyarrow, hors tracemalloc, n'y figurent pas) ;
+#   - charge utile : octets JSON envoyés au navigateur (to_json_plotly, comme Dash).
+# Les résultats sont comparés à benchmarks/baseline.json : code de sortie 1 si une mesure
+# dépasse la référence au-delà des tolérances. Les latences dépendent de la machine :
+# régénérer la référence (--save-baseline) sur la machine qui fait la comparaison.
+#
+#   python benchmarks/bench_suite.py --scenarios saison,archive-5 --repeat 5
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Scénario -> taille du jeu synthétique
+SCENARIOS = {
+    "saison": dict(seasons=1, drivers=20, events=24),
+    "grille-40": dict(seasons=1, drivers=40, events=24),
+    "calendrier-48": dict(seasons=1, drivers=20, events=48),
+    "archive-5": dict(seasons=5, drivers=20, events=24),
+}
+
+# Mesure -> (tolérance relative, écart absolu en dessous duquel on ignore : bruit)
+TOLERANCES = {
+    "cold_ms": (0.50, 2.0),
+    "warm_ms": (0.50, 0.5),
+    "peak_mb": (0.20, 1.0),
+    "payload_kb": (0.02, 0.5),
+}
+
+
+def measure_scenario(repeat):
+    """Processus du scénario (F1_DATA_DIR déjà positionné) : {cible: mesures}."""
+    import tracemalloc
+
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import synthetic
+
+    import dashboard
+    from f1dash import data, features, figcache, sessions
+    from f1dash.memo import FIGURE_CACHE, LAYOUT_CACHE
+    from f1dash.transport import pack_tree
+    from plotly.io.json import to_json_plotly
+
+    sessions.set_backend(synthetic.race_laps_backend())
+    season = data.latest_season()
+
+    def reset_figures():
+        FIGURE_CACHE.clear()
+        LAYOUT_CACHE.clear()
+        shutil.rmtree(figcache.CACHE_DIR, ignore_errors=True)
+
+    def reset_model():
+        reset_figures()
+        features.reset_model()
+        data.clear()
+
+    def measure(calls, reset, payload=to_json_plotly):
+        """calls : fonctions sans argument (un appel = une requête)."""
+        reset()
+        t = time.perf_counter()
+        results = [call() for call in calls]
+        cold = (time.perf_counter() - t) * 1e3 / len(calls)
+        size = sum(len(payload(r)) for r in results) / len(calls)
+        reset()
+        tracemalloc.start()
+        for call in calls:
+            call()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        warm = []
+        for _ in range(repeat):
+            for call in calls:
+                t = time.perf_counter()
+                call()
+                warm.append((time.perf_counter() - t) * 1e3)
+        metrics = {"cold_ms": cold, "warm_ms": statistics.median(warm), "peak_mb": peak / 2**20, "payload_kb": size / 1e3}
+        return {k: round(v, 4) for k, v in metrics.items()}
+
+    out = {"modele": measure([lambda: features.get_model(season)], reset_model, payload=lambda _: "")}
+    model = features.get_model(season)
+    dashboard.request_lap_fig(season).result()  # graphique temps au tour prêt : page stratégie stable
+    for layout_func in (dashboard.home_layout, dashboard.strategie_layout, dashboard.duels_layout,
+                        dashboard.records_layout, dashboard.co2_layout, dashboard.explorer_layout):
+        out[layout_func.__name__] = measure(
+            [lambda f=layout_func: f(season)], reset_figures, payload=lambda tree: to_json_plotly(pack_tree(tree)),
+        )
+    out["update_pit_plot"] = measure([lambda gp=gp: dashboard.update_pit_plot(gp, season) for gp in model.pits_by_gp], reset_figures)
+    out["update_duel"] = measure([lambda team=team: dashboard.update_duel(team, season) for team in model.duels], reset_figures)
+    return {"rows": len(model.results), "targets": out}
+
+
+def run_scenario(name, data_root, repeat):
+    """Génère le jeu du scénario (s'il n'existe pas) puis le mesure dans un processus neuf."""
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import synthetic
+
+    size = SCENARIOS[name]
+    data_dir = os.path.join(data_root, name)
+    if not os.path.isdir(data_dir):
+        synthetic.generate(data_dir, **size)
+    env = dict(os.environ, F1_DATA_DIR=data_dir, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", "--repeat", str(repeat)],
+        env=env, cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        raise RuntimeError(f"scénario {name} : processus arrêté (code {proc.returncode})")
+    return dict(json.loads(lines[-1]), **size)
+
+
+def compare(results, baseline, scale):
+    """Lignes "scénario/cible mesure : avant -> après" des mesures qui dépassent la référence."""
+    regressions = []
+    for name, scenario in results.items():
+        reference = baseline.get(name, {}).get("targets", {})
+        for target, metrics in scenario["targets"].items():
+            for metric, value in metrics.items():
+                before = reference.get(target, {}).get(metric)
+                tolerance, floor = TOLERANCES[metric]
+                if before is not None and value > before * (1 + tolerance * scale) and value - before > floor:
+                    regressions.append(f"{name}/{target} {metric} : {before:.2f} -> {value:.2f} ({value / before:.2f}x)")
+    return regressions
+
+
+def report(name, scenario, reference):
+    print(f"{name} : {scenario['seasons']} saison(s) x {scenario['drivers']} pilotes x {scenario['events']} GP ({scenario['rows']} résultats sur la saison mesurée)")
+    print(f"  {'cible':<18} {'froid ms':>10} {'chaud ms':>10} {'pic Mo':>8} {'charge ko':>10}   vs référence (chaud, pic, charge)")
+    for target, m in scenario["targets"].items():
+        ref = reference.get(target)
+        delta = ""
+        if ref:
+            delta = "  ".join(
+                f"{m[k] / ref[k]:5.2f}x" if ref[k] else "    -" for k in ("warm_ms", "peak_mb", "payload_kb")
+            )
+        print(f"  {target:<18} {m['cold_ms']:10.2f} {m['warm_ms']:10.3f} {m['peak_mb']:8.2f} {m['payload_kb']:10.1f}   {delta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence, pic mémoire et charge utile de chaque page et callback")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"parmi {', '.join(SCENARIOS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="passages à chaud par cible")
+    parser.add_argument("--data-dir", help="dossier des jeux synthétiques (réutilisés d'un lancement à l'autre) ; temporaire par défaut")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="enregistre les mesures comme nouvelle référence")
+    parser.add_argument("--tolerance-scale", type=float, default=1.0, help="multiplie les tolérances relatives")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        sys.path.insert(0, ROOT)
+        print(json.dumps(measure_scenario(args.repeat)))
+        return
+
+    names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"scénario(s) inconnu(s) : {', '.join(unknown)}")
+    data_root = os.path.abspath(args.data_dir) if args.data_dir else tempfile.mkdtemp(prefix="f1-suite-")
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+    try:
+        results = {name: run_scenario(name, data_root, args.repeat) for name in names}
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_root)
+    for name, scenario in results.items():
+        report(name, scenario, baseline.get(name, {}).get("targets", {}))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"scenarios": {**baseline, **results}}, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"référence enregistrée : {args.baseline}")
+        return
+    if not baseline:
+        print(f"pas de référence ({args.baseline}) : relancer avec --save-baseline pour en créer une")
+        return
+    regressions = compare(results, baseline, args.tolerance_scale)
+    if regressions:
+        print("RÉGRESSIONS :")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("aucune régression par rapport à la référence")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Page Télémétrie : figure de comparaison de deux tours avec les échantillons bruts vs réduits
+# par LTTB à la largeur du graphique (f1dash.telemetry), sur une session synthétique à
+# télémétrie haute fréquence (benchmarks/synthetic.py, --hz échantillons par seconde).
+# Mesure le découpage de la session dans le cache Parquet, la lecture d'un tour (un row
+# group), la réduction LTTB et la taille JSON envoyée au navigateur, tour entier puis zoom.
+#
+#   python benchmarks/bench_telemetry.py --hz 50 --laps 30 --widths 600,1200,2400
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(func, repeat=1):
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = func()
+        ms = (time.perf_counter() - t) * 1e3
+        best = ms if best is None else min(best, ms)
+    return out, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Télémétrie : traces brutes vs LTTB à la largeur du graphique")
+    parser.add_argument("--hz", type=int, default=50, help="échantillons par seconde de la session synthétique")
+    parser.add_argument("--laps", type=int, default=30)
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--widths", default="600,1200,2400", help="largeurs de graphique (pixels) à mesurer")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import synthetic
+    from plotly.io.json import to_json_plotly
+
+    folder = tempfile.mkdtemp(prefix="f1-telemetry-")
+    try:
+        synthetic.generate(folder, 1, args.drivers, 3)
+        import dashboard
+        from f1dash import telemetry
+        from f1dash.transport import pack_figure
+
+        telemetry.set_backend(synthetic.session_telemetry_backend(args.laps, args.hz))
+        gp = dashboard.get_model(2025).gp_order[0]
+        index, build_ms = timed(lambda: telemetry.build_session(2025, 1, gp, "R"))
+        size = sum(os.path.getsize(os.path.join(telemetry.session_dir(2025, 1, "R"), f)) for f in os.listdir(telemetry.session_dir(2025, 1, "R")))
+        print(f"session : {len(index)} tours, {args.hz} Hz, découpée et écrite en {build_ms:.0f} ms ({size / 2**20:.1f} Mo de Parquet)")
+        (a, la), (b, lb) = index.iloc[0][["Driver", "LapNumber"]], index.iloc[-1][["Driver", "LapNumber"]]
+        traces, read_ms = timed(lambda: [telemetry.lap_trace(2025, 1, "R", d, n) for d, n in ((a, la), (b, lb))], args.repeat)
+        print(f"lecture de deux tours : {read_ms:.1f} ms ({len(traces[0])} et {len(traces[1])} échantillons)")
+
+        def figure(n_points, distance=None):
+            laps = []
+            for (driver, lap), trace in zip(((a, la), (b, lb)), traces if distance is None else
+                                            [telemetry.lap_trace(2025, 1, "R", d, n, distance) for d, n in ((a, la), (b, lb))]):
+                reduced = telemetry.downsample(trace, n_points) if n_points else {c: (trace["Distance"].to_numpy(), trace[c].to_numpy()) for c in telemetry.CHANNELS}
+                laps.append((f"{driver} – tour {lap}", "#888", False, reduced))
+            return len(to_json_plotly(pack_figure(dashboard.create_telemetry_fig(gp, "R", laps, distance)))) / 1e3
+
+        raw_kb, raw_ms = timed(lambda: figure(None), args.repeat)
+        print(f"  tours entiers, bruts                  {raw_ms:8.1f} ms  {raw_kb:9.1f} ko")
+        for width in (int(w) for w in args.widths.split(",")):
+            _, lttb_ms = timed(lambda: [telemetry.downsample(t, width) for t in traces], args.repeat)
+            kb, ms = timed(lambda: figure(width), args.repeat)
+            print(f"  tours entiers, LTTB {width:>5} px          {ms:8.1f} ms  {kb:9.1f} ko   (dont LTTB {lttb_ms:.1f} ms)")
+            kb, ms = timed(lambda: figure(width, (1000.0, 1600.0)), args.repeat)
+            print(f"  zoom 1000-1600 m, LTTB {width:>5} px       {ms:8.1f} ms  {kb:9.1f} ko")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Transport des pages (f1dash/transport.py) : réponse de display_page pour chaque page,
+# avant (arbre de composants avec des go.Figure, sérialisé à chaque requête) et après
+# (arbre JSON pur mis en cache, tableaux numériques en binaire). Mesure les octets
+# envoyés (bruts, gzip et brotli si le module est installé) et le temps de sérialisation
+# par requête, avec le moteur json de la bibliothèque standard et avec orjson s'il est
+# installé. Vérifie aussi que les deux réponses décrivent les mêmes figures.
+#
+#   python benchmarks/bench_transport.py --data-dir data --season 2025
+import argparse
+import base64
+import gzip
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["home_layout", "strategie_layout", "duels_layout", "records_layout", "co2_layout", "explorer_layout"]
+
+
+def decode_arrays(obj):
+    """Tableaux binaires plotly -> listes, nombres entiers normalisés (comparaison avant/après)."""
+    if isinstance(obj, dict):
+        if set(obj) >= {"dtype", "bdata"}:
+            array = np.frombuffer(base64.b64decode(obj["bdata"]), dtype=obj["dtype"])
+            if "shape" in obj:
+                array = array.reshape([int(n) for n in obj["shape"].split(",")])
+            return decode_arrays(array.tolist())
+        return {k: decode_arrays(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [decode_arrays(v) for v in obj]
+    if isinstance(obj, float):
+        return None if obj != obj else int(obj) if obj.is_integer() else obj
+    return obj
+
+
+def best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Octets et sérialisation par page, avant/après f1dash.transport")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--season", type=int, default=None, help="saison affichée (la plus récente par défaut)")
+    args = parser.parse_args()
+    os.environ["F1_DATA_DIR"] = os.path.abspath(args.data_dir)
+    sys.path.insert(0, ROOT)
+    from plotly.io.json import to_json_plotly
+
+    import dashboard
+    from f1dash import transport
+    from f1dash.memo import FIGURE_CACHE
+
+    engines = ["json"] + (["orjson"] if importlib.util.find_spec("orjson") else [])
+
+    def sizes(text):
+        body = text.encode()
+        out = f"{len(body) / 1e3:7.1f} ko  gzip {len(gzip.compress(body, compresslevel=6)) / 1e3:6.1f} ko"
+        if transport.brotli is not None:
+            out += f"  br {len(transport.brotli.compress(body, quality=5)) / 1e3:6.1f} ko"
+        return out
+
+    def build(name, enabled):
+        transport.ENABLED = enabled
+        FIGURE_CACHE.clear()
+        layout = getattr(dashboard, name)(args.season)
+        return transport.pack_tree(layout)
+
+    for name in PAGES:
+        before = build(name, False)
+        t_pack, after = best_of(lambda: build(name, True), repeat=1)
+        texts = {}
+        print(f"{name} (mise en forme compacte {t_pack * 1e3:.1f} ms, une fois par version des données)")
+        for label, tree in (("avant", before), ("après", after)):
+            for engine in engines:
+                t_ser, texts[label] = best_of(lambda: to_json_plotly(tree, engine=engine))
+                print(f"  {label:<6} {engine:<7} sérialisation {t_ser * 1e3:7.2f} ms  {sizes(texts[label])}")
+        assert decode_arrays(json.loads(texts["avant"])) == decode_arrays(json.loads(texts["après"])), name
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Workers de production : mémoire et démarrage pour 1 puis N workers, avec et sans
+# préchargement dans le maître (gunicorn.conf.py : preload_app + dashboard.preload).
+#   - sans préchargement : chaque worker est un processus neuf qui importe le dashboard
+#     et construit lui-même modèles, layouts et figures ;
+#   - avec : le maître construit tout une fois, puis forke les workers (comme gunicorn).
+# Chaque worker sert ensuite toutes les pages (première requête) avant d'être mesuré.
+# Mémoire lue dans /proc/<pid>/smaps_rollup (Linux) : RSS, PSS (pages partagées réparties
+# entre les processus qui les partagent) et USS (pages propres au worker).
+#
+#   python benchmarks/bench_workers.py --data-dir data --workers 4
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Processus maître (ou worker autonome) : écrit une ligne JSON par worker prêt, puis attend
+# une ligne sur stdin avant de quitter (les workers restent vivants pendant la mesure).
+PROBE = r"""
+import gc, json, os, signal, sys, time
+mode, n, job_timeout = sys.argv[1], int(sys.argv[2]), float(sys.argv[3])
+t0 = time.perf_counter()
+import dashboard
+from plotly.io.json import to_json_plotly
+
+def serve_pages():
+    for path in ["/", *dashboard.PAGES]:
+        to_json_plotly(dashboard.display_page(path)[0])
+
+def report(start, **extra):
+    line = json.dumps(dict(pid=os.getpid(), startup_s=time.perf_counter() - start, **extra)) + "\n"
+    os.write(1, line.encode())  # une seule écriture : les workers partagent le même tube
+
+if mode == "worker":
+    dashboard.preload(job_timeout=job_timeout)
+    serve_pages()
+    report(t0)
+    sys.stdin.readline()
+    sys.exit(0)
+
+dashboard.preload(job_timeout=job_timeout)
+gc.collect()
+gc.freeze()
+report(t0, master=True)
+children = []
+for _ in range(n):
+    t_fork = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        serve_pages()
+        report(t_fork)
+        signal.pause()  # arrêté par le maître
+        os._exit(0)
+    children.append(pid)
+sys.stdin.readline()
+for pid in children:
+    os.kill(pid, signal.SIGTERM)
+    os.waitpid(pid, 0)
+"""
+
+
+def memory(pid):
+    """RSS, PSS et USS (Mo) d'un processus."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":"):
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    uss = fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0)
+    return {"rss_mb": fields["Rss"], "pss_mb": fields["Pss"], "uss_mb": uss}
+
+
+def run(mode, n, data_dir, job_timeout):
+    """Lance n workers selon `mode` ('fork' ou 'spawn') ; retourne (maître, workers) mesurés."""
+    env = dict(os.environ, F1_DATA_DIR=data_dir, PYTHONPATH=ROOT)
+
+    def start(probe_mode):
+        return subprocess.Popen(
+            [sys.executable, "-c", PROBE, probe_mode, str(n), str(job_timeout)],
+            env=env, cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+
+    t0 = time.perf_counter()
+    procs = [start("master")] if mode == "fork" else [start("worker") for _ in range(n)]
+    lines = []
+    for proc in procs:
+        expected = len(lines) + (n + 1 if mode == "fork" else 1)
+        while len(lines) < expected:
+            line = proc.stdout.readline()
+            if not line:
+                raise RuntimeError(f"worker arrêté avant d'être prêt (code {proc.wait()})")
+            if line.startswith("{"):  # le reste de la sortie (logs) est ignoré
+                lines.append(json.loads(line))
+    wall = time.perf_counter() - t0
+    try:
+        master = next((dict(r, **memory(r["pid"])) for r in lines if r.get("master")), None)
+        workers = [dict(r, **memory(r["pid"])) for r in lines if not r.get("master")]
+    finally:
+        for proc in procs:
+            proc.communicate("stop\n")
+    return wall, master, workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS et démarrage des workers, avec/sans préchargement")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--job-timeout", type=float, default=30.0, help="attente max. des sessions FastF1 (s)")
+    args = parser.parse_args()
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("/proc/<pid>/smaps_rollup introuvable : mesure réservée à Linux")
+    data_dir = os.path.abspath(args.data_dir)
+
+    for n in sorted({1, args.workers}):
+        for mode, label in (("spawn", "sans préchargement"), ("fork", "préchargé + fork")):
+            wall, master, workers = run(mode, n, data_dir, args.job_timeout)
+            startup = max(w["startup_s"] for w in workers)
+            pss = sum(w["pss_mb"] for w in workers) + (master["pss_mb"] if master else 0.0)
+            print(f"{n} worker(s), {label} : tous prêts en {wall:.2f} s, PSS total {pss:.0f} Mo")
+            if master:
+                print(f"  maître    démarrage {master['startup_s']:6.2f} s  RSS {master['rss_mb']:6.0f} Mo  PSS {master['pss_mb']:6.0f} Mo  USS {master['uss_mb']:6.0f} Mo")
+            for w in workers:
+                print(f"  worker    démarrage {w['startup_s']:6.2f} s  RSS {w['rss_mb']:6.0f} Mo  PSS {w['pss_mb']:6.0f} Mo  USS {w['uss_mb']:6.0f} Mo")
+            print(f"  démarrage du worker le plus lent : {startup:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
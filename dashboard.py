@@ -1,23 +1,54 @@
+import os
+
 import dash
-from dash import dcc, html, Input, Output, State, callback, dash_table
+import flask
+from dash import dcc, html, Input, Output, State, callback, clientside_callback, ClientsideFunction, dash_table
 import dash_bootstrap_components as dbc
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
-import os
-from sklearn.decomposition import PCA
-import fastf1
-import plotly.io as pio
-
-# Chargement des datasets (modifie le chemin selon ton infra)
-DATA_DIR = "data"
-df_results = pd.read_parquet(f"{DATA_DIR}/results_2025.parquet")
-df_pits = pd.read_parquet(f"{DATA_DIR}/pitstops_2025.parquet")
-df_drv_stand = pd.read_parquet(f"{DATA_DIR}/driver_standings_2025.parquet")
-df_team_stand = pd.read_parquet(f"{DATA_DIR}/team_standings_2025.parquet")
-df_flights = pd.read_parquet(f"{DATA_DIR}/flightlegs_2025.parquet")
-df_quali = pd.read_parquet(f"{DATA_DIR}/qualifying_2025.parquet")
+from plotly.subplots import make_subplots
+
+# Les tables sont lues à la demande (premier accès à une page), colonne par colonne,
+# puis enrichies une seule fois dans un modèle partagé par toutes les pages (f1dash.features).
+# fastf1 et scikit-learn ne sont importés que par les pages qui en ont besoin.
+from f1dash.data import data_fingerprint, latest_season, load_table, seasons
+from f1dash.features import data_version, fix_color_series, get_model
+from f1dash.duels import TeamDuel
+# Cache disque des figures, invalidé automatiquement quand les Parquet d'entrée changent
+from f1dash.figcache import load_figure, load_or_create_figure
+# Layouts et figures parsées gardés en mémoire (LRU borné), clés = page + version des données
+from f1dash.memo import FIGURE_CACHE, LAYOUT_CACHE, POINTS_CACHE, cache_stats
+from f1dash.heatmap import build_heatmap_data
+# PCA de l'Explorer apprise par lots sur toute l'archive, seuls les GP nouveaux sont projetés
+from f1dash.projection import FEATURE_TABLES, explained_variance_ratio, season_projection, state_version
+# Nuages de l'Explorer en WebGL puis en densité agrégée côté serveur quand les points se comptent par milliers
+from f1dash.scatter import density, render_mode, zoom_ranges
+# Séries et totaux des records (critère quelconque, pilote ou écurie) calculés en une passe
+from f1dash.records import load_results, longest_streaks, tally, top as top_records
+# Tours rapides de toutes les courses et dégradation des pneus ajustée sur tous les relais à la fois
+from f1dash.laps import load_laps
+from f1dash.degradation import compound_order, fit_stints, summarize
+# Sessions FastF1 chargées en arrière-plan (une seule fois par GP), jamais dans la requête
+from f1dash.jobs import JOBS
+from f1dash.sessions import load_race_laps
+# Télémétrie par tour gardée en Parquet local, réduite (LTTB) à la largeur du graphique
+from f1dash.telemetry import CHANNELS, SESSIONS, build_session, downsample, lap_trace, laps_index
+# Mode optionnel (F1_CLIENTSIDE=1) : pneus par GP et duels redessinés dans le navigateur
+from f1dash.clientside import ENABLED as CLIENTSIDE, SENTINEL, discrete_colors, figure_parts, to_json_data
+# Bar race livrée en deux temps : figure de base, puis images compactes par paquets
+from f1dash.barrace import CHUNK_FRAMES, chunk as frame_chunk, split_bar_race
+# Mode optionnel (F1_LIVE=1) : nouveaux GP repliés à chaud et poussés aux pages d'accueil ouvertes
+from f1dash.live import ENABLED as LIVE, POLL_SECONDS as LIVE_POLL_SECONDS, get_live
+# Figures envoyées en JSON compact (tableaux binaires, orjson) et réponses compressées (F1_TRANSPORT)
+from f1dash.transport import ENABLED as TRANSPORT, install as install_transport, pack_figure, pack_tree
+# Métriques Prometheus (/metrics) et profilage à la demande d'une requête (F1_METRICS, F1_PROFILE_DIR)
+from f1dash.metrics import ENABLED as METRICS, install as install_metrics, timed_callback
+
+# Copy-on-Write, pour le processus du dashboard seulement (les scripts et benchmarks qui
+# importent f1dash gardent le comportement par défaut de pandas) : une sélection faite par
+# une page sur le modèle partagé est une copie paresseuse, écrire dedans ne touche pas le modèle.
+pd.set_option("mode.copy_on_write", True)
 
 # Utilitaires
 PILOT_PLACEHOLDER_URL = "https://img.freepik.com/premium-photo/race-car-driver-with-helmet_155807-30671.jpg?w=740" 
@@ -28,85 +59,62 @@ def pilot_img_url(row):
         return PILOT_PLACEHOLDER_URL
     return url
 
-team_colors = df_results.drop_duplicates("TeamName").set_index("TeamName")["TeamColor"].apply(lambda c: f"#{c}" if not c.startswith("#") else c).to_dict()
-pilot_imgs = df_results.set_index("FullName")["HeadshotUrl"].to_dict()
-pilot2team = df_results.set_index("FullName")["TeamName"].to_dict()
-
 # 1️⃣ ACCUEIL – Data prep pour la bar race & podium pie
-cumul = (
-    df_drv_stand
-    .sort_values(['FullName', 'round'])
-    .groupby(['FullName', 'round'])['Points']
-    .sum()
-    .groupby(level=0).cumsum()
-    .reset_index(name='PointsCum')
-)
-round_to_gp = df_results.set_index('round')['event'].to_dict()
-cumul['event'] = cumul['round'].map(round_to_gp)
-team_map = (
-    df_results
-    .drop_duplicates(subset=['FullName', 'round'])
-    .set_index(['FullName', 'round'])[['TeamName', 'TeamColor', 'HeadshotUrl']]
-    .to_dict(orient='index')
-)
-def fix_color(c):
-    if isinstance(c, str) and not c.startswith('#'):
-        return f'#{c}'
-    return c
-cumul['TeamName'] = cumul.apply(lambda row: team_map.get((row['FullName'], row['round']), {}).get('TeamName', 'N/A'), axis=1)
-cumul['TeamColor'] = cumul.apply(lambda row: fix_color(team_map.get((row['FullName'], row['round']), {}).get('TeamColor', '#cccccc')), axis=1)
-cumul['HeadshotUrl'] = cumul.apply(lambda row: team_map.get((row['FullName'], row['round']), {}).get('HeadshotUrl', 'https://media.formula1.com/d_driver_fallback_i'), axis=1)
-team_color_map = {team: fix_color(color) for team, color in cumul.groupby('TeamName')['TeamColor'].first().items()}
-
 # Podiums pour pie
-podiums = df_results[df_results['Position'] <= 3]
-podium_count = podiums.groupby("FullName")["Position"].count().sort_values(ascending=False)
-pie_podium = px.pie(
-    podium_count, values=podium_count.values, names=podium_count.index,
-    title="Répartition des podiums (pilotes)",
-    color=podium_count.index,
-    color_discrete_map={p: team_colors.get(pilot2team.get(p), '#cccccc') for p in podium_count.index}
-)
-pie_podium.update_traces(textinfo="percent+label")
-pie_podium.update_layout(template="plotly_dark", margin=dict(t=60, l=20, r=20, b=20), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', title_x=0.5)
-
-# KPIs dynamiques
-nb_gp = df_results['event'].nunique()
-nb_pilotes = df_results['FullName'].nunique()
-nb_teams = df_results['TeamName'].nunique()
-nb_abandons = (df_results['Status'] != 'Finished').sum()
-pct_abandons = nb_abandons / len(df_results) * 100
-co2_total = int(df_flights['CO2_tonnes'].sum())
-trajets = df_flights.sort_values("CO2_tonnes", ascending=False)
-trajet_max = trajets.iloc[0]
-trajet_min = trajets.iloc[-1]
-best_winner = df_results[df_results['Position'] == 1]['FullName'].value_counts().idxmax()
-nb_victoires = df_results[df_results['Position'] == 1]['FullName'].value_counts().max()
-best_winner_row = df_results[df_results['FullName'] == best_winner].iloc[0]
-best_winner_img = pilot_img_url(best_winner_row)
-best_winner_team = best_winner_row['TeamName']  
-
-def load_or_create_figure(path, create_func):
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            return pio.from_json(f.read())
-    fig = create_func()
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(fig.to_json())
-    return fig
+def create_pie_podium(season=None):
+    model = get_model(season)
+    df_results = model.results
+    podiums = df_results[df_results['Position'] <= 3]
+    podium_count = podiums.groupby("FullName")["Position"].count().sort_values(ascending=False)
+    return podium_pie(podium_count, model.team_colors, model.pilot2team)
+
+def podium_pie(podium_count, team_colors, pilot2team):
+    pie_podium = px.pie(
+        podium_count, values=podium_count.values, names=podium_count.index,
+        title="Répartition des podiums (pilotes)",
+        color=podium_count.index,
+        color_discrete_map={p: team_colors.get(pilot2team.get(p), '#cccccc') for p in podium_count.index}
+    )
+    pie_podium.update_traces(textinfo="percent+label")
+    pie_podium.update_layout(template="plotly_dark", margin=dict(t=60, l=20, r=20, b=20), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', title_x=0.5)
+    return pie_podium
+
+# KPIs dynamiques (le layout de l'accueil, qui les affiche, est mis en cache par version des données)
+def home_kpis(season=None):
+    model = get_model(season)
+    df_results, df_flights = model.results, model.flights
+    nb_abandons = (df_results['Status'] != 'Finished').sum()
+    winners = df_results[df_results['Position'] == 1]['FullName'].value_counts()
+    best_winner = winners.idxmax()
+    best_winner_row = df_results[df_results['FullName'] == best_winner].iloc[0]
+    return dict(
+        nb_gp=df_results['event'].nunique(),
+        nb_pilotes=df_results['FullName'].nunique(),
+        nb_teams=df_results['TeamName'].nunique(),
+        pct_abandons=nb_abandons / len(df_results) * 100,
+        co2_total=int(df_flights['CO2_tonnes'].sum()),
+        best_winner=best_winner,
+        nb_victoires=winners.max(),
+        best_winner_img=pilot_img_url(best_winner_row),
+        best_winner_team=best_winner_row['TeamName'],
+    )
 
 # Bar race animation (Accueil)
-def bar_race_anim():
+BAR_RACE_LABELS = {'PointsCum': 'Points cumulés', 'FullName': 'Pilote', 'event': 'Grand Prix', 'TeamName': 'Écurie'}
+
+def bar_race_anim(season=None):
+    model = get_model(season)
+    cumul = model.cumul
     fig = px.bar(
         cumul, 
         x='PointsCum', y='FullName', 
         color='TeamName',
-        color_discrete_map=team_color_map,
+        color_discrete_map=model.team_color_map,
         orientation='h',
         animation_frame='event',
         range_x=[0, cumul['PointsCum'].max()*1.1],
         title="Classement pilotes (points cumulés) – Animation course par course",
-        labels={'PointsCum': 'Points cumulés', 'FullName': 'Pilote', 'event': 'Grand Prix', 'TeamName': 'Écurie'}
+        labels=BAR_RACE_LABELS
     )
     fig.update_layout(
         title_x=0.5,
@@ -144,90 +152,209 @@ def bar_race_anim():
     )
     return fig
 
-# Remplacer les appels directs aux fonctions de création de figures lourdes par la version cache
-# ACCUEIL : bar_race_anim et pie_podium
-bar_race_path = os.path.join("data", "fig_bar_race.json")
-pie_podium_path = os.path.join("data", "fig_pie_podium.json")
-fig_bar_race = load_or_create_figure(bar_race_path, bar_race_anim)
-fig_pie_podium = load_or_create_figure(pie_podium_path, lambda: pie_podium)
+# Bar race découpée (figure de base + images compactes), une fois par version des données
+def bar_race_bundle(season=None):
+    model = get_model(season)
+    season = model.season
+    return FIGURE_CACHE.get_or_build(
+        ("bar_race_bundle", season, model.version),
+        lambda: split_bar_race(load_or_create_figure("bar_race", lambda: bar_race_anim(season), inputs=("results", "driver_standings"), season=season))
+    )
+
+# Mode live : image de bar race d'un seul GP, identique à celle de bar_race_anim
+# (mêmes traces, même ordre d'écuries), envoyée telle quelle (forme [nom, traces])
+def bar_race_frame(rows, team_color_map, team_order):
+    fig = px.bar(
+        rows,
+        x='PointsCum', y='FullName',
+        color='TeamName',
+        color_discrete_map=team_color_map,
+        category_orders={'TeamName': team_order},
+        orientation='h',
+        animation_frame='event',
+        labels=BAR_RACE_LABELS
+    )
+    name = str(rows['event'].iloc[0])
+    step = {
+        "args": [[name], {"frame": {"duration": 0, "redraw": True}, "mode": "immediate", "fromcurrent": True, "transition": {"duration": 0, "easing": "linear"}}],
+        "label": name,
+        "method": "animate"
+    }
+    return [name, to_json_data(list(fig.data))], step
+
+
+# Cartes KPI de l'accueil (réutilisées par le rafraîchissement live)
+def home_kpi_cards(kpis, team_colors):
+    best_winner = kpis['best_winner']
+    best_winner_img = kpis['best_winner_img']
+    best_winner_team = kpis['best_winner_team']
+    return [
+        dbc.Col(dbc.Card([
+            dbc.CardHeader("Grands prix"),
+            dbc.CardBody(html.H4(kpis['nb_gp'], className="card-title"))
+        ], className="mb-2 bg-gradient-primary shadow kpi-glass kpi-fadein"), width=2),
+        dbc.Col(dbc.Card([
+            dbc.CardHeader("Pilotes classés"),
+            dbc.CardBody(html.H4(kpis['nb_pilotes'], className="card-title"))
+        ], className="mb-2 bg-gradient-info shadow kpi-glass kpi-fadein"), width=2),
+        dbc.Col(dbc.Card([
+            dbc.CardHeader("Écuries"),
+            dbc.CardBody(html.H4(kpis['nb_teams'], className="card-title"))
+        ], className="mb-2 bg-gradient-secondary shadow kpi-glass kpi-fadein"), width=2),
+        dbc.Col(dbc.Card([
+            dbc.CardHeader("Abandons (%)"),
+            dbc.CardBody(html.H4(f"{kpis['pct_abandons']:.1f} %", className="card-title"))
+        ], className="mb-2 bg-gradient-danger shadow kpi-glass kpi-fadein"), width=2),
+        dbc.Col(dbc.Card([
+            dbc.CardHeader("CO₂ logistique total (t)"),
+            dbc.CardBody(html.H4(f"{kpis['co2_total']}", className="card-title"))
+        ], className="mb-2 bg-gradient-dark shadow kpi-glass kpi-fadein"), width=2),
+        dbc.Col(dbc.Card([
+            dbc.CardHeader("Roi du GP"),
+            dbc.CardBody(
+                html.Div([
+                    html.Span([
+                        html.Img(
+                            src=best_winner_img,
+                            height="38px",
+                            style={
+                                "borderRadius": "19px",
+                                "verticalAlign": "middle",
+                                "marginRight": "8px",
+                                "border": f"2px solid {team_colors.get(best_winner_team, '#aaa')}"
+                            }
+                        ) if best_winner_img else "",
+                        html.Span(
+                            f"{best_winner}",
+                            style={
+                                "verticalAlign": "middle",
+                                "fontWeight": "bold",
+                                "fontSize": "1.05rem",
+                                "color": team_colors.get(best_winner_team, "#ffa")
+                            }
+                        )
+                    ], style={"display": "flex", "alignItems": "center", "justifyContent": "center", "gap": "6px", "lineHeight": "1.1", "marginBottom": "2px"}),
+                    html.Div(
+                        f"{best_winner_team}",
+                        className="small mb-0 text-muted",
+                        style={"lineHeight": "1", "marginBottom": "2px"}
+                    ),
+                    html.Div(
+                        f"{kpis['nb_victoires']} victoires",
+                        className="small text-muted",
+                        style={"lineHeight": "2", "marginBottom": "-15px"}
+                    )
+                ], style={"padding": "0", "margin": "0"})
+            ),
+        ], className="mb-2 bg-gradient-warning shadow kpi-glass kpi-fadein"), width=2)
+    ]
 
-def home_layout():
+def home_layout(season=None):
+    model = get_model(season)
+    season = model.season
+    if LIVE:
+        # Suivi live démarré à la version de cette page : seuls les GP suivants lui seront envoyés
+        get_live(season)
+    kpis = home_kpis(season)
+    # Figures lourdes servies depuis le cache (reconstruites si les données ont changé) ;
+    # la bar race part sans ses images, chargées par paquets après le premier affichage
+    fig_bar_race, frame_meta, frame_labels, frames = bar_race_bundle(season)
+    fig_pie_podium = load_or_create_figure("pie_podium", lambda: create_pie_podium(season), inputs=("results",), season=season)
     return dbc.Container([
         dbc.Row([
-            dbc.Col(html.H2("🏁🚥 Dashboard F1 – Saison 2025", className="mb-3 text-center"), width=12, style={"marginBottom": "-10px", "marginTop": "-15px"})
+            dbc.Col(html.H2(f"🏁🚥 Dashboard F1 – Saison {season}", className="mb-3 text-center"), width=12, style={"marginBottom": "-10px", "marginTop": "-15px"})
         ]),
+        dbc.Row(home_kpi_cards(kpis, model.team_colors), id="home-kpis", className="text-center"),
         dbc.Row([
-            dbc.Col(dbc.Card([
-                dbc.CardHeader("Grands prix"),
-                dbc.CardBody(html.H4(nb_gp, className="card-title"))
-            ], className="mb-2 bg-gradient-primary shadow kpi-glass kpi-fadein"), width=2),
-            dbc.Col(dbc.Card([
-                dbc.CardHeader("Pilotes classés"),
-                dbc.CardBody(html.H4(nb_pilotes, className="card-title"))
-            ], className="mb-2 bg-gradient-info shadow kpi-glass kpi-fadein"), width=2),
-            dbc.Col(dbc.Card([
-                dbc.CardHeader("Écuries"),
-                dbc.CardBody(html.H4(nb_teams, className="card-title"))
-            ], className="mb-2 bg-gradient-secondary shadow kpi-glass kpi-fadein"), width=2),
-            dbc.Col(dbc.Card([
-                dbc.CardHeader("Abandons (%)"),
-                dbc.CardBody(html.H4(f"{pct_abandons:.1f} %", className="card-title"))
-            ], className="mb-2 bg-gradient-danger shadow kpi-glass kpi-fadein"), width=2),
-            dbc.Col(dbc.Card([
-                dbc.CardHeader("CO₂ logistique total (t)"),
-                dbc.CardBody(html.H4(f"{co2_total}", className="card-title"))
-            ], className="mb-2 bg-gradient-dark shadow kpi-glass kpi-fadein"), width=2),
-            dbc.Col(dbc.Card([
-                dbc.CardHeader("Roi du GP"),
-                dbc.CardBody(
-                    html.Div([
-                        html.Span([
-                            html.Img(
-                                src=best_winner_img,
-                                height="38px",
-                                style={
-                                    "borderRadius": "19px",
-                                    "verticalAlign": "middle",
-                                    "marginRight": "8px",
-                                    "border": f"2px solid {team_colors.get(best_winner_team, '#aaa')}"
-                                }
-                            ) if best_winner_img else "",
-                            html.Span(
-                                f"{best_winner}",
-                                style={
-                                    "verticalAlign": "middle",
-                                    "fontWeight": "bold",
-                                    "fontSize": "1.05rem",
-                                    "color": team_colors.get(best_winner_team, "#ffa")
-                                }
-                            )
-                        ], style={"display": "flex", "alignItems": "center", "justifyContent": "center", "gap": "6px", "lineHeight": "1.1", "marginBottom": "2px"}),
-                        html.Div(
-                            f"{best_winner_team}",
-                            className="small mb-0 text-muted",
-                            style={"lineHeight": "1", "marginBottom": "2px"}
-                        ),
-                        html.Div(
-                            f"{nb_victoires} victoires",
-                            className="small text-muted",
-                            style={"lineHeight": "2", "marginBottom": "-15px"}
-                        )
-                    ], style={"padding": "0", "margin": "0"})
-                ),
-            ], className="mb-2 bg-gradient-warning shadow kpi-glass kpi-fadein"), width=2)
-        ], className="text-center"),
-        dbc.Row([
-            dbc.Col(dcc.Graph(figure=fig_bar_race, className="styled-card fadein-graph"), width=8),
+            dbc.Col(dcc.Graph(id="fig-bar-race", figure=fig_bar_race, className="styled-card fadein-graph"), width=8),
             dbc.Col([
-                dcc.Graph(figure=fig_pie_podium)
+                dcc.Graph(id="fig-pie-podium", figure=fig_pie_podium)
             ], width=4, style={"marginTop": "6.5%"}, className="styled-card fadein-graph")
-        ])
+        ]),
+        dcc.Store(id="bar-race-meta", data={"season": season, "meta": frame_meta, "labels": frame_labels}),
+        dcc.Store(id="bar-race-chunk"),
+        dcc.Store(id="bar-race-loaded"),
+        dcc.Interval(id="bar-race-pull", interval=100, max_intervals=-(-len(frames) // CHUNK_FRAMES)),
+        # Mode live : la page interroge le serveur et reçoit seulement les GP arrivés depuis sa version
+        *([
+            dcc.Interval(id="live-poll", interval=int(LIVE_POLL_SECONDS * 1000)),
+            dcc.Store(id="live-state", data={"season": season, "version": model.version}),
+        ] if LIVE else [])
     ], fluid=True)
 
+# Paquet `n` des images compactes de la bar race (l'Interval de la page en demande un par tick)
+@callback(
+    Output("bar-race-chunk", "data"),
+    Input("bar-race-pull", "n_intervals"),
+    State("bar-race-meta", "data"),
+    prevent_initial_call=True
+)
+def send_bar_race_chunk(n, store):
+    return frame_chunk(bar_race_bundle(store["season"])[3], n - 1)
+
+# Images décodées et ajoutées au graphique dans le navigateur (assets/clientside.js)
+clientside_callback(
+    ClientsideFunction(namespace="f1", function_name="bar_race_frames"),
+    Output("bar-race-loaded", "data"),
+    Input("bar-race-chunk", "data"),
+    State("bar-race-meta", "data")
+)
+
+def push_live_update(_, state):
+    """Met à jour une page d'accueil ouverte : images de bar race des nouveaux GP
+    (ajoutées côté client, seuls le curseur et l'axe sont patchés), KPIs et podiums
+    recalculés depuis les compteurs live."""
+    live = get_live(state["season"])
+    live.poll()
+    with live.lock:
+        if live.version == state["version"]:
+            return (dash.no_update,) * 6
+        new = live.rounds_since(state["version"])
+        # Les GP repliés s'ajoutent toujours après les précédents : la page en a déjà `start`
+        start = len(live.rounds) - len(new) if new is not None else 0
+        # Version inconnue de ce processus, ou figure sans animation : renvoyée en entier
+        if new is not None and start >= 2:
+            bar_race = dash.Patch()
+            new_frames = []
+            for rd in new:
+                frame, step = FIGURE_CACHE.get_or_build(
+                    ("bar_race_frame", live.season, rd, live.stamps[rd]),
+                    lambda: bar_race_frame(live.cumul_rows[rd], live.team_color_map, live.team_order)
+                )
+                new_frames.append(frame)
+                bar_race["layout"]["sliders"][0]["steps"].append(step)
+            bar_race["layout"]["xaxis"]["range"] = [0, live.max_points * 1.1]
+            frames = {"start": start, "frames": new_frames, "next": None}
+            kpis = live.kpis()
+            kpis["best_winner_img"] = pilot_img_url(kpis.pop("best_winner_row"))
+            pie_podium = pack_figure(podium_pie(live.podium_count(), live.team_colors, live.pilot2team))
+            state = {"season": live.season, "version": live.version}
+            return bar_race, pie_podium, home_kpi_cards(kpis, live.team_colors), state, frames, dash.no_update
+    model = get_model(state["season"])
+    if model.version == state["version"]:
+        return (dash.no_update,) * 6
+    season = model.season
+    fig_bar_race, frame_meta, frame_labels, frames = bar_race_bundle(season)
+    fig_pie_podium = load_or_create_figure("pie_podium", lambda: create_pie_podium(season), inputs=("results",), season=season)
+    state = {"season": season, "version": model.version}
+    return (
+        fig_bar_race, fig_pie_podium, home_kpi_cards(home_kpis(season), model.team_colors), state,
+        {"start": 0, "frames": frames, "next": None, "reset": True},
+        {"season": season, "meta": frame_meta, "labels": frame_labels},
+    )
+
+if LIVE:
+    callback(
+        [
+            Output("fig-bar-race", "figure"), Output("fig-pie-podium", "figure"), Output("home-kpis", "children"), Output("live-state", "data"),
+            Output("bar-race-chunk", "data", allow_duplicate=True), Output("bar-race-meta", "data"),
+        ],
+        Input("live-poll", "n_intervals"),
+        State("live-state", "data"),
+        prevent_initial_call=True
+    )(push_live_update)
+
 # 2️⃣ STRATEGIE & CHAOS (avec heatmap custom + bar pneus par GP)
-# Variables globales nécessaires au callback
-pits_valid = df_pits.dropna(subset=['CompoundIn', 'CompoundOut', 'event'])
-gp_list = df_results.sort_values("round")["event"].unique().tolist()
 compound_colors = {
     'SOFT': '#FF2B2B',         # Rouge
     'MEDIUM': '#FFD12E',       # Jaune
@@ -238,93 +365,87 @@ compound_colors = {
     'ULTRA_SOFT': '#A020F0',   # Violet,
 }
 
-fastf1.Cache.enable_cache('.cache_f1')
+# Graphique temps au tour top 5 dernier GP (session FastF1)
+LAP_FIG_INPUTS = ("results",)  # un nouveau GP invalide le graphique du "dernier GP"
 
-def strategie_layout():
-    # --- 1. Graphique temps au tour top 5 dernier GP ---
-    fig_lap_path = os.path.join("data", "fig_lap_lastgp.json")
-    fig_lap = None
-
-    if os.path.exists(fig_lap_path):
-        # Chargement rapide du graphique pré-calculé
-        with open(fig_lap_path, "r", encoding="utf-8") as f:
-            fig_lap = pio.from_json(f.read())
-    else:
-        # Génération et sauvegarde si besoin
-        last_gp_round = df_results['round'].max()
-        last_gp_name = df_results[df_results['round'] == last_gp_round]['event'].iloc[0]
-        df_last_gp = df_results[df_results['round'] == last_gp_round].sort_values('Position')
-        drivers = df_last_gp['Abbreviation'].head(5).tolist()
-        abbr_to_full = df_last_gp.set_index('Abbreviation')['FullName'].to_dict()
-        driver_to_team = df_last_gp.set_index('Abbreviation')['TeamName'].to_dict()
-        team_colors = df_results.drop_duplicates("TeamName").set_index("TeamName")["TeamColor"].apply(
-            lambda c: f"#{c}" if not str(c).startswith("#") else str(c)).to_dict()
-        import sys, contextlib
-        from io import StringIO
-        with contextlib.redirect_stdout(StringIO()), contextlib.redirect_stderr(StringIO()):
-            session = fastf1.get_session(2025, last_gp_name, 'R')
-            session.load()
-        fig_lap = go.Figure()
-        for driver in drivers:
-            team = driver_to_team[driver]
-            full_name = abbr_to_full.get(driver, driver)
-            laps = session.laps.pick_drivers(driver).pick_quicklaps()
-            if laps.empty:
-                continue
-            fig_lap.add_trace(go.Scatter(
-                x=laps['LapNumber'],
-                y=laps['LapTime'].dt.total_seconds(),
-                mode='lines+markers',
-                name=full_name,
-                line=dict(color=team_colors.get(team, "#888"), width=3),
-                marker=dict(size=6, symbol="circle"),
-                hovertemplate=(
-                    f"<b>Pilote : {full_name}</b><br>"
-                    f"Écurie : {team}<br>"
-                    "Tour : %{x}<br>"
-                    "Temps : %{y:.3f} s"
-                ),
-            ))
-        fig_lap.update_layout(
-            title=f"⏱️ Temps au tour — Top 5 pilotes — Dernier GP ({last_gp_name})",
-            title_x=0.5,
-            xaxis_title="Numéro de tour",
-            yaxis_title="Temps au tour (s)",
-            legend_title="Pilote",
-            template="plotly_dark",
-            height=450,
-            font=dict(family="Montserrat, Arial", size=15),
-            margin=dict(l=60, r=40, t=60, b=40),
-            xaxis=dict(showgrid=False, zeroline=False),
-            yaxis=dict(showgrid=False, zeroline=False)
-        )
-        # Sauvegarde pour les prochains lancements
-        with open(fig_lap_path, "w", encoding="utf-8") as f:
-            f.write(fig_lap.to_json())
+def create_lap_fig(season=None):
+    model = get_model(season)
+    df_results = model.results
+    last_gp_round = df_results['round'].max()
+    last_gp_name = df_results[df_results['round'] == last_gp_round]['event'].iloc[0]
+    df_last_gp = df_results[df_results['round'] == last_gp_round].sort_values('Position')
+    drivers = df_last_gp['Abbreviation'].head(5).tolist()
+    abbr_to_full = df_last_gp.set_index('Abbreviation')['FullName'].to_dict()
+    driver_to_team = df_last_gp.set_index('Abbreviation')['TeamName'].to_dict()
+    team_colors = model.team_colors
+    # Seuls les tours sont chargés (ni télémétrie, ni météo, ni messages)
+    race_laps = load_race_laps(model.season, last_gp_name)
+    fig_lap = go.Figure()
+    for driver in drivers:
+        team = driver_to_team[driver]
+        full_name = abbr_to_full.get(driver, driver)
+        laps = race_laps.pick_drivers(driver).pick_quicklaps()
+        if laps.empty:
+            continue
+        fig_lap.add_trace(go.Scatter(
+            x=laps['LapNumber'],
+            y=laps['LapTime'].dt.total_seconds(),
+            mode='lines+markers',
+            name=full_name,
+            line=dict(color=team_colors.get(team, "#888"), width=3),
+            marker=dict(size=6, symbol="circle"),
+            hovertemplate=(
+                f"<b>Pilote : {full_name}</b><br>"
+                f"Écurie : {team}<br>"
+                "Tour : %{x}<br>"
+                "Temps : %{y:.3f} s"
+            ),
+        ))
+    fig_lap.update_layout(
+        title=f"⏱️ Temps au tour — Top 5 pilotes — Dernier GP ({last_gp_name})",
+        title_x=0.5,
+        xaxis_title="Numéro de tour",
+        yaxis_title="Temps au tour (s)",
+        legend_title="Pilote",
+        template="plotly_dark",
+        height=450,
+        font=dict(family="Montserrat, Arial", size=15),
+        margin=dict(l=60, r=40, t=60, b=40),
+        xaxis=dict(showgrid=False, zeroline=False),
+        yaxis=dict(showgrid=False, zeroline=False)
+    )
+    return fig_lap
 
+def request_lap_fig(season=None):
+    """Construit (ou relit) le graphique temps au tour dans un thread de fond.
+    Plusieurs visiteurs simultanés partagent la même tâche."""
+    model = get_model(season)
+    key = ("lap_lastgp", model.version)
+    return JOBS.submit(
+        key, load_or_create_figure, "lap_lastgp", lambda: create_lap_fig(model.season),
+        inputs=LAP_FIG_INPUTS, season=model.season
+    )
+
+def lap_placeholder(message="⏳ Chargement des temps au tour (session FastF1)…"):
+    fig = go.Figure()
+    fig.update_layout(
+        template="plotly_dark", height=450,
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(visible=False), yaxis=dict(visible=False),
+        annotations=[dict(text=message, showarrow=False, font=dict(size=18, color="#F2F2F2"))]
+    )
+    return fig
+
+def strategie_layout(season=None):
+    model = get_model(season)
+    df_results = model.results
+    gp_list = list(model.gp_order)
+    # --- 1. Graphique temps au tour top 5 dernier GP ---
+    # Rempli par le callback fill_lap_fig dès que la session est prête (placeholder en attendant)
+    request_lap_fig(model.season)
     # --- Heatmap interactif (graphique) ---
-    df_results['delta'] = df_results['GridPosition'] - df_results['Position']
-    gp_order = df_results.sort_values("round")["event"].unique().tolist()
-    pilot_order = df_results.groupby("FullName")["Position"].sum().sort_values().index.tolist()
-    pivot = df_results.pivot_table(index='FullName', columns='event', values='delta').reindex(index=pilot_order, columns=gp_order)
-    gridpos = df_results.pivot_table(index='FullName', columns='event', values='GridPosition').reindex(index=pilot_order, columns=gp_order)
-    arrpos  = df_results.pivot_table(index='FullName', columns='event', values='Position').reindex(index=pilot_order, columns=gp_order)
-    hovertext = np.empty(pivot.shape, dtype=object)
-    textvals = np.empty(pivot.shape, dtype=object)
-    for i, name in enumerate(pivot.index):
-        for j, ev in enumerate(pivot.columns):
-            val = pivot.iloc[i, j]
-            grid = gridpos.iloc[i, j]
-            arr  = arrpos.iloc[i, j]
-            sign = "+" if pd.notna(val) and val > 0 else ""
-            textvals[i, j] = f"{sign}{int(val) if pd.notna(val) else ''}"
-            hovertext[i, j] = (
-                f"Grand Prix : <b>{ev}</b><br>"
-                f"Pilote : <b>{name}</b><br>"
-                f"Positions gagnées/perdues : <b>{sign}{val if pd.notna(val) else 'N/A'}</b><br>"
-                f"Position départ : <b>{int(grid) if pd.notna(grid) else 'N/A'}</b><br>"
-                f"Position arrivée : <b>{int(arr) if pd.notna(arr) else 'N/A'}</b>"
-            )
+    gp_order = gp_list
+    pivot, textvals, hovertext = build_heatmap_data(df_results, gp_order)
     fig_heatmap = go.Figure(
         data=go.Heatmap(
             z=pivot.values,
@@ -380,7 +501,10 @@ def strategie_layout():
     # --- Layout final de la page ---
     layout = dbc.Container([
         dbc.Row([
-            dbc.Col(dcc.Graph(figure=fig_lap, className="styled-card fadein-graph"), width=12)
+            dbc.Col([
+                dcc.Graph(id="fig-lap", figure=lap_placeholder(), className="styled-card fadein-graph"),
+                dcc.Interval(id="lap-poll", interval=1000, disabled=False),
+            ], width=12)
         ], className="mb-3", style={"marginTop": "-30px"}),
         dbc.Row([
             dbc.Col(dbc.Card(dcc.Graph(figure=fig_heatmap, id="fig-heatmap", config={"displayModeBar": False}, className="fadein-graph"), className="styled-card"), width=7),
@@ -391,34 +515,47 @@ def strategie_layout():
                     options=[{"label": gp, "value": gp} for gp in gp_list],
                     value=gp_list[0], clearable=False, className="custom-dropdown"
                 ),
-                dcc.Graph(id="fig-pit-gp", config={"displayModeBar": False}, style={"height": "460px"}, className="fadein-graph")
+                dcc.Graph(id="fig-pit-gp", config={"displayModeBar": False}, style={"height": "460px"}, className="fadein-graph"),
+                *([dcc.Store(id="pit-store", data=pit_store_data(model.season))] if CLIENTSIDE else []),
             ], className="styled-card"), width=5)
         ], className="g-3 mb-3"),
+        dbc.Row([
+            dbc.Col(dbc.Card([
+                html.H5("🛞📉 Dégradation des pneus (s perdues par tour de vie du pneu)", className="text-center mb-3"),
+                dcc.RadioItems(
+                    id="deg-scope", value="season", inline=True, className="text-light text-center mb-2",
+                    options=[{"label": f"Saison {model.season}", "value": "season"}, {"label": "Toutes les saisons", "value": "archive"}],
+                ),
+                dbc.Row([
+                    dbc.Col(dcc.Graph(id="fig-deg-team", figure=lap_placeholder("⏳ Calcul de la dégradation…"), config={"displayModeBar": False}, className="fadein-graph"), width=6),
+                    dbc.Col(dcc.Graph(id="fig-deg-circuit", figure=lap_placeholder("⏳ Calcul de la dégradation…"), config={"displayModeBar": False}, className="fadein-graph"), width=6),
+                ], className="g-3"),
+            ], className="styled-card"), width=12)
+        ], className="mb-3"),
         dbc.Row([
             dbc.Col(dbc.Card(dcc.Graph(figure=fig_abandon, id="fig-abandon", config={"displayModeBar": False}, className="fadein-graph"), className="styled-card"), width=12)
         ], className="mb-3"),
     ], fluid=True)
     return layout
 
-# Callback pour le graphique des pneus (inchangé, mais le graphique s'adaptera au nouveau style de la carte)
+# Callback du graphique temps au tour : interroge la tâche de fond jusqu'à ce qu'elle aboutisse
 @callback(
-    Output("fig-pit-gp", "figure"),
-    Input("dropdown-gp", "value")
+    [Output("fig-lap", "figure"), Output("lap-poll", "disabled")],
+    Input("lap-poll", "n_intervals"),
+    State("season-select", "value")
 )
-def update_pit_plot(gp):
-    data = pits_valid[pits_valid["event"] == gp]
-    if data.empty:
-        # Affiche un graphique vide si pas de données
-        fig_pit = go.Figure()
-        fig_pit.update_layout(
-            title=f"Aucune donnée d'arrêts pour {gp}",
-            template='plotly_dark',
-            height=550
-        )
-        return fig_pit
-    bar_data = data.groupby(['TeamName', 'CompoundIn']).size().reset_index(name='NbArrets')
-    bar_data["TeamTotal"] = bar_data.groupby("TeamName")["NbArrets"].transform("sum")
-    bar_data = bar_data.sort_values(["TeamTotal", "TeamName"], ascending=[False, True])
+def fill_lap_fig(_, season=None):
+    fig_lap = load_figure("lap_lastgp", inputs=LAP_FIG_INPUTS, season=season)
+    if fig_lap is not None:
+        return fig_lap, True
+    job = request_lap_fig(season)
+    if not job.done():
+        return dash.no_update, False
+    if job.exception() is not None:
+        return lap_placeholder("Session FastF1 indisponible pour le moment"), True
+    return job.result(), True
+
+def create_pit_fig(gp, bar_data):
     fig_pit = px.bar(
         bar_data, x='TeamName', y='NbArrets', color='CompoundIn',
         title=f"Arrêts par Écurie – {gp}",
@@ -434,12 +571,119 @@ def update_pit_plot(gp):
         yaxis=dict(showgrid=False, zeroline=False),
         barcornerradius=8
     )
+    return fig_pit
 
+def pit_empty_fig(gp):
+    # Affiche un graphique vide si pas de données
+    fig_pit = go.Figure()
+    fig_pit.update_layout(
+        title=f"Aucune donnée d'arrêts pour {gp}",
+        template='plotly_dark',
+        height=550
+    )
     return fig_pit
 
+# Callback pour le graphique des pneus : agrégats pré-calculés par GP (model.pits_by_gp)
+# et figures mémorisées, un changement de GP n'est plus qu'une recherche dans un dictionnaire
+@timed_callback("update_pit_plot")
+def update_pit_plot(gp, season=None):
+    model = get_model(season)
+    bar_data = model.pits_by_gp.get(gp)
+    if bar_data is None:
+        return pit_empty_fig(gp)
+    return FIGURE_CACHE.get_or_build(("pit_gp", gp, model.version), lambda: pack_figure(create_pit_fig(gp, bar_data)))
+
+def pit_store_data(season=None):
+    """Agrégats de model.pits_by_gp pour le mode clientside : une figure de référence
+    (layout, trace type) et, par GP, [pneu, couleur, écuries, nb d'arrêts] par trace."""
+    reference = pd.DataFrame({'TeamName': [SENTINEL], 'NbArrets': [0], 'CompoundIn': [SENTINEL]})
+    template, layout, trace = figure_parts(create_pit_fig(SENTINEL, reference))
+    gps = {}
+    for gp, bar_data in get_model(season).pits_by_gp.items():
+        # Une trace par pneu, dans l'ordre d'apparition (comme px.bar)
+        compounds = bar_data['CompoundIn'].unique().tolist()
+        colors = discrete_colors(compounds, compound_colors, px.colors.qualitative.Plotly)
+        by_compound = bar_data.groupby('CompoundIn', sort=False)
+        gps[gp] = [
+            [c, color, by_compound.get_group(c)['TeamName'].tolist(), by_compound.get_group(c)['NbArrets'].tolist()]
+            for c, color in zip(compounds, colors)
+        ]
+    _, empty, _ = figure_parts(pit_empty_fig(SENTINEL))
+    return dict(template=template, layout=layout, trace=trace, empty=empty, gps=gps)
+
+# Mode clientside : le navigateur redessine le graphique depuis le Store "pit-store"
+if CLIENTSIDE:
+    clientside_callback(
+        ClientsideFunction(namespace="f1", function_name="pit_figure"),
+        Output("fig-pit-gp", "figure"),
+        Input("dropdown-gp", "value"),
+        State("pit-store", "data")
+    )
+else:
+    callback(Output("fig-pit-gp", "figure"), Input("dropdown-gp", "value"), State("season-select", "value"))(update_pit_plot)
+
+# Dégradation des pneus par écurie et par circuit, sur la saison ou toute l'archive : les
+# relais de toutes les saisons sont ajustés d'un bloc (f1dash.degradation) depuis le magasin
+# des tours rapides, et le résultat est gardé tant que les tours des saisons concernées ne changent pas
+def degradation_stints(scope="season", season=None):
+    season_list = seasons() if scope == "archive" else [get_model(season).season]
+    key = ("deg_stints", tuple((s, data_fingerprint(("laps",), s)) for s in season_list))
+    return key, POINTS_CACHE.get_or_build(key, lambda: fit_stints(load_laps(season_list)))
+
+def degradation_style(fig, title):
+    fig.update_layout(
+        title=title, title_x=0.5, template='plotly_dark', height=450,
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Montserrat, Arial", color="#F2F2F2"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False),
+    )
+    return fig
+
+def create_degradation_figs(stints, label):
+    compounds = compound_order(stints["Compound"].unique())
+    by_team = summarize(stints, ["Team", "Compound"])
+    team_fig = go.Figure([
+        go.Bar(
+            x=rows["Team"], y=rows["deg"], name=compound, marker_color=compound_colors.get(compound, "#888"),
+            customdata=rows[["stints", "laps"]],
+            hovertemplate="Écurie : %{x}<br>Dégradation : %{y:.3f} s/tour<br>%{customdata[0]} relais, %{customdata[1]} tours<extra>" + compound + "</extra>",
+        )
+        for compound, rows in ((c, by_team[by_team["Compound"] == c].sort_values("Team")) for c in compounds)
+    ])
+    team_fig.update_layout(barmode="group", barcornerradius=4, yaxis_title="s / tour", xaxis_title="Écurie")
+    # Circuits dans l'ordre du calendrier (première apparition), pneus du plus tendre au plus dur
+    by_circuit = summarize(stints, ["event", "Compound"])
+    grid = by_circuit.pivot(index="Compound", columns="event", values="deg").reindex(index=compounds, columns=by_circuit["event"].unique())
+    circuit_fig = go.Figure(go.Heatmap(
+        z=grid.values, x=grid.columns, y=grid.index, colorscale="YlOrRd", colorbar=dict(title="s/tour", thickness=15),
+        hovertemplate="Circuit : %{x}<br>Pneu : %{y}<br>Dégradation : %{z:.3f} s/tour<extra></extra>",
+    ))
+    circuit_fig.update_layout(yaxis=dict(autorange="reversed"))
+    return (
+        degradation_style(team_fig, f"<b>Dégradation par écurie et par pneu – {label}</b>"),
+        degradation_style(circuit_fig, f"<b>Dégradation par circuit – {label}</b>"),
+    )
+
+@callback(
+    [Output("fig-deg-team", "figure"), Output("fig-deg-circuit", "figure")],
+    Input("deg-scope", "value"),
+    State("season-select", "value")
+)
+@timed_callback("update_degradation")
+def update_degradation(scope, season=None):
+    model = get_model(season)
+    key, stints = degradation_stints(scope, season)
+    if stints.empty:
+        hint = lap_placeholder(f"Aucun tour enregistré : python -m f1dash.laps --season {model.season}")
+        return hint, hint
+    label = "toutes les saisons" if scope == "archive" else f"saison {model.season}"
+    return FIGURE_CACHE.get_or_build(("deg", scope, key), lambda: tuple(map(pack_figure, create_degradation_figs(stints, label))))
+
 # -----------  DUELS INTRA-ECURIE ------------------
-def duels_layout():
-    teams = sorted(df_results["TeamName"].unique())
+def duels_layout(season=None):
+    model = get_model(season)
+    teams = sorted(model.results["TeamName"].unique())
     return dbc.Container([
         dbc.Row(dbc.Col(html.H1("⚔️ Duels des Coéquipiers", className="text-center text-light my-4"), width=12, style={"marginTop": "-50px"})),
         dbc.Row(dbc.Col(dcc.Dropdown(
@@ -457,23 +701,14 @@ def duels_layout():
         dbc.Row([
             dbc.Col(dbc.Card(dcc.Graph(id="fig-bar-duel", className="fadein-graph"), className="styled-card"), width=6),
             dbc.Col(dbc.Card(dcc.Graph(id="fig-bump-duel", className="fadein-graph"), className="styled-card"), width=6),
-        ], className="g-4")
+        ], className="g-4"),
+        *([dcc.Store(id="duel-store", data=duel_store_data(model.season))] if CLIENTSIDE else []),
     ], fluid=True)
 
-@callback(
-    [Output("fig-bar-duel", "figure"),
-     Output("fig-bump-duel", "figure"),
-     Output("duel-col-1", "children"),
-     Output("duel-col-2", "children"),
-     Output("duel-col-3", "children")],
-    [Input("select-team", "value")]
-)
-def update_duel(team):
-    sub = df_results[df_results["TeamName"] == team]
-    score = sub.groupby('FullName')['Points'].sum().sort_values(ascending=False)
-    pilotes = score.index.tolist()
-
-    # --- Graphiques (logique commune) ---
+# Graphiques d'une écurie, construits depuis le bundle pré-calculé (model.duels)
+def create_duel_figs(team, duel, team_colors):
+    score = duel.score
+    pilotes = duel.pilotes
     bar = px.bar(
         score, x=score.values, y=score.index, orientation='h',
         color_discrete_sequence=[team_colors.get(team, "#fff")]*len(pilotes),
@@ -487,12 +722,9 @@ def update_duel(team):
     )
     bar.update_traces(marker_line_width=0, marker_cornerradius=8, textposition='outside')
 
-    cumul = (df_drv_stand[df_drv_stand["TeamName"] == team].sort_values(['FullName', 'round'])
-             .groupby(['FullName', 'round'])['Points'].sum().groupby(level=0).cumsum().reset_index(name='PointsCum'))
-    cumul['event'] = cumul['round'].map(df_results.set_index('round')['event'].to_dict())
     pilot_color_map = {p: c for p, c in zip(pilotes, px.colors.qualitative.Plotly)}
     bump = px.line(
-        cumul, x='event', y='PointsCum', color='FullName', markers=True,
+        duel.cumul, x='event', y='PointsCum', color='FullName', markers=True,
         title=f"<b>Progression Saison – {team}</b>", 
         labels={'event': 'Grand Prix', 'PointsCum': 'Points Cumulés', 'FullName': 'Pilote'},
         color_discrete_map=pilot_color_map
@@ -502,11 +734,16 @@ def update_duel(team):
         plot_bgcolor='rgba(0,0,0,0)', xaxis=dict(showgrid=False), 
         yaxis=dict(showgrid=False, zeroline=False), title_x=0.5
     )
+    return bar, bump
+
+# Cartes pilotes (photo, points) et face-à-face, depuis le bundle de l'écurie
+def create_duel_cards(team, duel, team_colors):
+    score = duel.score
+    pilotes = duel.pilotes
 
     # --- Cartes (logique conditionnelle) ---
     def create_driver_card_content(p_name, p_score):
-        row = sub[sub["FullName"] == p_name].iloc[0]
-        url = pilot_img_url(row)
+        url = pilot_img_url(duel.first_rows[p_name])
         return [
             html.Img(src=url, className="mb-3 mx-auto d-block", style={
                 "width": "120px", "height": "120px", "borderRadius": "50%",
@@ -521,9 +758,8 @@ def update_duel(team):
 
     if len(pilotes) == 2:
         p1, p2 = pilotes[0], pilotes[1]
-        h2h_races = sub.pivot(index='event', columns='FullName', values='Position').dropna()
-        p1_wins = (h2h_races[p1] < h2h_races[p2]).sum()
-        p2_wins = (h2h_races[p2] < h2h_races[p1]).sum()
+        p1_wins = duel.wins.get((p1, p2), 0)
+        p2_wins = duel.wins.get((p2, p1), 0)
 
         col1 = dbc.Card(create_driver_card_content(p1, score[p1]), className="styled-card text-center p-3 h-100")
         col3 = dbc.Card(create_driver_card_content(p2, score[p2]), className="styled-card text-center p-3 h-100")
@@ -532,121 +768,218 @@ def update_duel(team):
             html.H1(f"{p1_wins} - {p2_wins}", className="my-auto display-4")
         ], className="styled-card text-center p-3 h-100 d-flex flex-column justify-content-center")
         
-        return bar, bump, col1, col2, col3
+        return col1, col2, col3
     
-    elif len(pilotes) >= 3:
+    else: # 3 pilotes ou plus (remplacement en cours de saison)
         cols = [dbc.Card(create_driver_card_content(p, score[p]), className="styled-card text-center p-3 h-100") for p in pilotes[:3]]
-        while len(cols) < 3:
-            cols.append(None)
-        return bar, bump, cols[0], cols[1], cols[2]
+        return cols[0], cols[1], cols[2]
+
+def duel_empty_fig():
+    return go.Figure().update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', annotations=[dict(text="Pas assez de données", showarrow=False)])
 
-    else: # 0 ou 1 pilote
-        empty_fig = go.Figure().update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', annotations=[dict(text="Pas assez de données", showarrow=False)])
+@timed_callback("update_duel")
+def update_duel(team, season=None):
+    model = get_model(season)
+    team_colors = model.team_colors
+    duel = model.duels.get(team)
+    pilotes = duel.pilotes if duel is not None else []
+    if len(pilotes) < 2: # 0 ou 1 pilote
+        empty_fig = duel_empty_fig()
         return empty_fig, empty_fig, None, None, None
+    bar, bump = FIGURE_CACHE.get_or_build(("duel", team, model.version), lambda: tuple(map(pack_figure, create_duel_figs(team, duel, team_colors))))
+    return (bar, bump, *create_duel_cards(team, duel, team_colors))
+
+def duel_store_data(season=None):
+    """Bundles de model.duels pour le mode clientside : figures de référence (bar, bump),
+    et par écurie les points, les courbes de points cumulés et les cartes déjà construites."""
+    model = get_model(season)
+    team_colors = model.team_colors
+    reference = TeamDuel(
+        score=pd.Series([0.0], index=pd.Index([SENTINEL], name='FullName'), name='Points'),
+        cumul=pd.DataFrame({'FullName': [SENTINEL], 'round': [0], 'PointsCum': [0.0], 'event': [SENTINEL]}),
+        wins={}, first_rows={},
+    )
+    bar, bump = create_duel_figs(SENTINEL, reference, {})
+    template, bar_layout, bar_trace = figure_parts(bar)
+    _, bump_layout, bump_trace = figure_parts(bump)
+    teams = {}
+    for team, duel in model.duels.items():
+        pilotes = duel.pilotes
+        if len(pilotes) < 2:
+            continue  # le navigateur affiche la figure vide
+        # Une courbe par pilote, dans l'ordre d'apparition et avec les couleurs de px.line
+        pilot_color_map = {p: c for p, c in zip(pilotes, px.colors.qualitative.Plotly)}
+        names = duel.cumul['FullName'].unique().tolist()
+        colors = discrete_colors(names, pilot_color_map, px.colors.qualitative.Plotly)
+        by_pilot = duel.cumul.groupby('FullName', sort=False)
+        teams[team] = dict(
+            color=team_colors.get(team, "#fff"),
+            names=pilotes,
+            points=duel.score.tolist(),
+            cumul=[
+                [p, color, by_pilot.get_group(p)['event'].tolist(), by_pilot.get_group(p)['PointsCum'].tolist()]
+                for p, color in zip(names, colors)
+            ],
+            cards=to_json_data(list(create_duel_cards(team, duel, team_colors))),
+        )
+    _, empty, _ = figure_parts(duel_empty_fig())
+    return dict(
+        template=template, empty=empty, teams=teams,
+        bar=dict(layout=bar_layout, trace=bar_trace),
+        bump=dict(layout=bump_layout, trace=bump_trace),
+    )
+
+# Mode clientside : le navigateur redessine figures et cartes depuis le Store "duel-store"
+DUEL_OUTPUTS = [
+    Output("fig-bar-duel", "figure"),
+    Output("fig-bump-duel", "figure"),
+    Output("duel-col-1", "children"),
+    Output("duel-col-2", "children"),
+    Output("duel-col-3", "children"),
+]
+if CLIENTSIDE:
+    clientside_callback(
+        ClientsideFunction(namespace="f1", function_name="duel"),
+        DUEL_OUTPUTS,
+        Input("select-team", "value"),
+        State("duel-store", "data")
+    )
+else:
+    callback(DUEL_OUTPUTS, [Input("select-team", "value")], State("season-select", "value"))(update_duel)
 
 # -----------  RECORDS / STORYTELLING ------------------
-# Cache pour chaque figure
+# Cache pour chaque figure (nom dans le cache disque)
 records_figs = {
-    'comeback': os.path.join("data", "fig_records_comeback.json"),
-    'streak': os.path.join("data", "fig_records_streak.json"),
-    'dnf': os.path.join("data", "fig_records_dnf.json"),
-    'podiums': os.path.join("data", "fig_records_podiums.json"),
+    'comeback': "records_comeback",
+    'streak': "records_streak",
+    'dnf': "records_dnf",
+    'podiums': "records_podiums",
 }
-def records_layout():
-    def create_comeback():
-        df_results['comeback'] = df_results['GridPosition'] - df_results['Position']
-        best_comebacks = df_results.sort_values('comeback', ascending=False).head(10)
-        fig = px.bar(
-            best_comebacks[::-1], x='comeback', y='FullName', color='TeamName', color_discrete_map=team_colors,
-            orientation='h', text='event', hover_data=['event', 'GridPosition', 'Position'],
-            labels={'comeback': 'Positions Gagnées', 'FullName': 'Pilote'},
-            title="🏆 Top 10 des Plus Grandes Remontées"
-        )
-        fig.update_layout(
-            template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', showlegend=True,
-            xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False),
-            barcornerradius=8, title_x=0.5
-        )
-        return fig
-    def create_streak():
-        df_results_sorted = df_results.sort_values(['FullName', 'round'])
-        df_results_sorted['has_points'] = df_results_sorted['Points'] > 0
-        streaks = {}
-        for pilot in df_results_sorted['FullName'].unique():
-            s = df_results_sorted[df_results_sorted['FullName'] == pilot]['has_points'].values
-            max_streak = 0
-            current = 0
-            for v in s:
-                if v:
-                    current += 1
-                    max_streak = max(max_streak, current)
-                else:
-                    current = 0
-            streaks[pilot] = max_streak
-        streaks = pd.Series(streaks).sort_values(ascending=False).head(10)
-        fig = px.bar(
-            streaks[::-1], x=streaks.values, y=streaks.index,
-            color=streaks.index, color_discrete_sequence=px.colors.sequential.Viridis,
-            orientation='h', title="📈 Plus Longues Séries de Points (Top 10)",
-            labels={'y': 'Pilote', 'x': 'Nombre de GP consécutifs'}
-        )
-        fig.update_layout(
-            template="plotly_dark", height=400, showlegend=False, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False),
-            barcornerradius=8, title_x=0.5
-        )
-        return fig
-    def create_dnf():
-        dnf = df_results[df_results["Status"].isin(["Retired", "Disqualified"])]
-        dnf_pilots = dnf["FullName"].value_counts().head(8)
-        fig = px.bar(
-            dnf_pilots[::-1], x=dnf_pilots.values, y=dnf_pilots.index,
-            color=dnf_pilots.index, color_discrete_sequence=px.colors.sequential.OrRd,
-            orientation='h', title="💥 Pilotes avec le Plus d'Abandons",
-            labels={'y': 'Pilote', 'x': "Nombre d'abandons"}
-        )
-        fig.update_layout(
-            template="plotly_dark", height=400, showlegend=False, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False),
-            barcornerradius=8, title_x=0.5
-        )
-        return fig
-    def create_podiums():
-        podiums = df_results[df_results['Position'] <= 3]
-        podium_count = podiums.groupby("FullName")["Position"].count().sort_values(ascending=False).head(10)
-        fig = px.bar(
-            podium_count[::-1], x=podium_count.values, y=podium_count.index,
-            color=podium_count.index,
-            color_discrete_map={p: team_colors.get(pilot2team.get(p), "#aaa") for p in podium_count.index},
-            orientation='h', title="🏅 Top 10 des Pilotes par Nombre de Podiums",
-            labels={'y': 'Pilote', 'x': 'Nombre de Podiums'}
+def records_style(fig):
+    fig.update_layout(
+        template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False),
+        barcornerradius=8, title_x=0.5
+    )
+    return fig
+
+# Figures des records : résultats (delta calculé), couleurs d'écuries, pilote -> écurie,
+# et suffixe du titre (vide pour la saison affichée)
+def create_comeback(df_results, team_colors, pilot2team, label=""):
+    best_comebacks = df_results.sort_values('delta', ascending=False).head(10)
+    fig = px.bar(
+        best_comebacks[::-1], x='delta', y='FullName', color='TeamName', color_discrete_map=team_colors,
+        orientation='h', text='event', hover_data=['event', 'GridPosition', 'Position'],
+        labels={'delta': 'Positions Gagnées', 'FullName': 'Pilote'},
+        title=f"🏆 Top 10 des Plus Grandes Remontées{label}"
+    )
+    fig.update_layout(showlegend=True)
+    return records_style(fig)
+
+def create_streak(df_results, team_colors, pilot2team, label=""):
+    # Sur plusieurs saisons, une série continue d'une saison à la suivante (colonne season)
+    streaks = top_records(longest_streaks(df_results, "points")["streak"], 10)
+    fig = px.bar(
+        streaks[::-1], x=streaks.values, y=streaks.index,
+        color=streaks.index, color_discrete_sequence=px.colors.sequential.Viridis,
+        orientation='h', title=f"📈 Plus Longues Séries de Points (Top 10){label}",
+        labels={'y': 'Pilote', 'x': 'Nombre de GP consécutifs'}
+    )
+    fig.update_layout(showlegend=False)
+    return records_style(fig)
+
+def create_dnf(df_results, team_colors, pilot2team, label=""):
+    dnf_pilots = top_records(tally(df_results, "dnf"), 8)
+    fig = px.bar(
+        dnf_pilots[::-1], x=dnf_pilots.values, y=dnf_pilots.index,
+        color=dnf_pilots.index, color_discrete_sequence=px.colors.sequential.OrRd,
+        orientation='h', title=f"💥 Pilotes avec le Plus d'Abandons{label}",
+        labels={'y': 'Pilote', 'x': "Nombre d'abandons"}
+    )
+    fig.update_layout(showlegend=False)
+    return records_style(fig)
+
+def create_podiums(df_results, team_colors, pilot2team, label=""):
+    podium_count = top_records(tally(df_results, "podium"), 10)
+    fig = px.bar(
+        podium_count[::-1], x=podium_count.values, y=podium_count.index,
+        color=podium_count.index,
+        color_discrete_map={p: team_colors.get(pilot2team.get(p), "#aaa") for p in podium_count.index},
+        orientation='h', title=f"🏅 Top 10 des Pilotes par Nombre de Podiums{label}",
+        labels={'y': 'Pilote', 'x': 'Nombre de Podiums'}
+    )
+    fig.update_layout(showlegend=False)
+    return records_style(fig)
+
+RECORDS_FIGS = {'comeback': create_comeback, 'streak': create_streak, 'dnf': create_dnf, 'podiums': create_podiums}
+# Version de chaque figure dans le cache disque (à incrémenter quand sa construction change)
+RECORDS_VERSIONS = {'comeback': 1, 'streak': 2, 'dnf': 2, 'podiums': 2}
+
+def records_season_figs(season=None):
+    """Figures des records de la saison, gardées dans le cache disque."""
+    model = get_model(season)
+    args = (model.results, model.team_colors, model.pilot2team)
+    return [
+        load_or_create_figure(
+            records_figs[name], lambda create=create: create(*args),
+            inputs=("results",), version=RECORDS_VERSIONS[name], season=model.season
         )
-        fig.update_layout(
-            template="plotly_dark", height=400, showlegend=False, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False),
-            barcornerradius=8, title_x=0.5
+        for name, create in RECORDS_FIGS.items()
+    ]
+
+def records_archive_figs():
+    """Figures des records de toutes les saisons mises bout à bout (séries comprises), gardées
+    tant que les résultats d'aucune saison ne changent."""
+    season_list = seasons()
+    key = ("records_archive", tuple((s, data_fingerprint(("results",), s)) for s in season_list))
+    def build():
+        results = load_results(season_list)
+        results = results.assign(
+            TeamColor=fix_color_series(results["TeamColor"]),
+            delta=results["GridPosition"] - results["Position"],
+            event=results["event"] + " " + results["season"].astype(str),
         )
-        return fig
-    fig_comeback = load_or_create_figure(records_figs['comeback'], create_comeback)
-    fig_streak = load_or_create_figure(records_figs['streak'], create_streak)
-    fig_dnf = load_or_create_figure(records_figs['dnf'], create_dnf)
-    fig_podiums = load_or_create_figure(records_figs['podiums'], create_podiums)
+        # Couleur et écurie les plus récentes (saisons puis GP dans l'ordre)
+        team_colors = results.drop_duplicates("TeamName", keep="last").set_index("TeamName")["TeamColor"].to_dict()
+        pilot2team = results.drop_duplicates("FullName", keep="last").set_index("FullName")["TeamName"].to_dict()
+        return tuple(pack_figure(create(results, team_colors, pilot2team, " – toutes les saisons")) for create in RECORDS_FIGS.values())
+    return FIGURE_CACHE.get_or_build(key, build)
+
+def records_layout(season=None):
+    season = get_model(season).season
+    figs = dict(zip(RECORDS_FIGS, records_season_figs(season)))
+    def graph(name):
+        return dbc.Card(dcc.Graph(id=f"records-{name}", figure=figs[name], className="fadein-graph"), className="styled-card")
     return dbc.Container([
         dbc.Row(dbc.Col(html.H1("🏆 Les Super-records de la saison", className="text-center text-light my-4"), width=12, style={"marginTop": "-50px"})),
+        dbc.Row(dbc.Col(dbc.RadioItems(
+            id="records-scope", value="season", inline=True, className="text-light text-center mb-3",
+            options=[{"label": f"Saison {season}", "value": "season"}, {"label": "Toutes les saisons", "value": "archive"}],
+        ), width=12)),
         dbc.Row([
-            dbc.Col(dbc.Card(dcc.Graph(figure=fig_comeback, className="fadein-graph"), className="styled-card"), width=6),
-            dbc.Col(dbc.Card(dcc.Graph(figure=fig_streak, className="fadein-graph"), className="styled-card"), width=6),
+            dbc.Col(graph('comeback'), width=6),
+            dbc.Col(graph('streak'), width=6),
         ], className="g-4 mb-4"),
         dbc.Row([
-            dbc.Col(dbc.Card(dcc.Graph(figure=fig_dnf, className="fadein-graph"), className="styled-card"), width=6),
-            dbc.Col(dbc.Card(dcc.Graph(figure=fig_podiums, className="fadein-graph"), className="styled-card"), width=6),
+            dbc.Col(graph('dnf'), width=6),
+            dbc.Col(graph('podiums'), width=6),
         ], className="g-4")
     ], fluid=True)
 
+@callback(
+    [Output(f"records-{name}", "figure") for name in RECORDS_FIGS],
+    Input("records-scope", "value"),
+    State("season-select", "value"),
+    prevent_initial_call=True
+)
+@timed_callback("update_records")
+def update_records(scope, season=None):
+    return list(records_archive_figs()) if scope == "archive" else records_season_figs(season)
+
 # -----------  EMPREINTE CARBONE ------------------
-co2_fig_path = os.path.join("data", "fig_co2.json")
-def create_co2_fig():
-    df_flights['segment'] = df_flights['event_from'] + " → " + df_flights['event_to']
+
+def create_co2_fig(season=None):
+    df_flights = get_model(season).flights
     fig = px.bar(
         df_flights.sort_values('CO2_tonnes'),
         x='CO2_tonnes', y='segment',
@@ -671,12 +1004,10 @@ def create_co2_fig():
         title_x=0.5
     )
     return fig
-fig_co2 = load_or_create_figure(co2_fig_path, create_co2_fig)
-
-def co2_layout():
-    # S'assure que la colonne segment existe même si le graphique est chargé depuis le cache
-    if "segment" not in df_flights.columns:
-        df_flights['segment'] = df_flights['event_from'] + " → " + df_flights['event_to']
+def co2_layout(season=None):
+    model = get_model(season)
+    fig_co2 = load_or_create_figure("co2", lambda: create_co2_fig(model.season), inputs=("flights",), season=model.season)
+    df_flights = model.flights
     total_co2 = int(df_flights["CO2_tonnes"].sum())
     max_leg = df_flights.sort_values("CO2_tonnes", ascending=False).iloc[0]
     min_leg = df_flights.sort_values("CO2_tonnes", ascending=True).iloc[0]
@@ -706,12 +1037,15 @@ def co2_layout():
 
 # -----------  EXPLORER AVANCÉ ------------------
 explorer_figs = {
-    'corr': os.path.join("data", "fig_explorer_corr.json"),
-    'scatter': os.path.join("data", "fig_explorer_scatter.json"),
-    'outlier': os.path.join("data", "fig_explorer_outlier.json"),
-    'pca': os.path.join("data", "fig_explorer_pca.json"),
+    'corr': "explorer_corr",
+    'scatter': "explorer_scatter",
+    'outlier': "explorer_outlier",
+    'pca': "explorer_pca",
 }
-def explorer_layout():
+def explorer_layout(season=None):
+    model = get_model(season)
+    season = model.season
+    df_results, team_colors = model.results, model.team_colors
     def create_corr():
         numerics = df_results[["GridPosition", "Position", "Points"]].copy()
         fig = px.imshow(
@@ -723,17 +1057,8 @@ def explorer_layout():
         fig.update_layout(xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False))
         return fig
     def create_scatter():
-        fig = px.scatter(
-            df_results, x="GridPosition", y="Position", color="TeamName",
-            size="Points", hover_name="FullName", hover_data=['event'],
-            labels={'GridPosition': "Position de Départ", 'Position': "Position d'Arrivée"},
-            title="Départ vs. Arrivée (Taille = Points)"
-        )
-        fig.update_layout(template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', title_x=0.5)
-        fig.update_layout(xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False))
-        return fig
+        return explorer_scatter_fig(explorer_points("scatter", "season", season), team_colors)
     def create_outlier():
-        df_results['abs_delta'] = np.abs(df_results['GridPosition'] - df_results['Position'])
         outliers = df_results.sort_values('abs_delta', ascending=False).head(10)
         fig = px.bar(
             outliers[::-1], x="abs_delta", y="FullName",
@@ -747,80 +1072,408 @@ def explorer_layout():
         fig.update_layout(xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False))
         return fig
     def create_pca():
-        feats = df_results[["GridPosition", "Position", "Points"]].fillna(0)
-        pca = PCA(n_components=2)
-        pca_vals = pca.fit_transform(feats)
-        df_pca = pd.DataFrame(pca_vals, columns=["PC1", "PC2"])
-        df_pca["TeamName"] = df_results["TeamName"]
-        df_pca["FullName"] = df_results["FullName"]
-        df_pca["event"] = df_results["event"]
-        fig = px.scatter(
-            df_pca, x="PC1", y="PC2", color="TeamName", hover_data=["FullName", "event"],
-            title="Projection PCA des Performances de Course",
-            color_discrete_map=team_colors
-        )
-        fig.update_layout(template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', title_x=0.5)
-        fig.update_layout(xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False))
-        return fig
-    fig_corr = load_or_create_figure(explorer_figs['corr'], create_corr)
-    fig_scatter = load_or_create_figure(explorer_figs['scatter'], create_scatter)
-    fig_outlier = load_or_create_figure(explorer_figs['outlier'], create_outlier)
-    fig_pca = load_or_create_figure(explorer_figs['pca'], create_pca)
+        return explorer_pca_fig(explorer_points("pca", "season", season), team_colors)
+    fig_corr = load_or_create_figure(explorer_figs['corr'], create_corr, inputs=("results",), season=season)
+    fig_scatter = load_or_create_figure(explorer_figs['scatter'], create_scatter, inputs=("results",), version=2, season=season)
+    fig_outlier = load_or_create_figure(explorer_figs['outlier'], create_outlier, inputs=("results",), season=season)
+    # PCA apprise sur toute l'archive : la figure suit l'état appris, pas seulement la saison
+    fig_pca = load_or_create_figure(explorer_figs['pca'], create_pca, inputs=FEATURE_TABLES, version=3, season=season, state=state_version())
     return dbc.Container([
         dbc.Row(dbc.Col(html.H1("🔬 F1 Insights Playground", className="text-center text-light my-4"), width=12, style={"marginTop": "-50px"})),
+        dbc.Row(dbc.Col(dbc.RadioItems(
+            id="explorer-scope", value="season", inline=True, className="text-light text-center mb-3",
+            options=[{"label": f"Saison {season}", "value": "season"}, {"label": "Toutes les saisons", "value": "archive"}],
+        ), width=12)),
+        dcc.Store(id="explorer-zoom", data={}),
         dbc.Row([
             dbc.Col(dbc.Card(dcc.Graph(figure=fig_corr), className="styled-card fadein-graph"), width=6),
-            dbc.Col(dbc.Card(dcc.Graph(figure=fig_scatter, className="fadein-graph"), className="styled-card"), width=6),
+            dbc.Col(dbc.Card(dcc.Graph(id="explorer-scatter", figure=fig_scatter, className="fadein-graph"), className="styled-card"), width=6),
         ], className="g-4 mb-4"),
         dbc.Row([
             dbc.Col(dbc.Card(dcc.Graph(figure=fig_outlier, className="fadein-graph"), className="styled-card"), width=6),
-            dbc.Col(dbc.Card(dcc.Graph(figure=fig_pca, className="fadein-graph"), className="styled-card"), width=6),
+            dbc.Col(dbc.Card(dcc.Graph(id="explorer-pca", figure=fig_pca, className="fadein-graph"), className="styled-card"), width=6),
         ], className="g-4"),
     ], fluid=True)
 
-# -----------  ROUTING ---------------
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY], suppress_callback_exceptions=True)
-server = app.server
-
-navbar = dbc.NavbarSimple(
-    children=[
-        dbc.NavItem(dbc.NavLink("Accueil", href="/", active="exact")),
-        dbc.NavItem(dbc.NavLink("Stratégie & Chaos", href="/strategie", active="exact")),
-        dbc.NavItem(dbc.NavLink("Duels intra-écurie", href="/duels", active="exact")),
-        dbc.NavItem(dbc.NavLink("Records", href="/records", active="exact")),
-        dbc.NavItem(dbc.NavLink("Empreinte carbone", href="/co2", active="exact")),
-        dbc.NavItem(dbc.NavLink("Explorer", href="/explorer", active="exact")),
-    ],
-    brand="🏎️💨 F1 Data Science – Ultimate Dashboard",
-    color=None, # La couleur est gérée par la classe CSS
-    dark=True,
-    className="navbar-glass shadow-lg" # Nouvelle classe
+# Nuages de l'Explorer (départ/arrivée, PCA) sur une saison ou toute l'archive. Le rendu suit
+# le nombre de points (f1dash.scatter) : SVG, WebGL, puis densité 2D calculée ici ; en mode
+# densité, chaque zoom renvoie les cases de la zone visible, recalculées sur les points bruts.
+EXPLORER_POINT_COLS = ["GridPosition", "Position", "Points", "TeamName", "FullName", "event"]
+EXPLORER_AXES = {"scatter": ("GridPosition", "Position"), "pca": ("PC1", "PC2")}
+
+def explorer_points(kind, scope="season", season=None):
+    """Points du nuage `kind` ("scatter" ou "pca") de la saison `season` ou de toutes les saisons."""
+    season_list = seasons() if scope == "archive" else [get_model(season).season]
+    inputs = ("results",) if kind == "scatter" else FEATURE_TABLES
+    key = ("explorer_points", kind, tuple((s, data_fingerprint(inputs, s)) for s in season_list))
+    if kind == "pca":
+        key += (state_version(),)
+    def build():
+        if kind == "scatter":
+            frames = [load_table("results", EXPLORER_POINT_COLS, season=s) for s in season_list]
+        else:
+            frames = [season_projection(s) for s in season_list]
+        return pd.concat(frames, ignore_index=True)
+    return POINTS_CACHE.get_or_build(key, build)
+
+def explorer_density_fig(points, kind, labels, title, ranges=None):
+    x, y = EXPLORER_AXES[kind]
+    ranges = ranges or {}
+    xs, ys, z = density(points[x], points[y], ranges.get("x"), ranges.get("y"))
+    fig = go.Figure(go.Heatmap(
+        x=xs, y=ys, z=z, colorscale="Plasma", colorbar=dict(title="Résultats"),
+        hovertemplate=f"{labels.get(x, x)} : %{{x:.1f}}<br>{labels.get(y, y)} : %{{y:.1f}}<br>%{{z}} résultats<extra></extra>"
+    ))
+    fig.update_layout(title=f"{title} – densité de {len(points)} résultats", xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y))
+    for axis, bounds in (("xaxis", ranges.get("x")), ("yaxis", ranges.get("y"))):
+        if bounds is not None:
+            fig.update_layout({axis: dict(range=list(bounds))})
+    return fig
+
+def explorer_style(fig):
+    fig.update_layout(template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', title_x=0.5)
+    fig.update_layout(xaxis=dict(showgrid=False, zeroline=False), yaxis=dict(showgrid=False, zeroline=False))
+    return fig
+
+def explorer_scatter_fig(points, team_colors, ranges=None):
+    labels = {'GridPosition': "Position de Départ", 'Position': "Position d'Arrivée"}
+    mode = render_mode(len(points))
+    if mode == "density":
+        return explorer_style(explorer_density_fig(points, "scatter", labels, "Départ vs. Arrivée", ranges))
+    fig = px.scatter(
+        points, x="GridPosition", y="Position", color="TeamName",
+        size="Points", hover_name="FullName", hover_data=['event'],
+        labels=labels, render_mode=mode,
+        title="Départ vs. Arrivée (Taille = Points)"
+    )
+    return explorer_style(fig)
+
+def explorer_pca_fig(points, team_colors, ranges=None):
+    ratio = explained_variance_ratio()
+    labels = {} if ratio is None else {f"PC{i + 1}": f"PC{i + 1} ({r:.0%} de la variance)" for i, r in enumerate(ratio)}
+    mode = render_mode(len(points))
+    if mode == "density":
+        return explorer_style(explorer_density_fig(points, "pca", labels, "Projection PCA des Performances de Course", ranges))
+    fig = px.scatter(
+        points, x="PC1", y="PC2", color="TeamName", hover_data=["FullName", "event"],
+        title="Projection PCA des Performances de Course",
+        color_discrete_map=team_colors, labels=labels, render_mode=mode
+    )
+    return explorer_style(fig)
+
+EXPLORER_FIGS = {"scatter": explorer_scatter_fig, "pca": explorer_pca_fig}
+
+@callback(
+    [Output("explorer-scatter", "figure"), Output("explorer-pca", "figure"), Output("explorer-zoom", "data")],
+    [Input("explorer-scope", "value"), Input("explorer-scatter", "relayoutData"), Input("explorer-pca", "relayoutData")],
+    [State("explorer-zoom", "data"), State("season-select", "value")],
+    prevent_initial_call=True
 )
+@timed_callback("update_explorer")
+def update_explorer(scope, scatter_relayout, pca_relayout, zoom, season=None):
+    team_colors = get_model(season).team_colors
+    if dash.ctx.triggered_id == "explorer-scope":
+        # Nouvelle portée : figures complètes, zooms oubliés
+        figs = [pack_figure(EXPLORER_FIGS[kind](explorer_points(kind, scope, season), team_colors)) for kind in ("scatter", "pca")]
+        return figs[0], figs[1], {}
+    kind = "scatter" if dash.ctx.triggered_id == "explorer-scatter" else "pca"
+    points = explorer_points(kind, scope, season)
+    ranges = zoom_ranges((zoom or {}).get(kind), scatter_relayout if kind == "scatter" else pca_relayout)
+    # Marqueurs SVG/WebGL : le zoom reste dans le navigateur
+    if ranges is None or render_mode(len(points)) != "density":
+        return dash.no_update, dash.no_update, dash.no_update
+    fig = pack_figure(EXPLORER_FIGS[kind](points, team_colors, ranges))
+    zoom = dict(zoom or {}, **{kind: ranges})
+    return (fig, dash.no_update, zoom) if kind == "scatter" else (dash.no_update, fig, zoom)
 
-app.layout = html.Div(id='main-container', children=[
-    dcc.Location(id="url"),
-    navbar,
-    html.Div(id="page-content", className="mt-4 p-4") # Marge pour le contenu sous la navbar
-])
+# -----------  TÉLÉMÉTRIE ------------------
+TELEMETRY_LABELS = {"Speed": "Vitesse (km/h)", "Throttle": "Accélérateur (%)", "Brake": "Frein", "nGear": "Rapport"}
+TELEMETRY_POINTS = (200, 4000)  # bornes du nombre de points par trace (largeur en pixels inconnue : 1000)
 
-@app.callback(
+def telemetry_round(gp, season=None):
+    results = get_model(season).results
+    return int(results.loc[results["event"] == gp, "round"].iloc[0])
+
+def request_telemetry(season, gp, session):
+    """Charge la session dans un thread de fond et la découpe dans le cache de télémétrie (une fois)."""
+    season = get_model(season).season
+    rnd = telemetry_round(gp, season)
+    return JOBS.submit(("telemetry", season, rnd, session), build_session, season, rnd, gp, session)
+
+def telemetrie_layout(season=None):
+    model = get_model(season)
+    gp_list = list(model.gp_order)
+    def driver_picker(suffix, title):
+        return dbc.Col([
+            html.H6(title, className="text-light"),
+            dcc.Dropdown(id=f"tele-driver-{suffix}", clearable=False, className="custom-dropdown mb-2"),
+            dcc.Dropdown(id=f"tele-lap-{suffix}", clearable=False, className="custom-dropdown"),
+        ], width=3)
+    return dbc.Container([
+        dbc.Row(dbc.Col(html.H1("📡 Télémétrie : comparaison de tours", className="text-center text-light my-4"), width=12, style={"marginTop": "-50px"})),
+        dbc.Row([
+            dbc.Col([
+                html.H6("Grand Prix", className="text-light"),
+                dcc.Dropdown(id="tele-gp", options=[{"label": gp, "value": gp} for gp in gp_list], value=gp_list[-1], clearable=False, className="custom-dropdown mb-2"),
+                dbc.RadioItems(id="tele-session", options=[{"label": label, "value": key} for key, label in SESSIONS.items()], value="R", inline=True, className="text-light"),
+            ], width=4),
+            driver_picker("a", "Pilote 1"),
+            driver_picker("b", "Pilote 2"),
+            dbc.Col(html.Div(id="tele-status", className="text-light mt-4"), width=2),
+        ], className="g-3 mb-3"),
+        dbc.Row(dbc.Col(dbc.Card(dcc.Graph(id="tele-graph", figure=lap_placeholder("Choisissez deux tours à comparer"), className="fadein-graph"), className="styled-card"), width=12)),
+        dcc.Interval(id="tele-poll", interval=1000, disabled=True),
+        dcc.Store(id="tele-width"),
+    ], fluid=True)
+
+# Pilotes de la session dès que sa télémétrie est en cache (chargement FastF1 en tâche de fond)
+@callback(
+    [Output("tele-driver-a", "options"), Output("tele-driver-a", "value"),
+     Output("tele-driver-b", "options"), Output("tele-driver-b", "value"),
+     Output("tele-poll", "disabled"), Output("tele-status", "children")],
+    [Input("tele-gp", "value"), Input("tele-session", "value"), Input("tele-poll", "n_intervals")],
+    State("season-select", "value")
+)
+def fill_telemetry_drivers(gp, session, _, season=None):
+    model = get_model(season)
+    index = laps_index(model.season, telemetry_round(gp, model.season), session)
+    if index is None:
+        job = request_telemetry(model.season, gp, session)
+        if not job.done():
+            return [], None, [], None, False, "⏳ Chargement de la session FastF1…"
+        if job.exception() is not None:
+            return [], None, [], None, True, "Télémétrie indisponible pour cette session"
+        index = job.result()
+    # Pilotes dans l'ordre d'arrivée du GP, ceux absents des résultats à la fin
+    finish = model.results[model.results["event"] == gp].sort_values("Position")
+    names = finish.set_index("Abbreviation")["FullName"].to_dict()
+    drivers = [d for d in finish["Abbreviation"] if d in set(index["Driver"])]
+    drivers += sorted(set(index["Driver"]) - set(drivers))
+    options = [{"label": names.get(d, d), "value": d} for d in drivers]
+    first = drivers[0] if drivers else None
+    second = drivers[1] if len(drivers) > 1 else first
+    return options, first, options, second, True, ""
+
+def telemetry_lap_options(season, gp, session, driver):
+    index = laps_index(season, telemetry_round(gp, season), session) if driver else None
+    if index is None:
+        return [], None
+    laps = index[index["Driver"] == driver].sort_values("LapNumber")
+    best = laps["LapNumber"].iloc[laps["LapTime"].to_numpy().argmin()] if laps["LapTime"].notna().any() else laps["LapNumber"].iloc[0]
+    def label(row):
+        text = f"Tour {row.LapNumber}" if pd.isna(row.LapTime) else f"Tour {row.LapNumber} – {int(row.LapTime // 60)}:{row.LapTime % 60:06.3f}"
+        return text + (" (meilleur)" if row.LapNumber == best else "")
+    return [{"label": label(row), "value": int(row.LapNumber)} for row in laps.itertuples()], int(best)
+
+@callback(
+    [Output("tele-lap-a", "options"), Output("tele-lap-a", "value"), Output("tele-lap-b", "options"), Output("tele-lap-b", "value")],
+    [Input("tele-driver-a", "value"), Input("tele-driver-b", "value")],
+    [State("tele-gp", "value"), State("tele-session", "value"), State("season-select", "value")]
+)
+def fill_telemetry_laps(driver_a, driver_b, gp, session, season=None):
+    season = get_model(season).season
+    return (*telemetry_lap_options(season, gp, session, driver_a), *telemetry_lap_options(season, gp, session, driver_b))
+
+def telemetry_zoom(relayout):
+    """Plage de distance d'un zoom (relayoutData des sous-graphiques à x partagé) : (bas, haut),
+    None pour un retour à la vue complète, False si l'événement ne touche pas l'axe x."""
+    for key, value in (relayout or {}).items():
+        axis, _, prop = key.partition(".")
+        if axis.startswith("xaxis") and prop == "autorange" and value:
+            return None
+        if axis.startswith("xaxis") and prop == "range[0]" and f"{axis}.range[1]" in relayout:
+            return (float(value), float(relayout[f"{axis}.range[1]"]))
+        if axis.startswith("xaxis") and prop == "range":
+            return (float(value[0]), float(value[1]))
+    return False
+
+def create_telemetry_fig(gp, session, laps, distance=None):
+    """`laps` : [(nom, couleur, pointillés, {canal: (distances, valeurs)})], un par tour comparé."""
+    fig = make_subplots(rows=len(CHANNELS), cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.4, 0.2, 0.2, 0.2])
+    for name, color, dotted, traces in laps:
+        for row, channel in enumerate(CHANNELS, start=1):
+            x, y = traces[channel]
+            fig.add_trace(go.Scatter(
+                x=x, y=y, mode="lines", name=name, legendgroup=name, showlegend=row == 1,
+                line=dict(color=color, width=2, dash="dot" if dotted else "solid", shape="hv" if channel in ("Brake", "nGear") else "linear"),
+                hovertemplate=f"<b>{name}</b><br>Distance : %{{x:.0f}} m<br>{TELEMETRY_LABELS[channel]} : %{{y:.0f}}<extra></extra>",
+            ), row=row, col=1)
+            fig.update_yaxes(title_text=TELEMETRY_LABELS[channel], showgrid=False, zeroline=False, row=row, col=1)
+    fig.update_xaxes(showgrid=False, zeroline=False)
+    fig.update_xaxes(title_text="Distance (m)", row=len(CHANNELS), col=1)
+    if distance is not None:
+        fig.update_xaxes(range=list(distance))
+    fig.update_layout(
+        title=f"Télémétrie – {gp} ({SESSIONS[session]})", title_x=0.5,
+        template="plotly_dark", height=800, hovermode="x unified",
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Montserrat, Arial", color="#F2F2F2"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=70, r=30, t=80, b=40)
+    )
+    return fig
+
+# Comparaison des deux tours : tours entiers au choix des tours, plage visible relue à pleine
+# résolution à chaque zoom ; chaque trace est réduite (LTTB) à la largeur du graphique
+@callback(
+    Output("tele-graph", "figure"),
+    [Input("tele-lap-a", "value"), Input("tele-lap-b", "value"), Input("tele-graph", "relayoutData")],
+    [State("tele-driver-a", "value"), State("tele-driver-b", "value"), State("tele-gp", "value"),
+     State("tele-session", "value"), State("tele-width", "data"), State("season-select", "value")]
+)
+@timed_callback("update_telemetry")
+def update_telemetry(lap_a, lap_b, relayout, driver_a, driver_b, gp, session, width, season=None):
+    distance = None
+    if dash.ctx.triggered_id == "tele-graph":
+        distance = telemetry_zoom(relayout)
+        if distance is False:
+            return dash.no_update
+    if not (driver_a and driver_b and lap_a and lap_b):
+        return lap_placeholder("Choisissez deux tours à comparer")
+    model = get_model(season)
+    rnd = telemetry_round(gp, model.season)
+    n_points = int(min(max(width or 1000, TELEMETRY_POINTS[0]), TELEMETRY_POINTS[1]))
+    names = model.results.drop_duplicates("Abbreviation").set_index("Abbreviation")
+    laps, teams = [], []
+    for driver, lap in ((driver_a, lap_a), (driver_b, lap_b)):
+        team = names["TeamName"].get(driver)
+        trace = lap_trace(model.season, rnd, session, driver, lap, distance)
+        laps.append((
+            f"{names['FullName'].get(driver, driver)} – tour {lap}", model.team_colors.get(team, "#888"),
+            team in teams, downsample(trace, n_points),
+        ))
+        teams.append(team)
+    return pack_figure(create_telemetry_fig(gp, session, laps, distance))
+
+clientside_callback(
+    ClientsideFunction(namespace="f1", function_name="plot_width"),
+    Output("tele-width", "data"),
+    Input("tele-gp", "value"),
+    State("tele-graph", "id")
+)
+
+# -----------  ROUTING ---------------
+# Compteurs hit/miss des caches mémoire, pour dimensionner les budgets (route /cache-stats)
+def cache_stats_route():
+    return flask.jsonify(cache_stats())
+
+# Sélecteur de saison : filtre les partitions lues par toutes les pages (voir f1dash.data)
+def season_selector():
+    available = seasons()
+    return dcc.Dropdown(
+        id="season-select",
+        options=[{"label": str(s), "value": s} for s in reversed(available)],
+        value=available[-1] if available else None,
+        clearable=False, persistence=True, className="custom-dropdown",
+        style={"width": "110px"}
+    )
+
+def navbar():
+    return dbc.NavbarSimple(
+        children=[
+            dbc.NavItem(season_selector(), className="me-3"),
+            dbc.NavItem(dbc.NavLink("Accueil", href="/", active="exact")),
+            dbc.NavItem(dbc.NavLink("Stratégie & Chaos", href="/strategie", active="exact")),
+            dbc.NavItem(dbc.NavLink("Duels intra-écurie", href="/duels", active="exact")),
+            dbc.NavItem(dbc.NavLink("Records", href="/records", active="exact")),
+            dbc.NavItem(dbc.NavLink("Empreinte carbone", href="/co2", active="exact")),
+            dbc.NavItem(dbc.NavLink("Explorer", href="/explorer", active="exact")),
+            dbc.NavItem(dbc.NavLink("Télémétrie", href="/telemetrie", active="exact")),
+        ],
+        brand="🏎️💨 F1 Data Science – Ultimate Dashboard",
+        color=None, # La couleur est gérée par la classe CSS
+        dark=True,
+        className="navbar-glass shadow-lg" # Nouvelle classe
+    )
+
+# Layout servi à chaque chargement de page : la liste des saisons reflète data/ à cet instant
+def serve_layout():
+    return html.Div(id='main-container', children=[
+        dcc.Location(id="url"),
+        navbar(),
+        html.Div(id="page-content", className="mt-4 p-4") # Marge pour le contenu sous la navbar
+    ])
+
+PAGES = {
+    "/strategie": (strategie_layout, "bg-strategie"),
+    "/duels": (duels_layout, "bg-duels"),
+    "/records": (records_layout, "bg-records"),
+    "/co2": (co2_layout, "bg-co2"),
+    "/explorer": (explorer_layout, "bg-explorer"),
+    "/telemetrie": (telemetrie_layout, "bg-telemetrie"),
+}
+
+# Sources d'un layout hors des tables du modèle (saison -> état), ajoutées à la clé de son cache
+LAYOUT_STATES = {
+    "explorer_layout": lambda season: (data_fingerprint(FEATURE_TABLES, season), state_version()),
+}
+
+def page_layout(layout_func, season=None):
+    # Layout construit une fois par page, saison et version actuelle des Parquet (en JSON
+    # compact, voir f1dash.transport), puis resservi depuis le cache : un GP ajouté
+    # change la version, la page est reconstruite sur le modèle reconstruit
+    season = latest_season() if season is None else int(season)
+    version = data_version(season)
+    model = get_model(season)
+    def build():
+        return pack_tree(layout_func(model.season))
+    if model.version != version:
+        return build()  # données modifiées entre les deux lectures : layout servi sans être gardé
+    states = LAYOUT_STATES.get(layout_func.__name__)
+    key = (layout_func.__name__, season, version) + ((states(season),) if states else ())
+    return LAYOUT_CACHE.get_or_build(key, build)
+
+@callback(
     [Output("page-content", "children"), Output("main-container", "className")],
-    [Input("url", "pathname")]
+    [Input("url", "pathname"), Input("season-select", "value")]
 )
-def display_page(pathname):
-    if pathname == "/strategie":
-        return strategie_layout(), "bg-strategie"
-    elif pathname == "/duels":
-        return duels_layout(), "bg-duels"
-    elif pathname == "/records":
-        return records_layout(), "bg-records"
-    elif pathname == "/co2":
-        return co2_layout(), "bg-co2"
-    elif pathname == "/explorer":
-        return explorer_layout(), "bg-explorer"
-    # ... etc
-    else: # Home
-        return home_layout(), "bg-accueil"
+@timed_callback("display_page")
+def display_page(pathname, season=None):
+    layout_func, page_class = PAGES.get(pathname, (home_layout, "bg-accueil"))  # Home par défaut
+    return page_layout(layout_func, season), page_class
+
+def preload(season_list=None, job_timeout=None):
+    """Construit modèles, layouts et figures des callbacks avant de servir la moindre requête.
+
+    Appelé par le maître gunicorn (gunicorn.conf.py) avant de forker les workers : ceux-ci
+    héritent des caches déjà remplis. `season_list` : toutes les saisons si None.
+    Retourne False si une tâche de fond (session FastF1) tournait encore après `job_timeout`.
+    """
+    for season in (seasons() if season_list is None else season_list):
+        model = get_model(season)
+        for layout_func in [home_layout, *(func for func, _ in PAGES.values())]:
+            page_layout(layout_func, season)
+        if not CLIENTSIDE:
+            for gp in model.pits_by_gp:
+                update_pit_plot(gp, season)
+            for team in model.duels:
+                update_duel(team, season)
+    # Le fork ne copie que le thread appelant : aucune tâche ne doit rester en vol
+    return JOBS.wait(job_timeout)
+
+def create_app():
+    """Application Dash du dashboard.
+
+    Une seule par processus : les callbacks déclarés avec @callback sont rattachés à la
+    première application construite, les appels suivants la renvoient.
+    """
+    global _app
+    if _app is None:
+        _app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY], suppress_callback_exceptions=True)
+        _app.layout = serve_layout
+        _app.server.add_url_rule("/cache-stats", view_func=cache_stats_route)
+        if TRANSPORT:
+            install_transport(_app.server)
+        if METRICS:
+            install_metrics(_app.server)  # après le transport : taille relevée avant compression
+    return _app
+
+_app = None
+app = create_app()
+server = app.server  # point d'entrée WSGI (gunicorn.conf.py)
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    # Serveur de développement (rechargement automatique) ; en production : gunicorn -c gunicorn.conf.py
+    # Précharge la session du dernier GP pendant que le serveur démarre
+    request_lap_fig()
+    app.run(debug=os.environ.get("F1_DEBUG", "1") == "1")
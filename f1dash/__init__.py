@@ -0,0 +1 @@
+# Briques internes du dashboard F1 (accès aux données, caches, moteurs de calcul).
@@ -0,0 +1,351 @@
+# Acquisition incrémentale des données FastF1 (remplace la boucle du notebook d'acquisition).
+# Un manifeste (data/manifest.json) retient les GP déjà intégrés : chaque exécution ne
+# télécharge que les GP terminés depuis la précédente. Les sessions course et qualifs
+# sont chargées en parallèle dans un pool de processus, et chaque GP est écrit dans sa
+# propre partition (f1dash.data.write_partition, écriture atomique) : le coût d'une
+# mise à jour dépend des nouveaux GP, pas de la saison déjà écoulée.
+#
+#   python -m f1dash.acquisition --season 2025 --workers 4
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from math import atan2, cos, radians, sin, sqrt
+
+import numpy as np
+import pandas as pd
+
+from f1dash import data
+from f1dash.laps import quick_laps
+from f1dash.sessions import FASTF1_CACHE_DIR
+
+OPENFLIGHTS_URL = "https://raw.githubusercontent.com/jpatokal/openflights/master/data/airports.dat"
+OPENFLIGHTS_COLUMNS = [
+    'AirportID', 'Name', 'City', 'Country', 'IATA', 'ICAO',
+    'Latitude', 'Longitude', 'Altitude', 'Timezone', 'DST', 'Tz',
+    'Type', 'Source'
+]
+
+# Circuits F1 -> principal aéroport utilisé par les équipes pour la logistique (IATA)
+CIRCUIT_IATA = {
+    'Melbourne': 'MEL',
+    'Shanghai': 'PVG',
+    'Suzuka': 'NGO',
+    'Sakhir': 'BAH',
+    'Jeddah': 'JED',
+    'Miami': 'MIA',
+    'Imola': 'BLQ',
+    'Monaco': 'NCE',
+    'Barcelona': 'BCN',
+    'Montréal': 'YUL',
+    'Spielberg': 'VIE',
+    'Silverstone': 'LHR',
+    'Spa-Francorchamps': 'LGG',
+    'Budapest': 'BUD',
+    'Zandvoort': 'AMS',
+    'Monza': 'MXP',
+    'Baku': 'GYD',
+    'Marina Bay': 'SIN',
+    'Austin': 'AUS',
+    'Mexico City': 'MEX',
+    'São Paulo': 'GRU',
+    'Las Vegas': 'LAS',
+    'Lusail': 'DOH',
+    'Yas Island': 'AUH',
+}
+
+# Hypothèses CO₂ (DHL / UK BEIS 2024, voir le notebook d'acquisition)
+MASS_TONNES = 1400
+KG_CO2_PER_TKM = 0.587
+
+PILOT_VARS = ['DriverNumber', 'FullName', 'HeadshotUrl', 'TeamName', 'Position', 'GridPosition', 'Points', 'Status']
+TEAM_VARS = ['TeamName', 'TeamColor']
+
+
+def manifest_path():
+    return os.path.join(data.DATA_DIR, "manifest.json")
+
+
+def read_manifest():
+    """{saison: {gp: {"event", "airport", "tables", "missing", "ingested_at"}}} (clés en texte, comme en JSON).
+
+    `missing` : tables d'un GP intégré dont la session a échoué (qualifs), retentées à l'exécution suivante.
+    """
+    try:
+        with open(manifest_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_manifest(manifest):
+    data.atomic_write_text(manifest_path(), json.dumps(manifest, indent=1, ensure_ascii=False, sort_keys=True))
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Distance (km) entre deux points lat/lon."""
+    R = 6371
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat/2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon/2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return R * c
+
+
+def load_airports():
+    """Table OpenFlights -> dict IATA -> (latitude, longitude)."""
+    airports = pd.read_csv(OPENFLIGHTS_URL, header=None, names=OPENFLIGHTS_COLUMNS, dtype={'IATA': str})
+    airports = airports[airports['IATA'].notna() & (airports['IATA'].str.len() == 3)]
+    first = airports.drop_duplicates('IATA')
+    return dict(zip(first['IATA'], zip(first['Latitude'].astype(float), first['Longitude'].astype(float))))
+
+
+# Colonnes des arrêts : (colonne de sortie, colonne des tours, tour lu : avant ou après l'arrêt)
+PITSTOP_COLUMNS = [
+    ('Driver', 'Driver', 'after'),
+    ('DriverNumber', 'DriverNumber', 'after'),
+    ('TeamName', 'Team', 'after'),
+    ('LapIn', 'LapNumber', 'before'),
+    ('LapOut', 'LapNumber', 'after'),
+    ('PitInTime', 'PitInTime', 'before'),
+    ('PitOutTime', 'PitOutTime', 'after'),
+    ('CompoundIn', 'Compound', 'before'),
+    ('CompoundOut', 'Compound', 'after'),
+    ('TyreLifeIn', 'TyreLife', 'before'),
+    ('TyreLifeOut', 'TyreLife', 'after'),
+    ('PositionIn', 'Position', 'before'),
+    ('PositionOut', 'Position', 'after'),
+    ('event', 'event', 'after'),
+    ('round', 'round', 'after'),
+]
+
+
+def extract_real_pitstops(laps_df):
+    """
+    Extrait les vrais arrêts aux stands détectés par changement de Stint ET de Compound
+    entre deux tours consécutifs d'un même pilote, dans une même course.
+    Ajoute des colonnes d'intérêt pour enrichir l'analyse stratégique.
+
+    Vectorisé : les tours sont triés par GP, pilote puis numéro de tour, et chaque tour
+    est comparé au précédent par décalage d'une ligne (au lieu d'un iterrows par pilote).
+    Accepte les tours d'une course ou d'une saison entière (arrêts triés par GP puis pilote).
+    """
+    laps = laps_df[laps_df['Driver'].notna()].sort_values(['round', 'Driver', 'LapNumber'], kind='stable')
+    race = laps['round'].to_numpy()
+    driver = laps['Driver'].to_numpy()
+    stint = laps['Stint'].to_numpy(dtype=float, na_value=np.nan)
+    # Comparaison objet par objet, comme `!=` entre deux valeurs Python (None == None)
+    compound = laps['Compound'].to_numpy(dtype=object)
+    is_stop = np.zeros(len(laps), dtype=bool)
+    is_stop[1:] = (
+        (driver[1:] == driver[:-1]) & (race[1:] == race[:-1])
+        & ~np.isnan(stint[1:]) & ~np.isnan(stint[:-1])
+        & (stint[1:] != stint[:-1])
+        & (compound[1:] != compound[:-1])
+    )
+    after = np.flatnonzero(is_stop)
+    rows = {'before': after - 1, 'after': after}
+    return pd.DataFrame({
+        out: laps[col].iloc[rows[which]].to_numpy() for out, col, which in PITSTOP_COLUMNS
+    })
+
+
+def _fastf1_session(year, rd, kind):
+    import fastf1  # import lourd, uniquement dans les processus de chargement
+
+    os.makedirs(FASTF1_CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
+    fastf1.set_log_level("ERROR")
+    session = fastf1.get_session(year, rd, kind)
+    session.load()
+    return session
+
+
+def load_race(year, rd, loc):
+    """Tables issues de la course d'un GP (exécuté dans un processus du pool)."""
+    race = _fastf1_session(year, rd, 'R')
+    results = race.results.assign(round=rd, event=loc)
+    teams = race.results[TEAM_VARS].drop_duplicates()
+    team_points = race.results.groupby('TeamName')['Points'].sum().reset_index()
+    return {
+        "results": results,
+        "pitstops": extract_real_pitstops(race.laps.assign(round=rd, event=loc)),
+        "weather": race.weather_data.assign(round=rd, event=loc),
+        "laps": quick_laps(race.laps).assign(round=rd, event=loc),
+        "driver_standings": race.results[PILOT_VARS].assign(round=rd, event=loc),
+        "team_standings": teams.merge(team_points, on='TeamName').assign(round=rd, event=loc),
+    }
+
+
+def load_qualifying(year, rd, loc):
+    """Résultats des qualifications d'un GP (exécuté dans un processus du pool)."""
+    qual = _fastf1_session(year, rd, 'Q')
+    return {"qualifying": qual.results.assign(round=rd, event=loc)}
+
+
+def clean_round(tables):
+    """Nettoyage du notebook, appliqué GP par GP (voir ses sections 7️⃣), sur les tables présentes."""
+    tables = dict(tables)
+    # Q1/Q2/Q3 ne sont renseignées qu'en qualifs ; Points/Time/GridPosition qu'en course
+    if "results" in tables:
+        tables["results"] = tables["results"].drop(columns=['Q1', 'Q2', 'Q3'], errors='ignore')
+    if "qualifying" in tables:
+        tables["qualifying"] = tables["qualifying"].drop(columns=['Points', 'Time', 'GridPosition'], errors='ignore')
+    # Kimi Antonelli apparaît sous plusieurs variantes de nom
+    for name in ("results", "qualifying"):
+        if name in tables and 'DriverId' in tables[name].columns:
+            mask = tables[name]['DriverId'] == 'antonelli'
+            if mask.any():
+                df = tables[name].copy()
+                df.loc[mask, ['FirstName', 'FullName']] = ['Kimi', 'Kimi Antonelli']
+                tables[name] = df
+    if "driver_standings" in tables:
+        mask = tables["driver_standings"]['FullName'] == 'Andrea Kimi Antonelli'
+        if mask.any():
+            standings = tables["driver_standings"].copy()
+            standings.loc[mask, 'FullName'] = 'Kimi Antonelli'
+            tables["driver_standings"] = standings
+    return tables
+
+
+def flight_leg(prev, current, airports):
+    """Segment logistique entre deux GP du manifeste (None si un aéroport est inconnu)."""
+    a, b = airports.get(prev["airport"]), airports.get(current["airport"])
+    if a is None or b is None:
+        return None
+    dist_km = haversine(a[0], a[1], b[0], b[1])
+    co2_kg = dist_km * MASS_TONNES * KG_CO2_PER_TKM
+    return pd.DataFrame([{
+        'from': prev["airport"], 'to': current["airport"], 'distance_km': dist_km,
+        'event_from': prev["event"], 'event_to': current["event"],
+        'CO2_kg': round(co2_kg, 2), 'CO2_tonnes': round(co2_kg / 1000, 2),
+    }])
+
+
+def write_legs(season, entries, rd, airports):
+    """Écrit le segment qui arrive sur `rd` et celui qui arrive sur le GP suivant du
+    manifeste (son GP précédent a changé), quand les deux aéroports sont connus."""
+    order = sorted(int(r) for r in entries)
+    i = order.index(rd)
+    for prev, cur in [(order[j - 1], order[j]) for j in (i, i + 1) if 0 < j < len(order)]:
+        leg = flight_leg(entries[str(prev)], entries[str(cur)], airports)
+        if leg is not None:
+            data.write_partition("flights", leg, season, cur)
+
+
+def completed_rounds(season, today=None):
+    """{gp: lieu} des GP de `season` déjà courus (calendrier FastF1, hors essais)."""
+    import fastf1
+
+    schedule = fastf1.get_event_schedule(season, include_testing=False)
+    today = pd.Timestamp(today or date.today())
+    completed = schedule[schedule['EventDate'] <= today]
+    return {int(rd): loc for rd, loc in zip(completed['RoundNumber'], completed['Location'])}
+
+
+def adopt_existing(season, manifest):
+    """Intègre au manifeste les GP déjà présents dans data/ (fichiers à plat partitionnés au passage),
+    pour qu'une première exécution incrémentale ne retélécharge pas la saison."""
+    from f1dash.migrate import migrate_table, split_flights
+
+    for name in data.TABLES:
+        if not data.is_partitioned(name):
+            migrate_table(name)
+    # Vols rangés par GP d'arrivée, comme les écrit ingest : pas de doublon avec un fichier de saison
+    split_flights(season)
+    entries = manifest.setdefault(str(season), {})
+    season_dir = os.path.join(data.dataset_dir("results"), f"season={season}")
+    if not os.path.isdir(season_dir):
+        return manifest
+    present = [int(d.split("=", 1)[1]) for d in os.listdir(season_dir) if d.startswith("round=")]
+    missing = sorted(rd for rd in present if str(rd) not in entries)
+    if missing:
+        events = data.load_table("results", ["round", "event"], season=season, rounds=missing)
+        for rd, loc in events.drop_duplicates("round").itertuples(index=False):
+            entries[str(rd)] = {
+                "event": loc, "airport": CIRCUIT_IATA.get(loc), "tables": [], "ingested_at": None,
+            }
+    return manifest
+
+
+def ingest(season, workers=4, today=None, rounds=None, race_loader=load_race,
+           quali_loader=load_qualifying, airports=None):
+    """Télécharge et écrit les GP terminés de `season` absents du manifeste.
+
+    `rounds` ({gp: lieu}) remplace le calendrier FastF1 ; `race_loader`, `quali_loader`
+    et `airports` sont remplaçables (fonctions de module, exécutées dans le pool).
+    Retourne la liste des GP intégrés ; un GP dont la course échoue sera retenté
+    à la prochaine exécution. Un GP intégré sans ses qualifs (session en échec) les
+    note dans `missing` : seule la session Q est rechargée aux exécutions suivantes.
+    """
+    manifest = adopt_existing(season, read_manifest())
+    entries = manifest.setdefault(str(season), {})
+    rounds = completed_rounds(season, today) if rounds is None else rounds
+    todo = {rd: loc for rd, loc in sorted(rounds.items()) if str(rd) not in entries}
+    retry = {int(rd): e["event"] for rd, e in sorted(entries.items(), key=lambda item: int(item[0]))
+             if "qualifying" in e.get("missing", [])}
+    if not todo and not retry:
+        write_manifest(manifest)
+        return []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        races = {rd: pool.submit(race_loader, season, rd, loc) for rd, loc in todo.items()}
+        qualis = {rd: pool.submit(quali_loader, season, rd, loc) for rd, loc in {**todo, **retry}.items()}
+        ingested = []
+        for rd, loc in todo.items():
+            try:
+                tables = dict(races[rd].result())
+            except Exception as e:
+                print(f"  ❌ Round {rd:02d} – {loc} : données course indisponibles ({e})")
+                continue
+            missing = []
+            try:
+                tables.update(qualis[rd].result())
+            except Exception as e:
+                missing.append("qualifying")
+                print(f"  Round {rd:02d} – {loc} : pas de session Q, retentée à la prochaine exécution ({e})")
+            tables = clean_round(tables)
+            for name, df in tables.items():
+                data.write_partition(name, df, season, rd)
+            entries[str(rd)] = {
+                "event": loc, "airport": CIRCUIT_IATA.get(loc), "tables": sorted(tables), "missing": missing,
+                "ingested_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            airports = load_airports() if airports is None else airports
+            write_legs(season, entries, rd, airports)
+            # Manifeste écrit après chaque GP, segments compris : une interruption ne perd
+            # que le GP en cours, retéléchargé en entier à la prochaine exécution
+            write_manifest(manifest)
+            ingested.append(rd)
+            print(f"  ✅ Round {rd:02d} – {loc}")
+        # Qualifs manquantes des GP déjà intégrés : écrites seules, le reste du GP est inchangé
+        for rd, loc in retry.items():
+            try:
+                tables = clean_round(qualis[rd].result())
+            except Exception as e:
+                print(f"  Round {rd:02d} – {loc} : toujours pas de session Q ({e})")
+                continue
+            for name, df in tables.items():
+                data.write_partition(name, df, season, rd)
+            entry = entries[str(rd)]
+            entry["tables"] = sorted(set(entry["tables"]) | set(tables))
+            entry["missing"] = [name for name in entry["missing"] if name not in tables]
+            write_manifest(manifest)
+            print(f"  ✅ Round {rd:02d} – {loc} : qualifs récupérées")
+    return ingested
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acquisition incrémentale des données FastF1")
+    parser.add_argument("--season", type=int, default=date.today().year)
+    parser.add_argument("--data-dir", default=data.DATA_DIR)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    data.DATA_DIR = args.data_dir
+    ingested = ingest(args.season, workers=args.workers)
+    print(f"{len(ingested)} GP intégrés : {ingested}" if ingested else "Aucun nouveau GP")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Magasin Arrow IPC (Feather v2, non compressé) partagé entre processus.
+# Chaque table décodée du Parquet est écrite une fois par saison et par empreinte de ses
+# fichiers source (`arrow_store/<table>_<saison>.<empreinte>.arrow`), colonnes texte
+# (pilote, écurie, GP, statut...) encodées en dictionnaire. Les processus la projettent
+# en mémoire (mmap) : les pages du fichier appartiennent au cache du noyau et sont
+# partagées par tous les workers au lieu d'être copiées dans chacun.
+#
+# Conversion vers pandas : colonnes numériques sans valeur nulle lues sans copie (vues
+# sur la projection) ; colonnes texte rendues en tableaux d'objets qui pointent vers les
+# chaînes du dictionnaire (une chaîne par valeur distincte, pas une par ligne).
+import glob
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+ENABLED = os.environ.get("F1_ARROW_STORE", "1") == "1"
+
+# Versions gardées par table (la dernière écrite comprise)
+KEEP_VERSIONS = 2
+
+# Tables projetées dans ce processus, par chemin (la projection reste ouverte)
+_mapped = {}
+
+
+def store_path(store_dir, name, season, fingerprint):
+    return os.path.join(store_dir, f"{name}_{season}.{fingerprint[:16]}.arrow")
+
+
+def _dictionary_encode(table):
+    """Colonnes texte -> dictionnaire (indices int32 + valeurs distinctes)."""
+    for i, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(i, field.name, pc.dictionary_encode(table.column(i)).combine_chunks())
+    return table
+
+
+def write(path, table):
+    """Écrit `table` encodée en dictionnaire (à appeler via f1dash.data.atomic_write)."""
+    # Non compressé et en un seul bloc : condition pour relire sans copie
+    feather.write_feather(_dictionary_encode(table.combine_chunks()), path, compression="uncompressed")
+
+
+def remove_old_versions(path):
+    """Supprime les versions de la table de `path` écrites avant les KEEP_VERSIONS plus récentes.
+
+    `path` est toujours gardé, ainsi que la version la plus récente écrite par un autre
+    processus : un worker à l'empreinte périmée (f1dash.data.FINGERPRINT_TTL) qui réécrit
+    une ancienne version ne retire pas celle qu'un autre worker s'apprête à projeter.
+    """
+    folder = os.path.dirname(path)
+    prefix = os.path.basename(path).rsplit(".", 2)[0]
+    versions = []
+    for other in glob.glob(os.path.join(folder, f"{glob.escape(prefix)}.*.arrow")):
+        if other != path:
+            try:
+                versions.append((os.stat(other).st_mtime_ns, other))
+            except OSError:
+                pass  # supprimé entre-temps par un autre processus
+    for _, old in sorted(versions, reverse=True)[KEEP_VERSIONS - 1:]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass  # déjà supprimé, ou encore projeté par un autre processus (Windows)
+
+
+def open_table(path):
+    """Table Arrow projetée depuis `path` (aucune donnée copiée), gardée pour les appels suivants.
+
+    FileNotFoundError si la version a été supprimée par un autre processus entre-temps.
+    """
+    table = _mapped.get(path)
+    if table is None:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        prefix = os.path.basename(path).rsplit(".", 2)[0] + "."
+        for old in [p for p in _mapped if os.path.basename(p).startswith(prefix)]:
+            del _mapped[old]  # version précédente de la même table
+        _mapped[path] = table
+    return table
+
+
+def select(table, columns=None, rounds=None):
+    """Lignes des GP `rounds` (tous si None) et colonnes `columns` (toutes si None)."""
+    if rounds is not None:
+        table = table.filter(pc.is_in(table.column("round"), value_set=pa.array(list(rounds), pa.int64())))
+    return table.select(list(columns)) if columns is not None else table
+
+
+def _strings(column):
+    """Colonne dictionnaire -> tableau d'objets (None pour les valeurs nulles, comme le Parquet)."""
+    column = column.combine_chunks()
+    values = np.asarray(column.dictionary.to_pylist() + [None], dtype=object)
+    codes = column.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+    return values[codes]  # -1 -> None (dernier élément)
+
+
+def to_pandas(table):
+    """DataFrame pandas aux mêmes types qu'une lecture Parquet, sans copie des colonnes numériques."""
+    encoded = [f.name for f in table.schema if pa.types.is_dictionary(f.type)]
+    plain = table.drop_columns(encoded) if encoded else table
+    # split_blocks : une colonne = un bloc, pas de consolidation (donc pas de copie)
+    df = plain.to_pandas(split_blocks=True)
+    for name in encoded:
+        df.insert(table.column_names.index(name), name, _strings(table.column(name)))
+    return df
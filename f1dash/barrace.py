@@ -0,0 +1,93 @@
+# Bar race de l'accueil en livraison progressive.
+# La figure complète (une image par GP, chaque image répétant couleurs, survol, légende
+# de chaque écurie) n'est plus envoyée d'un bloc : la page reçoit la figure de base
+# (première image, layout, curseur) et peut s'afficher tout de suite ; les images
+# suivent par paquets de CHUNK_FRAMES sous une forme compacte, reconstruite dans le
+# navigateur (assets/clientside.js, f1.bar_race_frames) puis ajoutée avec Plotly.addFrames.
+#
+# Forme compacte : les métadonnées de trace (tout sauf x/y, nom du GP remplacé par
+# SENTINEL) sont envoyées une fois ; une image n'est plus que
+#   [nom du GP, [[indice de métadonnée, x, indices des pilotes dans `labels`], ...]].
+# Une trace qui ne se réduit pas exactement à un gabarit est envoyée telle quelle.
+import base64
+import json
+
+import numpy as np
+
+from f1dash.clientside import SENTINEL, to_json_data
+
+CHUNK_FRAMES = 6
+
+
+def _number(value):
+    value = float(value)
+    if value != value:
+        return None  # NaN : valeur manquante, comme dans le tableau binaire de plotly
+    return int(value) if value.is_integer() else value
+
+
+def _values(array):
+    """Tableau JSON de plotly (liste, ou {"dtype", "bdata"} binaire) -> nombres JSON."""
+    if isinstance(array, dict):
+        array = np.frombuffer(base64.b64decode(array["bdata"]), dtype=array["dtype"])
+    return [_number(v) for v in array]
+
+
+def _template(trace, name):
+    """Gabarit de `trace` (dict JSON) sans x/y, ou None s'il ne redonne pas la trace exacte."""
+    meta = {k: v for k, v in trace.items() if k not in ("x", "y")}
+    escaped = json.dumps(name)[1:-1]
+    text = json.dumps(meta, sort_keys=True)
+    template = json.loads(text.replace(escaped, SENTINEL))
+    if json.dumps(template, sort_keys=True).replace(SENTINEL, escaped) != text:
+        return None
+    return template
+
+
+class FrameEncoder:
+    """Encode des images de bar race en forme compacte, en accumulant gabarits et pilotes."""
+
+    def __init__(self):
+        self.meta = []
+        self.labels = []
+        self._meta_index = {}
+        self._label_index = {}
+
+    def _label(self, value):
+        index = self._label_index.get(value)
+        if index is None:
+            index = self._label_index[value] = len(self.labels)
+            self.labels.append(value)
+        return index
+
+    def encode(self, frame):
+        """go.Frame (ou dict) -> [nom, traces compactes]."""
+        name = str(frame["name"])
+        traces = []
+        for plain in to_json_data(list(frame["data"])):
+            template = _template(plain, name)
+            if template is None or plain.get("x") is None or not isinstance(plain.get("y"), list):
+                traces.append(plain)
+                continue
+            key = json.dumps(template, sort_keys=True)
+            index = self._meta_index.get(key)
+            if index is None:
+                index = self._meta_index[key] = len(self.meta)
+                self.meta.append(template)
+            traces.append([index, _values(plain["x"]), [self._label(v) for v in plain["y"]]])
+        return [name, traces]
+
+
+def split_bar_race(fig):
+    """Figure animée (go.Figure ou dict) -> (figure de base sans images, gabarits, pilotes, images compactes)."""
+    base = to_json_data(fig)
+    encoder = FrameEncoder()
+    frames = [encoder.encode(frame) for frame in base.pop("frames", [])]
+    return base, encoder.meta, encoder.labels, frames
+
+
+def chunk(frames, index, size=CHUNK_FRAMES):
+    """Paquet `index` des images compactes : {"start", "frames", "next"} (next None au dernier)."""
+    start = index * size
+    end = min(start + size, len(frames))
+    return {"start": start, "frames": frames[start:end], "next": index + 1 if end < len(frames) else None}
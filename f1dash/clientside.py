@@ -0,0 +1,46 @@
+# Mode "clientside" (optionnel, F1_CLIENTSIDE=1) : les agrégats compacts des callbacks
+# pneus par GP et duels sont envoyés une seule fois au navigateur dans un dcc.Store, et
+# les figures sont reconstruites en JavaScript (assets/clientside.js) : changer de GP ou
+# d'écurie ne fait plus aucune requête au serveur. Sans la variable, les callbacks
+# serveur restent en place (utile pour comparer les deux chemins).
+import json
+import os
+
+from plotly.utils import PlotlyJSONEncoder
+
+ENABLED = os.environ.get("F1_CLIENTSIDE", "0") == "1"
+
+# Valeur factice des figures de référence (titre, nom de trace, survol...) :
+# le JavaScript la remplace par le GP, l'écurie ou le pilote affiché.
+SENTINEL = "__f1_key__"
+
+
+def to_json_data(obj):
+    """Figure, composant Dash ou tableau numpy -> structure JSON pure (listes, dicts)."""
+    return json.loads(json.dumps(obj, cls=PlotlyJSONEncoder))
+
+
+def figure_parts(fig, drop=("x", "y", "text")):
+    """Découpe une figure de référence en (template, layout, trace) réutilisables côté client.
+
+    Le template plotly_dark est sorti du layout pour n'être envoyé qu'une fois par Store ;
+    la trace est la première de la figure, sans ses tableaux de données (`drop`).
+    """
+    fig = to_json_data(fig)
+    layout = fig["layout"]
+    template = layout.pop("template", None)
+    trace = {k: v for k, v in fig["data"][0].items() if k not in drop} if fig["data"] else None
+    return template, layout, trace
+
+
+def discrete_colors(values, mapping, sequence):
+    """Couleur de chaque valeur comme plotly.express (color_discrete_map puis séquence).
+
+    Les valeurs absentes de `mapping` reçoivent la couleur suivante de `sequence`,
+    dans leur ordre d'apparition, exactement comme px le fait pour une figure.
+    """
+    mapping = dict(mapping)
+    for value in values:
+        if value not in mapping:
+            mapping[value] = sequence[len(mapping) % len(sequence)]
+    return [mapping[value] for value in values]
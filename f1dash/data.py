@@ -0,0 +1,353 @@
+# Couche d'accès aux données : chaque table Parquet est lue au premier usage,
+# et seules les colonnes demandées par une page sont décodées.
+#
+# Deux dispositions de DATA_DIR sont reconnues, table par table :
+#   - partitionnée (multi-saisons) : <table>/season=2025/round=3/part-0.parquet,
+#     lue via un dataset pyarrow ; les filtres saison/GP sont appliqués aux
+#     partitions, seuls les fichiers de la tranche affichée sont ouverts ;
+#   - à plat (historique) : <table>_2025.parquet, un fichier par saison.
+# Chaque saison décodée est recopiée une fois dans un magasin Arrow projeté en mémoire
+# (f1dash.arrowstore, désactivable avec F1_ARROW_STORE=0), partagé par tous les processus.
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from f1dash import arrowstore
+from f1dash.metrics import DATA_SECONDS, timer
+
+# Chargement des datasets (modifie le chemin selon ton infra, ou via F1_DATA_DIR)
+DATA_DIR = os.environ.get("F1_DATA_DIR", "data")
+
+# Nom de table -> nom du dossier partitionné (ou préfixe des fichiers à plat)
+TABLES = {
+    "results": "results",
+    "pitstops": "pitstops",
+    "driver_standings": "driver_standings",
+    "team_standings": "team_standings",
+    "flights": "flightlegs",
+    "qualifying": "qualifying",
+    "weather": "weather",
+    "laps": "laps",  # tours rapides (f1dash.laps)
+}
+
+# Sous-dossier de DATA_DIR du magasin Arrow (une table par saison et empreinte des sources)
+STORE_DIRNAME = "arrow_store"
+
+# Clés de partition (hive) ; les segments de vol sont rangés par GP d'arrivée (f1dash.migrate)
+PARTITION_KEYS = ("season", "round")
+PARTITION_SCHEMA = pa.schema([("season", pa.int64()), ("round", pa.int64())])
+
+# Colonnes déjà décodées, par (table, saison, GP) (lignes triées par GP puis ordre du fichier),
+# et empreinte des fichiers source au moment du décodage, par (table, saison)
+_loaded = {}
+_complete = set()
+_versions = {}
+_lock = threading.Lock()
+
+
+def dataset_dir(name):
+    return os.path.join(DATA_DIR, TABLES[name])
+
+
+def is_partitioned(name):
+    return os.path.isdir(dataset_dir(name))
+
+
+def flat_path(name, season):
+    return os.path.join(DATA_DIR, f"{TABLES[name]}_{season}.parquet")
+
+
+def seasons(name="results"):
+    """Saisons disponibles pour `name`, triées (liste de dossiers, aucun fichier lu)."""
+    if is_partitioned(name):
+        found = [d.split("=", 1)[1] for d in os.listdir(dataset_dir(name)) if d.startswith("season=")]
+    else:
+        prefix = os.path.join(DATA_DIR, f"{TABLES[name]}_")
+        found = [p[len(prefix):-len(".parquet")] for p in glob.glob(f"{glob.escape(prefix)}*.parquet")]
+    return sorted(int(s) for s in found if s.isdigit())
+
+
+def latest_season():
+    available = seasons()
+    return available[-1] if available else None
+
+
+def table_path(name, season=None):
+    """Fichier (à plat) ou dossier (partitionné) contenant la saison `season` de `name`."""
+    season = latest_season() if season is None else season
+    if is_partitioned(name):
+        return os.path.join(dataset_dir(name), f"season={season}")
+    return flat_path(name, season)
+
+
+def partition_rounds(name, season):
+    """GP déjà écrits (dossiers round=<gp> complets) de la saison `season` de `name`.
+
+    Vide si la table n'est pas partitionnée : la disposition à plat ne permet pas
+    de savoir quels GP ont changé sans relire le fichier.
+    """
+    folder = table_path(name, season)
+    if not is_partitioned(name) or not os.path.isdir(folder):
+        return []
+    return sorted(
+        int(d.split("=", 1)[1]) for d in os.listdir(folder)
+        if d.startswith("round=") and os.path.isfile(os.path.join(folder, d, "part-0.parquet"))
+    )
+
+
+def round_path(name, season, round):
+    return os.path.join(table_path(name, season), f"round={round}")
+
+
+def _read_source(name, columns, season, rounds):
+    """Lit une tranche (saison, GP) de `name` dans le Parquet (table Arrow), lignes dans l'ordre des GP."""
+    if not is_partitioned(name):
+        filters = [("round", "in", list(rounds))] if rounds is not None else None
+        stored = [c for c in columns if c != "season"] if columns is not None else None
+        table = pq.read_table(flat_path(name, season), columns=stored, filters=filters)
+        # La saison d'un fichier à plat est dans son nom
+        values = pa.array(np.full(table.num_rows, season, dtype=np.int64))
+        if "season" in table.column_names:
+            table = table.set_column(table.column_names.index("season"), "season", values)
+        else:
+            table = table.append_column("season", values)
+        return table.select(columns) if columns is not None else table
+    # Dataset enraciné sur la saison : la découverte ne liste que ses GP, pas toute l'archive
+    dataset = ds.dataset(
+        table_path(name, season), format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        partition_base_dir=dataset_dir(name),
+    )
+    wanted = list(columns) if columns is not None else dataset.schema.names
+    expr = ds.field("round").isin(list(rounds)) if rounds is not None else None
+    table = dataset.to_table(columns=wanted + [k for k in PARTITION_KEYS if k not in wanted], filter=expr)
+    # Les partitions sont découvertes dans l'ordre lexical (round=10 avant round=2)
+    table = table.sort_by([(k, "ascending") for k in PARTITION_KEYS])
+    return table.select(wanted)
+
+
+def _stored(name, season):
+    """Saison complète de `name` dans le magasin Arrow (écrite au premier accès), projetée en mémoire."""
+    path = arrowstore.store_path(
+        os.path.join(DATA_DIR, STORE_DIRNAME), TABLES[name], season, path_fingerprint(table_path(name, season))
+    )
+    if not os.path.exists(path):
+        table = _read_source(name, None, season, None)
+        atomic_write(path, lambda tmp: arrowstore.write(tmp, table))
+        arrowstore.remove_old_versions(path)
+    try:
+        return arrowstore.open_table(path)
+    except FileNotFoundError:
+        # Version retirée par un autre processus depuis le test d'existence : lecture directe
+        return _read_source(name, None, season, None)
+
+
+def _read(name, columns, season, rounds):
+    """Lit une tranche (saison, GP) de `name` en DataFrame, lignes dans l'ordre des GP."""
+    with timer(DATA_SECONDS, name):
+        if arrowstore.ENABLED:
+            return arrowstore.to_pandas(arrowstore.select(_stored(name, season), columns, rounds))
+        return _read_source(name, columns, season, rounds).to_pandas()
+
+
+def load_table(name, columns=None, season=None, rounds=None):
+    """Retourne la table `name` restreinte à `columns` (toutes si None).
+
+    `season` (dernière disponible si None) et `rounds` (tous les GP si None)
+    filtrent les partitions lues. Les colonnes manquantes sont lues à la demande
+    puis gardées en mémoire : un second appel ne relit que ce qui n'a jamais été chargé.
+    Les tranches gardées sont oubliées quand les fichiers de la saison changent
+    (partition réécrite, GP ajouté ; vu après FINGERPRINT_TTL au plus), et relues depuis le Parquet.
+    """
+    season = latest_season() if season is None else season
+    key = (name, season, tuple(sorted(rounds)) if rounds is not None else None)
+    version = path_fingerprint(table_path(name, season))
+    with _lock:
+        if _versions.get((name, season)) != version:
+            _drop(lambda k: k[:2] == (name, season))
+            _versions[(name, season)] = version
+        df = _loaded.get(key)
+        if columns is None:
+            if key not in _complete:
+                df = _read(name, None, season, rounds)
+                _loaded[key] = df
+                _complete.add(key)
+            return _loaded[key]
+        columns = list(columns)
+        missing = [c for c in columns if df is None or c not in df.columns]
+        if missing:
+            part = _read(name, missing, season, rounds)
+            df = part if df is None else pd.concat([df, part], axis=1)
+            _loaded[key] = df
+        # Copie superficielle : les données sont partagées, pas la liste des colonnes
+        return df[columns].copy(deep=False)
+
+
+def has_table(name, season):
+    """Vrai si la saison `season` de `name` existe dans DATA_DIR (fichier ou dossier)."""
+    return os.path.exists(table_path(name, season))
+
+
+def read_table(name, columns=None, season=None, rounds=None):
+    """Comme load_table, sans garder le résultat en mémoire : pour les lectures ponctuelles
+    qui parcourent toute l'archive (apprentissage de f1dash.projection...)."""
+    season = latest_season() if season is None else season
+    return _read(name, list(columns) if columns is not None else None, season, rounds)
+
+
+# Préfixe des fichiers temporaires d'atomic_write (laissés de côté par les empreintes)
+TMP_PREFIX = ".tmp-"
+
+
+def atomic_write(path, write):
+    """Écrit `path` en appelant `write(tmp)` sur un fichier temporaire du même dossier,
+    puis os.replace : un lecteur concurrent voit l'ancien fichier ou le nouveau, jamais
+    un fichier partiel. Le temporaire est supprimé si l'écriture échoue."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=TMP_PREFIX, suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def atomic_write_text(path, text):
+    """Texte UTF-8 écrit par atomic_write."""
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    atomic_write(path, write)
+
+
+def write_partition(name, df, season, round=None):
+    """Écrit (ou remplace) la partition saison/GP de `name` dans la disposition hive."""
+    folder = os.path.join(dataset_dir(name), f"season={season}")
+    if round is not None:
+        folder = os.path.join(folder, f"round={round}")
+    df = df.drop(columns=[k for k in PARTITION_KEYS if k in df.columns])
+    atomic_write(os.path.join(folder, "part-0.parquet"), lambda tmp: df.to_parquet(tmp, index=False))
+    # Écriture de ce processus : visible dès le prochain accès, sans attendre FINGERPRINT_TTL
+    _fingerprints.clear()
+
+
+# (chemin, taille, mtime) -> sha1 du contenu, pour ne hacher chaque version de fichier qu'une fois
+_digests = {}
+_digest_lock = threading.Lock()
+
+# Empreintes des chemins gardées FINGERPRINT_TTL secondes (F1_FINGERPRINT_TTL) : une requête
+# qui consulte plusieurs fois le modèle et ses tables ne reparcourt pas les partitions à
+# chaque accès. Un Parquet écrit par un autre processus est vu au plus tard après ce délai.
+FINGERPRINT_TTL = float(os.environ.get("F1_FINGERPRINT_TTL", "1"))
+_fingerprints = {}  # chemin -> (instant du parcours, empreinte)
+
+
+def _file_digest(path):
+    st = os.stat(path)
+    stamp = (path, st.st_size, st.st_mtime_ns)
+    with _digest_lock:
+        digest = _digests.get(stamp)
+    if digest is None:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with _digest_lock:
+            _digests[stamp] = digest
+    return digest
+
+
+def path_fingerprint(path, max_age=None):
+    """Empreinte d'un fichier, ou d'un dossier (tous ses fichiers, triés).
+
+    Une empreinte relevée il y a moins de `max_age` secondes (FINGERPRINT_TTL si None)
+    est réutilisée ; `max_age=0` force le parcours. Elle est toujours relevée avant les
+    lectures qu'elle étiquette : des données gardées sont au moins aussi récentes qu'elle.
+    """
+    max_age = FINGERPRINT_TTL if max_age is None else max_age
+    now = time.monotonic()
+    cached = _fingerprints.get(path)
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+    fingerprint = _walk_fingerprint(path)
+    _fingerprints[path] = (now, fingerprint)
+    return fingerprint
+
+
+def _walk_fingerprint(path):
+    try:
+        if os.path.isfile(path):
+            return _file_digest(path)
+    except FileNotFoundError:
+        pass
+    if not os.path.isdir(path):
+        return "absent"
+    # Fichier supprimé entre la liste du dossier et son stat (autre processus) : le
+    # parcours est repris et ne le voit plus. Un os.replace ne retire jamais la cible,
+    # seulement le temporaire, que le parcours ignore de toute façon.
+    while True:
+        try:
+            return _dir_fingerprint(path)
+        except FileNotFoundError:
+            continue
+
+
+def _dir_fingerprint(path):
+    h = hashlib.sha1()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.startswith(TMP_PREFIX):
+                continue  # écriture atomique en cours (atomic_write)
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, path).encode())
+            h.update(_file_digest(full).encode())
+    return h.hexdigest()
+
+
+def data_fingerprint(tables, season=None, max_age=None):
+    """Empreinte combinée des tables d'entrée (noms de f1dash.data.TABLES) pour une saison."""
+    season = latest_season() if season is None else season
+    h = hashlib.sha1(f"season={season}".encode())
+    for name in sorted(tables):
+        h.update(name.encode())
+        h.update(path_fingerprint(table_path(name, season), max_age).encode())
+    return h.hexdigest()
+
+
+def _drop(match):
+    """Oublie les tranches dont la clé vérifie `match` (appelé sous _lock)."""
+    for key in [k for k in _loaded if match(k)]:
+        del _loaded[key]
+        _complete.discard(key)
+
+
+def forget(season):
+    """Oublie les tranches déjà décodées de `season` (relues au prochain accès)."""
+    with _lock:
+        _drop(lambda k: k[1] == season)
+        for key in [k for k in _versions if k[1] == season]:
+            del _versions[key]
+
+
+def clear():
+    with _lock:
+        _loaded.clear()
+        _complete.clear()
+        _versions.clear()
+    _fingerprints.clear()
@@ -0,0 +1,83 @@
+# Moteur de dégradation des pneus, sur le magasin des tours rapides (f1dash.laps).
+# Chaque relais (saison, GP, pilote, relais) reçoit une droite des moindres carrés
+# temps au tour = base + deg x TyreLife, deg étant la perte en secondes par tour de vie
+# du pneu. Tous les relais sont ajustés ensemble : les sommes n, Σx, Σy, Σx², Σxy sont
+# accumulées par identifiant de relais (np.bincount) et pentes et ordonnées en découlent
+# par opérations sur tableaux, sans boucle Python ni ajustement par relais. Un second
+# passage écarte les tours trop loin de la droite de leur relais (trafic, erreur) et réajuste.
+# Le temps au tour est d'abord corrigé de l'effet carburant : la voiture s'allège et gagne
+# FUEL_S_PER_LAP par tour, ce qui masquerait sinon une partie de l'usure.
+import os
+
+import numpy as np
+
+FUEL_S_PER_LAP = float(os.environ.get("F1_FUEL_S_PER_LAP", "0.03"))
+MIN_LAPS = 5  # relais plus courts : pente trop incertaine, écartés
+OUTLIER_SIGMAS = 3.0
+OUTLIER_MIN_S = 0.5  # un tour n'est jamais écarté à moins de 0,5 s de la droite
+
+STINT_KEYS = ["season", "round", "Driver", "Stint"]
+STINT_INFO = ["event", "Team", "Compound"]
+COMPOUND_ORDER = ["SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"]
+
+
+def _fit(group, x, y, weight, n_groups):
+    """(tours, pente, ordonnée) des droites de chaque groupe, lignes pondérées par `weight` (0 ou 1)."""
+    def total(values):
+        return np.bincount(group, weights=values * weight, minlength=n_groups)
+    n, sx, sy = total(np.ones_like(x)), total(x), total(y)
+    sxx, sxy = total(x * x), total(x * y)
+    den = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(den > 0, (n * sxy - sx * sy) / den, np.nan)
+        intercept = (sy - slope * sx) / n
+    return n, slope, intercept
+
+
+def fit_stints(laps, trim=True):
+    """Une ligne par relais : STINT_KEYS, STINT_INFO, laps (tours retenus), deg (s/tour de vie
+    du pneu), base (s, pneu neuf, carburant du 1er tour), max_life (TyreLife maximale).
+
+    `laps` : tours rapides (f1dash.laps.load_laps, colonne `season` comprise). Sans `trim`,
+    simple moindres carrés sur tous les tours (comparable à np.polyfit relais par relais).
+    """
+    laps = laps.dropna(subset=["LapTime", "TyreLife", "Stint", "Compound"])
+    if "season" not in laps.columns:
+        laps = laps.assign(season=0)
+    group = laps.groupby(STINT_KEYS, sort=True).ngroup().to_numpy()
+    n_groups = int(group.max()) + 1 if len(group) else 0
+    x = laps["TyreLife"].to_numpy(dtype=float)
+    y = laps["LapTime"].to_numpy(dtype=float) + FUEL_S_PER_LAP * (laps["LapNumber"].to_numpy(dtype=float) - 1)
+    weight = np.ones_like(x)
+    n, slope, intercept = _fit(group, x, y, weight, n_groups)
+    if trim and len(x):
+        residual = y - (intercept[group] + slope[group] * x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sigma = np.sqrt(np.bincount(group, weights=residual ** 2, minlength=n_groups) / np.maximum(n - 2, 1))
+        weight = (np.abs(residual) <= np.maximum(OUTLIER_SIGMAS * sigma[group], OUTLIER_MIN_S)).astype(float)
+        n, slope, intercept = _fit(group, x, y, weight, n_groups)
+    # Clés et informations du relais : celles de sa première ligne
+    first = np.unique(group, return_index=True)[1]
+    stints = laps.iloc[first][STINT_KEYS + STINT_INFO].reset_index(drop=True)
+    stints["laps"] = n.astype(np.int64)
+    stints["deg"] = slope
+    stints["base"] = intercept
+    max_life = np.zeros(n_groups)
+    np.maximum.at(max_life, group, x)
+    stints["max_life"] = max_life
+    return stints[(stints["laps"] >= MIN_LAPS) & np.isfinite(stints["deg"])].reset_index(drop=True)
+
+
+def summarize(stints, by):
+    """Dégradation moyenne (pondérée par les tours de chaque relais) par `by` : deg, stints, laps."""
+    by = [by] if isinstance(by, str) else list(by)
+    weighted = stints.assign(weighted=stints["deg"] * stints["laps"])
+    out = weighted.groupby(by, sort=False).agg(weighted=("weighted", "sum"), laps=("laps", "sum"), stints=("deg", "size"))
+    out["deg"] = out["weighted"] / out["laps"]
+    return out[["deg", "stints", "laps"]].reset_index()
+
+
+def compound_order(compounds):
+    """Pneus dans l'ordre tendre -> dur -> pluie, les inconnus à la fin."""
+    known = [c for c in COMPOUND_ORDER if c in set(compounds)]
+    return known + sorted(set(compounds) - set(known))
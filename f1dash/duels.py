@@ -0,0 +1,55 @@
+# Moteur des duels intra-écurie : pour toutes les écuries à la fois, une passe groupée
+# calcule les points par pilote, les courbes de points cumulés, le face-à-face en
+# course et les données des cartes pilotes. Le callback n'assemble plus que les composants.
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class TeamDuel:
+    score: pd.Series  # points par pilote, décroissant
+    cumul: pd.DataFrame  # FullName, round, PointsCum, event
+    wins: dict  # (pilote, coéquipier) -> courses terminées devant lui
+    first_rows: dict  # pilote -> première ligne de résultats (cartes : photo...)
+
+    @property
+    def pilotes(self):
+        return self.score.index.tolist()
+
+
+def _head_to_head(results):
+    """Nombre de courses où chaque pilote finit devant chaque coéquipier (positions connues des deux)."""
+    races = results[["TeamName", "event", "FullName", "Position"]].dropna(subset=["Position"])
+    pairs = races.merge(races, on=["TeamName", "event"], suffixes=("", "_mate"))
+    pairs = pairs[pairs["FullName"] != pairs["FullName_mate"]]
+    ahead = pairs["Position"] < pairs["Position_mate"]
+    return ahead.groupby([pairs["TeamName"], pairs["FullName"], pairs["FullName_mate"]]).sum()
+
+
+def build_duels(results, standings):
+    """dict écurie -> TeamDuel."""
+    scores = results.groupby(["TeamName", "FullName"])["Points"].sum()
+    cumuls = (
+        standings
+        .groupby(["TeamName", "FullName", "round"])["Points"].sum()
+        .groupby(level=[0, 1]).cumsum()
+    )
+    round_to_gp = results.drop_duplicates("round", keep="last").set_index("round")["event"]
+    wins = _head_to_head(results)
+    first_rows = results.drop_duplicates(["TeamName", "FullName"]).set_index(["TeamName", "FullName"])
+
+    duels = {}
+    for team in scores.index.unique(level=0):
+        cumul = cumuls.loc[team].reset_index(name="PointsCum") if team in cumuls.index else (
+            pd.DataFrame(columns=["FullName", "round", "PointsCum"])
+        )
+        cumul["event"] = cumul["round"].map(round_to_gp)
+        team_wins = wins.loc[team] if team in wins.index else pd.Series(dtype=int)
+        duels[team] = TeamDuel(
+            score=scores.loc[team].sort_values(ascending=False),
+            cumul=cumul,
+            wins={pair: int(n) for pair, n in team_wins.items()},
+            first_rows=first_rows.loc[team].to_dict(orient="index"),
+        )
+    return duels
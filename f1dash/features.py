@@ -0,0 +1,152 @@
+# Table de features dérivées, construite une seule fois par processus et par saison.
+# Toutes les colonnes calculées (delta grille/arrivée, segments CO₂, points cumulés
+# enrichis de l'écurie...) sont produites ici de façon vectorisée. Le modèle est partagé
+# par toutes les pages et tous les callbacks : par convention, aucun n'y écrit (rien
+# ne l'empêche, voir SeasonModel), ils en lisent ou en dérivent de nouvelles tables.
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from f1dash.data import data_fingerprint, latest_season, load_table
+from f1dash.duels import build_duels
+from f1dash.pits import build_pit_index
+
+# Tables lues par le modèle : leur empreinte sert de version des données
+MODEL_TABLES = ("results", "driver_standings", "pitstops", "flights")
+
+RESULTS_COLS = [
+    "FullName", "Abbreviation", "TeamName", "TeamColor", "HeadshotUrl",
+    "Position", "GridPosition", "Points", "Status", "round", "event",
+]
+STANDINGS_COLS = ["FullName", "TeamName", "round", "Points"]
+PITS_COLS = ["TeamName", "CompoundIn", "CompoundOut", "event"]
+FLIGHTS_COLS = ["event_from", "event_to", "CO2_tonnes"]
+
+DEFAULT_TEAM_COLOR = "#cccccc"
+DEFAULT_HEADSHOT_URL = "https://media.formula1.com/d_driver_fallback_i"
+
+
+# frozen empêche seulement de réaffecter un champ : les DataFrame et dict partagés restent
+# modifiables en place, ce que les lecteurs du modèle s'interdisent
+@dataclass(frozen=True)
+class SeasonModel:
+    results: pd.DataFrame  # résultats + delta, abs_delta, TeamColor préfixé '#'
+    standings: pd.DataFrame  # classement pilotes brut (points par GP)
+    cumul: pd.DataFrame  # points cumulés par pilote et GP, enrichis écurie/couleur/photo
+    pits: pd.DataFrame  # arrêts avec pneus et GP renseignés
+    pits_by_gp: dict  # GP -> arrêts agrégés par écurie et pneu (voir f1dash.pits)
+    flights: pd.DataFrame  # segments logistiques + libellé 'segment'
+    duels: dict  # écurie -> TeamDuel (voir f1dash.duels)
+    gp_order: tuple  # GP dans l'ordre du calendrier
+    team_colors: dict  # écurie -> couleur
+    pilot2team: dict  # pilote -> écurie (dernière connue)
+    team_color_map: dict  # écurie -> couleur, telle qu'utilisée par la bar race
+    season: int  # saison couverte par le modèle
+    version: str  # empreinte des Parquet au moment de la construction
+
+
+def fix_color_series(colors):
+    """Préfixe '#' aux couleurs hexadécimales qui n'en ont pas (valeurs non-str inchangées)."""
+    as_str = colors.where(colors.map(type) == str)
+    missing_hash = as_str.notna() & ~as_str.str.startswith("#", na=False)
+    return colors.mask(missing_hash, "#" + as_str)
+
+
+def build_cumul(standings, results):
+    cumul = (
+        standings
+        .groupby(["FullName", "round"], sort=True)["Points"]
+        .sum()
+        .groupby(level=0).cumsum()
+        .reset_index(name="PointsCum")
+    )
+    round_to_gp = results.drop_duplicates("round", keep="last").set_index("round")["event"]
+    cumul["event"] = cumul["round"].map(round_to_gp)
+    # Jointure (pilote, GP) -> écurie / couleur / photo, à la place des apply(axis=1)
+    lookup = results.drop_duplicates(subset=["FullName", "round"])[
+        ["FullName", "round", "TeamName", "TeamColor", "HeadshotUrl"]
+    ]
+    cumul = cumul.merge(lookup, on=["FullName", "round"], how="left", indicator=True)
+    absent = cumul.pop("_merge").eq("left_only")
+    cumul["TeamName"] = cumul["TeamName"].mask(absent, "N/A")
+    cumul["TeamColor"] = cumul["TeamColor"].mask(absent, DEFAULT_TEAM_COLOR)
+    cumul["HeadshotUrl"] = cumul["HeadshotUrl"].mask(absent, DEFAULT_HEADSHOT_URL)
+    return cumul
+
+
+def build_model(season):
+    # Empreinte prise avant les lectures : un fichier réécrit pendant la construction
+    # laisse un modèle qui paraît périmé, reconstruit au prochain get_model
+    version = data_version(season)
+    results = load_table("results", RESULTS_COLS, season=season)
+    standings = load_table("driver_standings", STANDINGS_COLS, season=season)
+    pits = load_table("pitstops", PITS_COLS, season=season)
+    flights = load_table("flights", FLIGHTS_COLS, season=season)
+
+    results = results.assign(
+        TeamColor=fix_color_series(results["TeamColor"]),
+        delta=results["GridPosition"] - results["Position"],
+    )
+    results["abs_delta"] = np.abs(results["delta"])
+    flights = flights.assign(segment=flights["event_from"] + " → " + flights["event_to"])
+    pits = pits.dropna(subset=["CompoundIn", "CompoundOut", "event"])
+
+    cumul = build_cumul(standings, results)
+    team_color_map = cumul.groupby("TeamName")["TeamColor"].first().to_dict()
+    team_colors = results.drop_duplicates("TeamName").set_index("TeamName")["TeamColor"].to_dict()
+    pilot2team = results.drop_duplicates("FullName", keep="last").set_index("FullName")["TeamName"].to_dict()
+    gp_order = tuple(results.sort_values("round", kind="stable")["event"].unique())
+
+    return SeasonModel(
+        results=results,
+        standings=standings,
+        cumul=cumul,
+        pits=pits,
+        pits_by_gp=build_pit_index(pits),
+        flights=flights,
+        duels=build_duels(results, standings),
+        gp_order=gp_order,
+        team_colors=team_colors,
+        pilot2team=pilot2team,
+        team_color_map=team_color_map,
+        season=season,
+        version=version,
+    )
+
+
+_models = {}
+_lock = threading.Lock()
+
+
+def get_model(season=None):
+    """Modèle partagé de `season` (la plus récente si None), construit au premier appel
+    (une seule fois même sous un serveur multi-thread). Seules les saisons consultées
+    sont chargées en mémoire. À chaque accès, la version du modèle est comparée à celle
+    des Parquet (relevée au plus toutes les FINGERPRINT_TTL secondes) : un GP ajouté ou
+    une partition réécrite le fait reconstruire."""
+    season = latest_season() if season is None else int(season)
+    version = data_version(season)
+    model = _models.get(season)
+    if model is None or model.version != version:
+        with _lock:
+            model = _models.get(season)
+            if model is None or model.version != version:
+                model = _models[season] = build_model(season)
+    return model
+
+
+def data_version(season=None, max_age=None):
+    """Empreinte des tables du modèle (un stat par fichier, sha1 mémorisé), gardée
+    FINGERPRINT_TTL secondes : voir f1dash.data.path_fingerprint."""
+    return data_fingerprint(MODEL_TABLES, season, max_age)
+
+
+def reset_model(season=None):
+    """Oublie le modèle de `season` (de toutes les saisons si None)."""
+    with _lock:
+        if season is None:
+            _models.clear()
+        else:
+            _models.pop(int(season), None)
@@ -0,0 +1,90 @@
+# Cache disque des figures Plotly, invalidé par empreinte de contenu.
+# La clé d'une figure combine l'empreinte des fichiers Parquet qu'elle lit et la
+# version de sa fonction de construction : quand un nouveau GP arrive dans data/,
+# seules les figures concernées sont reconstruites, sans vider tout le cache.
+# Chaque saison a ses propres fichiers (`<nom>_<saison>.<clé>.json`).
+import glob
+import hashlib
+import os
+
+from f1dash.data import DATA_DIR, atomic_write_text, data_fingerprint, latest_season
+from f1dash.memo import FIGURE_CACHE
+from f1dash.metrics import DISK_CACHE, FIGURE_SECONDS, timer
+from f1dash.transport import figure_from_json, pack_figure
+
+CACHE_DIR = os.path.join(DATA_DIR, "fig_cache")
+
+
+def cache_key(name, inputs, version, season=None, fingerprint=None):
+    fingerprint = data_fingerprint(inputs, season) if fingerprint is None else fingerprint
+    h = hashlib.sha1(f"{name}:v{version}:{fingerprint}".encode())
+    return h.hexdigest()[:16]
+
+
+def _remove_stale(name, keep):
+    for old in glob.glob(os.path.join(CACHE_DIR, f"{glob.escape(name)}.*.json")):
+        if os.path.basename(old) != os.path.basename(keep):
+            try:
+                os.remove(old)
+            except OSError:
+                pass  # déjà supprimé par un autre worker
+
+
+def _cache_name(name, season):
+    return f"{name}_{season}"
+
+
+def _figure_path(name, inputs, version, season, fingerprint=None):
+    key = cache_key(name, inputs, version, season, fingerprint)
+    return os.path.join(CACHE_DIR, f"{_cache_name(name, season)}.{key}.json")
+
+
+def load_figure(name, inputs, version=1, season=None):
+    """Figure `name` à jour depuis le cache (mémoire puis disque), ou None si absente."""
+    season = latest_season() if season is None else season
+    return _read_cached(_figure_path(name, inputs, version, season))
+
+
+def _read_cached(path):
+    # Figure déjà parsée dans ce processus : ni lecture disque ni décodage JSON
+    fig = FIGURE_CACHE.get(path)
+    if fig is None:
+        if not os.path.exists(path):
+            DISK_CACHE.inc("miss")
+            return None
+        DISK_CACHE.inc("hit")
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        fig = FIGURE_CACHE.put(path, figure_from_json(text), size=len(text))
+    return fig
+
+
+def load_or_create_figure(name, create_func, inputs, version=1, season=None, state=None):
+    """Retourne la figure `name` depuis le cache, ou la construit avec `create_func`.
+
+    `inputs` liste les tables lues par la figure ; `version` est à incrémenter
+    quand la fonction de construction change ; `season` (la plus récente si None)
+    choisit la saison dont les tables sont prises en empreinte. `state` (chaîne) identifie
+    une source hors de ces tables, comme un modèle appris sur toute l'archive : il entre
+    dans la clé au même titre que l'empreinte des tables.
+
+    La clé est l'empreinte relevée avant la construction : `create_func` lit des données
+    au moins aussi récentes (get_model et load_table se revalident sur les Parquet).
+    Si les entrées changent pendant la construction, on ne sait plus quelle version la
+    figure montre : elle est servie sans être écrite, la requête suivante la reconstruit.
+    """
+    season = latest_season() if season is None else season
+    tables = data_fingerprint(inputs, season)
+    fingerprint = tables if state is None else f"{tables}:{state}"
+    path = _figure_path(name, inputs, version, season, fingerprint)
+    fig = _read_cached(path)
+    if fig is not None:
+        return fig
+    with timer(FIGURE_SECONDS, name):
+        fig = create_func()
+    if data_fingerprint(inputs, season) != tables:
+        return pack_figure(fig)
+    text = fig.to_json()
+    atomic_write_text(path, text)
+    _remove_stale(_cache_name(name, season), path)
+    return FIGURE_CACHE.put(path, pack_figure(fig), size=len(text))
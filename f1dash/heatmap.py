@@ -0,0 +1,53 @@
+# Données de la heatmap "progression grille -> arrivée" (page Stratégie).
+# Un seul pivot fournit delta, position de départ et d'arrivée ; les libellés et
+# textes de survol sont assemblés par opérations sur tableaux (np.char) au lieu
+# d'une double boucle Python sur chaque cellule (pilote, GP).
+import numpy as np
+
+HEATMAP_VALUES = ["delta", "GridPosition", "Position"]
+
+
+def _as_int_str(values, missing):
+    """int(v) en texte pour chaque valeur renseignée, `missing` sinon."""
+    present = ~np.isnan(values)
+    as_int = np.trunc(np.where(present, values, 0)).astype(np.int64).astype(str)
+    return np.where(present, as_int, missing)
+
+
+def _as_float_str(values, missing):
+    """str(float) pour chaque valeur renseignée (même format que Python), `missing` sinon."""
+    present = ~np.isnan(values)
+    return np.where(present, values.astype(str), missing)
+
+
+def build_heatmap_data(results, gp_order):
+    """Retourne (pivot delta, textes des cellules, textes de survol).
+
+    `pivot` a les pilotes en lignes (ordre : somme des positions) et les GP en
+    colonnes (ordre du calendrier) ; les deux tableaux de textes ont la même forme.
+    """
+    pilot_order = results.groupby("FullName")["Position"].sum().sort_values().index.tolist()
+    table = results.pivot_table(index="FullName", columns="event", values=HEATMAP_VALUES)
+    pivot, gridpos, arrpos = (
+        table[value].reindex(index=pilot_order, columns=gp_order) for value in HEATMAP_VALUES
+    )
+
+    val = pivot.to_numpy(dtype=float)
+    sign = np.where(val > 0, "+", "")  # NaN > 0 est faux : pas de signe
+    textvals = np.char.add(sign, _as_int_str(val, ""))
+
+    events = np.asarray(pivot.columns, dtype=str)[np.newaxis, :]
+    names = np.asarray(pivot.index, dtype=str)[:, np.newaxis]
+    parts = [
+        "Grand Prix : <b>", events, "</b><br>",
+        "Pilote : <b>", names, "</b><br>",
+        "Positions gagnées/perdues : <b>", sign, _as_float_str(val, "N/A"), "</b><br>",
+        "Position départ : <b>", _as_int_str(gridpos.to_numpy(dtype=float), "N/A"), "</b><br>",
+        "Position arrivée : <b>", _as_int_str(arrpos.to_numpy(dtype=float), "N/A"), "</b>",
+    ]
+    hovertext = parts[0]
+    for part in parts[1:]:
+        hovertext = np.char.add(hovertext, part)
+    hovertext = np.broadcast_to(hovertext, val.shape)
+
+    return pivot, textvals.astype(object), hovertext.astype(object)
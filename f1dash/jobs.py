@@ -0,0 +1,43 @@
+# Exécution de tâches lentes (sessions FastF1...) hors du thread de la requête.
+# Une tâche est identifiée par une clé : tant qu'elle tourne ou a réussi, toute
+# nouvelle demande avec la même clé réutilise le même Future (single-flight).
+# Compatible pré-fork (gunicorn preload) : un worker forké repart d'un pool de threads
+# neuf et ne garde que les tâches terminées du maître.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class JobRunner:
+    def __init__(self, max_workers=2):
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="f1-job")
+        self._futures = {}
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # Les threads du pool n'existent pas dans l'enfant : une tâche en cours n'aboutirait jamais
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="f1-job")
+        self._futures = {k: f for k, f in self._futures.items() if f.done()}
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, *args, **kwargs):
+        """Lance `func` en arrière-plan, sauf si une tâche `key` est déjà en cours ou terminée."""
+        with self._lock:
+            future = self._futures.get(key)
+            # Une tâche en échec est relancée à la demande suivante
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._executor.submit(func, *args, **kwargs)
+                self._futures[key] = future
+            return future
+
+    def wait(self, timeout=None):
+        """Attend la fin des tâches en cours (au plus `timeout` secondes) ; True si plus rien ne tourne."""
+        with self._lock:
+            pending = [f for f in self._futures.values() if not f.done()]
+        return not wait(pending, timeout=timeout).not_done
+
+
+JOBS = JobRunner()
@@ -0,0 +1,84 @@
+# Magasin des tours rapides : tous les pilotes, toutes les courses (table "laps" de
+# f1dash.data, partitions saison/GP). Un tour est gardé s'il est chronométré, hors tours
+# d'entrée et de sortie des stands, sous drapeau vert, précis (IsAccurate), non annulé et
+# dans les 107 % du meilleur tour de la course (comme Laps.pick_quicklaps de FastF1).
+# Rempli par l'acquisition avec les autres tables de chaque GP ; pour les GP intégrés avant
+# l'apparition de la table, `backfill` charge les tours des seules courses manquantes.
+#
+#   python -m f1dash.laps --season 2025
+import argparse
+
+import pandas as pd
+
+from f1dash import data
+from f1dash.sessions import load_race_laps
+
+LAP_COLUMNS = ["Driver", "Team", "LapNumber", "Stint", "Compound", "TyreLife", "LapTime"]
+QUICK_THRESHOLD = 1.07
+
+
+def quick_laps(laps):
+    """Tours d'une course (fastf1.core.Laps ou DataFrame) -> tours rapides (LAP_COLUMNS), LapTime en secondes."""
+    df = pd.DataFrame(laps)
+    lap_time = pd.to_timedelta(df["LapTime"]).dt.total_seconds()
+    keep = lap_time.notna()
+    for column in ("PitInTime", "PitOutTime"):
+        if column in df.columns:
+            keep &= df[column].isna()
+    if "IsAccurate" in df.columns:
+        keep &= df["IsAccurate"].fillna(False).astype(bool)
+    if "Deleted" in df.columns:
+        keep &= ~df["Deleted"].fillna(False).astype(bool)
+    if "TrackStatus" in df.columns:
+        keep &= df["TrackStatus"].astype(str) == "1"  # drapeau vert sur tout le tour
+    if keep.any():
+        keep &= lap_time <= QUICK_THRESHOLD * lap_time[keep].min()
+    out = df.loc[keep, LAP_COLUMNS[:-1]].astype({"LapNumber": float, "Stint": float, "TyreLife": float})
+    return out.assign(LapTime=lap_time[keep].to_numpy()).reset_index(drop=True)
+
+
+def backfill(season, loader=load_race_laps):
+    """Écrit les tours rapides des GP de `season` présents dans results mais pas encore dans laps.
+
+    `loader(season, event)` -> tours de la course (par défaut la session FastF1, tours seuls).
+    Retourne les GP écrits ; un GP dont la session échoue sera retenté à l'appel suivant.
+    """
+    events = data.load_table("results", ["round", "event"], season=season).drop_duplicates("round")
+    done = set(data.partition_rounds("laps", season))
+    written = []
+    for rd, event in events.itertuples(index=False):
+        if rd in done:
+            continue
+        try:
+            laps = quick_laps(loader(season, event))
+        except Exception as e:
+            print(f"  ❌ Round {rd:02d} – {event} : tours indisponibles ({e})")
+            continue
+        data.write_partition("laps", laps.assign(round=rd, event=event), season, rd)
+        written.append(rd)
+        print(f"  ✅ Round {rd:02d} – {event} : {len(laps)} tours rapides")
+    return written
+
+
+def load_laps(season_list, columns=None):
+    """Tours rapides de plusieurs saisons mis bout à bout (colonne `season`), saisons sans tours ignorées."""
+    columns = LAP_COLUMNS + ["round", "event"] if columns is None else list(columns)
+    frames = [
+        data.load_table("laps", columns, season=s).assign(season=s)
+        for s in season_list if data.has_table("laps", s)
+    ]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns + ["season"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Complète le magasin des tours rapides (GP déjà intégrés)")
+    parser.add_argument("--season", type=int, required=True)
+    parser.add_argument("--data-dir", default=data.DATA_DIR)
+    args = parser.parse_args()
+    data.DATA_DIR = args.data_dir
+    written = backfill(args.season)
+    print(f"{len(written)} GP complétés : {written}" if written else "Aucun GP à compléter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# Mode live (week-end de course) : les agrégats de l'accueil (KPIs, podiums, points
+# cumulés de la bar race) sont tenus à jour GP par GP, sans redémarrer le serveur.
+#
+# Chaque saison suivie est initialisée une fois depuis le modèle partagé
+# (f1dash.features), puis `poll()` surveille les partitions results/driver_standings :
+# un GP complet qui apparaît (écrit par f1dash.acquisition ou par le rejeu ci-dessous)
+# est lu seul (load_table(..., rounds=[gp])) et replié dans les compteurs ; seules ses
+# lignes de points cumulés sont calculées, pour ajouter une image à la bar race.
+# Un GP réécrit, inséré avant le dernier GP connu, ou une table à plat modifiée
+# font repartir les agrégats du modèle reconstruit.
+#
+# Rejeu local (remplace le flux officiel pendant les essais) :
+#   python -m f1dash.live --source archive --data-dir data --season 2025 --start-round 10 --every 60
+import argparse
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from f1dash import data
+from f1dash.features import (
+    RESULTS_COLS, STANDINGS_COLS, build_cumul, data_version, fix_color_series, get_model, reset_model,
+)
+from f1dash.migrate import flight_rounds
+
+ENABLED = os.environ.get("F1_LIVE", "0") == "1"
+# Intervalle minimal entre deux scrutations de data/ (et période de rafraîchissement des pages)
+POLL_SECONDS = float(os.environ.get("F1_LIVE_POLL", "10"))
+
+# Tables qui doivent être écrites pour qu'un GP soit replié (results d'abord, classement ensuite)
+ROUND_TABLES = ("results", "driver_standings")
+
+
+class LiveSeason:
+    """Agrégats d'une saison, repliés GP par GP.
+
+    `history` associe chaque version des données vue par ce processus aux GP qu'elle
+    contient : une page construite à la version v n'a besoin que des GP ajoutés depuis.
+    """
+
+    def __init__(self, season):
+        self.season = season
+        # Tenu pendant un repli ; les lecteurs (callback live) le prennent aussi
+        self.lock = threading.Lock()
+        self._next_poll = 0.0
+        self._restart(get_model(season))
+
+    def _restart(self, model):
+        results = model.results
+        self.version = model.version
+        self.cumul_rows = {}  # GP replié -> lignes de points cumulés (une image de bar race)
+        self.history = {}
+        self.n_rows = 0
+        self.n_abandons = 0
+        self.events = set()
+        self.drivers = set()
+        self.teams = set()
+        self.wins = Counter()
+        self.podiums = Counter()
+        self.first_rows = {}  # pilote -> première ligne de résultat (photo, écurie)
+        self.team_colors = {}
+        self.pilot2team = {}
+        self._fold_results(results)
+        cumul = model.cumul
+        # Pilote -> points cumulés après le dernier GP
+        self.points = cumul.groupby("FullName", sort=False)["PointsCum"].last().to_dict()
+        self.max_points = float(cumul["PointsCum"].max()) if len(cumul) else 0.0
+        # Même ordre et mêmes couleurs d'écuries que la bar race complète (px groupe par ordre d'apparition)
+        self.team_order = list(cumul["TeamName"].dropna().unique())
+        self.team_color_map = dict(model.team_color_map)
+        self.rounds = sorted(int(r) for r in results["round"].dropna().unique())
+        self.stamps = {rd: self._stamp(rd) for rd in self.rounds}  # GP -> empreinte de ses partitions
+        self.co2_total = int(model.flights["CO2_tonnes"].sum())
+        self.history[self.version] = tuple(self.rounds)
+
+    def _stamp(self, rd):
+        return tuple(data.path_fingerprint(data.round_path(name, self.season, rd), max_age=0) for name in ROUND_TABLES)
+
+    def _fold_results(self, results):
+        """Ajoute des lignes de résultats (un GP ou la saison entière) aux compteurs."""
+        self.n_rows += len(results)
+        self.n_abandons += int((results["Status"] != "Finished").sum())
+        self.events.update(results["event"].dropna())
+        self.drivers.update(results["FullName"].dropna())
+        self.teams.update(results["TeamName"].dropna())
+        self.wins.update(results.loc[results["Position"] == 1, "FullName"])
+        self.podiums.update(results.loc[results["Position"] <= 3, "FullName"])
+        for row in results.drop_duplicates("FullName").to_dict("records"):
+            self.first_rows.setdefault(row["FullName"], row)
+        for team, color in results.drop_duplicates("TeamName")[["TeamName", "TeamColor"]].itertuples(index=False):
+            self.team_colors.setdefault(team, color)
+        self.pilot2team.update(results.drop_duplicates("FullName", keep="last").set_index("FullName")["TeamName"])
+
+    def _fold_round(self, rd):
+        results = data.load_table("results", RESULTS_COLS, season=self.season, rounds=[rd])
+        standings = data.load_table("driver_standings", STANDINGS_COLS, season=self.season, rounds=[rd])
+        results = results.assign(TeamColor=fix_color_series(results["TeamColor"]))
+        self._fold_results(results)
+        rows = build_cumul(standings, results)
+        rows["PointsCum"] = rows["PointsCum"] + rows["FullName"].map(self.points).fillna(0.0)
+        self.points.update(rows.set_index("FullName")["PointsCum"])
+        if len(rows):
+            self.max_points = max(self.max_points, float(rows["PointsCum"].max()))
+        for team, color in rows[["TeamName", "TeamColor"]].itertuples(index=False):
+            if team not in self.team_color_map:
+                self.team_color_map[team] = color
+                self.team_order.append(team)
+        self.cumul_rows[rd] = rows
+        self.rounds.append(rd)
+        self.stamps[rd] = self._stamp(rd)
+
+    def poll(self, force=False):
+        """Replie les GP apparus depuis le dernier passage ; True si les données ont changé.
+
+        Au plus une scrutation par POLL_SECONDS (quelques stat() de fichiers), quel que
+        soit le nombre de pages ouvertes.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if not force and now < self._next_poll:
+                return False
+            self._next_poll = now + POLL_SECONDS
+            # Scrutation déjà espacée de POLL_SECONDS : empreintes relues, sans FINGERPRINT_TTL
+            version = data_version(self.season, max_age=0)
+            if version == self.version:
+                return False
+            # Les tranches déjà décodées et le modèle partagé sont périmés : les autres
+            # pages les reconstruiront à leur prochain affichage
+            data.forget(self.season)
+            reset_model(self.season)
+            ready = set.intersection(*(set(data.partition_rounds(name, self.season)) for name in ROUND_TABLES))
+            new = sorted(ready - set(self.rounds))
+            unchanged = all(rd in ready and self._stamp(rd) == stamp for rd, stamp in self.stamps.items())
+            if not ready or not unchanged or (new and self.rounds and new[0] < self.rounds[-1]):
+                self._restart(get_model(self.season))
+                return True
+            for rd in new:
+                self._fold_round(rd)
+            flights = data.load_table("flights", ["CO2_tonnes"], season=self.season)
+            self.co2_total = int(flights["CO2_tonnes"].sum())
+            self.version = version
+            self.history[version] = tuple(self.rounds)
+            return True
+
+    def rounds_since(self, version):
+        """GP à ajouter à une page construite à `version` (None : version inconnue, tout renvoyer)."""
+        known = self.history.get(version)
+        if known is None:
+            return None
+        return [rd for rd in self.rounds if rd not in known]
+
+    def kpis(self):
+        """Mêmes indicateurs que l'accueil (dashboard.home_kpis), lus sur les compteurs."""
+        # Série dans l'ordre de première victoire, triée comme value_counts()
+        winners = pd.Series(self.wins, dtype="int64").sort_values(ascending=False)
+        best_winner = winners.idxmax()
+        best_row = self.first_rows[best_winner]
+        return dict(
+            nb_gp=len(self.events),
+            nb_pilotes=len(self.drivers),
+            nb_teams=len(self.teams),
+            pct_abandons=self.n_abandons / self.n_rows * 100,
+            co2_total=self.co2_total,
+            best_winner=best_winner,
+            nb_victoires=winners.max(),
+            best_winner_row=best_row,
+            best_winner_team=best_row["TeamName"],
+        )
+
+    def podium_count(self):
+        """Podiums par pilote, sous la forme produite par groupby('FullName').count()."""
+        count = pd.Series(self.podiums, dtype="int64", name="Position").sort_index()
+        count.index.name = "FullName"
+        return count.sort_values(ascending=False)
+
+
+_live = {}
+_live_lock = threading.Lock()
+
+
+def get_live(season=None):
+    """Agrégats live de `season` (la plus récente si None), initialisés au premier appel."""
+    season = data.latest_season() if season is None else int(season)
+    live = _live.get(season)
+    if live is None:
+        with _live_lock:
+            live = _live.get(season)
+            if live is None:
+                live = _live[season] = LiveSeason(season)
+    return live
+
+
+def replay(source, season, start_round=1, every=60.0, on_publish=None):
+    """Recopie GP par GP les partitions de `source` (un DATA_DIR partitionné) dans
+    DATA_DIR, comme le ferait l'acquisition pendant un week-end de course.
+    `on_publish(gp)` est appelé après chaque GP publié à partir de `start_round`."""
+    names = list(ROUND_TABLES) + [n for n in data.TABLES if n not in ROUND_TABLES]
+    folders = {n: os.path.join(source, data.TABLES[n], f"season={season}") for n in names}
+    # Destination toujours partitionnée, même si DATA_DIR est encore vide
+    targets = {n: os.path.join(data.dataset_dir(n), f"season={season}") for n in names}
+    rounds = sorted({
+        int(d.split("=", 1)[1])
+        for folder in folders.values() if os.path.isdir(folder)
+        for d in os.listdir(folder) if d.startswith("round=")
+    })
+    # Vols d'une source à l'ancienne disposition (un fichier par saison) : publiés avec
+    # leur GP d'arrivée, dans la disposition par GP qu'écrit l'acquisition
+    legacy_flights = os.path.join(folders["flights"], "part-0.parquet")
+    legs = None
+    if os.path.isfile(legacy_flights):
+        events = pd.read_parquet(folders["results"], columns=["round", "event"]).astype({"round": int})
+        legs = pd.read_parquet(legacy_flights)
+        legs = legs.assign(round=flight_rounds(legs, events))
+
+    def publish(rd):
+        for name in names:
+            src = os.path.join(folders[name], f"round={rd}", "part-0.parquet")
+            if os.path.isfile(src):
+                data.atomic_write(
+                    os.path.join(targets[name], f"round={rd}", "part-0.parquet"), lambda tmp: shutil.copyfile(src, tmp)
+                )
+        if legs is not None and (legs["round"] == rd).any():
+            data.write_partition("flights", legs[legs["round"] == rd], season, rd)
+
+    for rd in [r for r in rounds if r < start_round]:
+        publish(rd)
+    for rd in [r for r in rounds if r >= start_round]:
+        time.sleep(every)
+        publish(rd)
+        if on_publish is not None:
+            on_publish(rd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue une saison GP par GP dans data/ (flux local)")
+    parser.add_argument("--source", required=True, help="DATA_DIR partitionné contenant la saison complète")
+    parser.add_argument("--data-dir", default=data.DATA_DIR)
+    parser.add_argument("--season", type=int, required=True)
+    parser.add_argument("--start-round", type=int, default=1, help="GP publiés immédiatement : ceux avant celui-ci")
+    parser.add_argument("--every", type=float, default=60.0, help="secondes entre deux GP")
+    args = parser.parse_args()
+    data.DATA_DIR = args.data_dir
+    replay(args.source, args.season, args.start_round, args.every, on_publish=lambda rd: print(f"  🏁 Round {rd:02d} publié"))
+
+
+if __name__ == "__main__":
+    main()
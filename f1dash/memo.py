@@ -0,0 +1,89 @@
+# Cache mémoire borné (LRU) pour les layouts de pages et les figures déjà parsées.
+# Chaque entrée est pesée (taille JSON) : le cache évince les entrées les moins
+# récemment utilisées dès que le nombre d'entrées ou le budget mémoire est dépassé.
+import json
+import threading
+from collections import OrderedDict
+
+from plotly.utils import PlotlyJSONEncoder
+
+
+def json_size(value):
+    """Taille approximative en octets d'une figure ou d'un arbre de composants Dash."""
+    return len(json.dumps(value, cls=PlotlyJSONEncoder))
+
+
+class LRUCache:
+    def __init__(self, name, max_entries=64, max_bytes=64 * 2**20, sizeof=json_size):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # clé -> (valeur, taille)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        size = self.sizeof(value) if size is None else size
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return value  # trop gros pour le budget : servi sans être gardé
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def get_or_build(self, key, build, size=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, build(), size)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_MISSING = object()
+
+# Caches partagés du dashboard
+LAYOUT_CACHE = LRUCache("layouts", max_entries=32, max_bytes=64 * 2**20)
+FIGURE_CACHE = LRUCache("figures", max_entries=128, max_bytes=128 * 2**20)
+# Points bruts des nuages de l'Explorer (DataFrame), relus à chaque zoom en mode densité
+POINTS_CACHE = LRUCache("points", max_entries=16, max_bytes=64 * 2**20, sizeof=lambda df: int(df.memory_usage(deep=True).sum()))
+
+
+def cache_stats():
+    return {cache.name: cache.stats() for cache in (LAYOUT_CACHE, FIGURE_CACHE, POINTS_CACHE)}
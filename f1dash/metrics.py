@@ -0,0 +1,249 @@
+# Métriques de performance du serveur, au format texte Prometheus (route /metrics).
+# Histogrammes de durée des callbacks (display_page, update_pit_plot, update_duel), des
+# constructions de figures (load_or_create_figure), des sessions FastF1 et des lectures de
+# tables ; taille des réponses sérialisées par callback ou route ; hit/miss des caches
+# (LRU mémoire et cache disque des figures). Actif par défaut, F1_METRICS=0 pour le couper.
+#
+# Valeurs propres à chaque processus : sous gunicorn, chaque worker (forké) repart de zéro
+# et /metrics décrit le worker qui a répondu.
+#
+# Profilage à la demande : avec F1_PROFILE_DIR=<dossier>, une requête portant l'en-tête
+# `X-F1-Profile: 1` (ou `?profile=1`) est exécutée sous cProfile ; le rapport (.prof pour
+# pstats/snakeviz, .txt trié par temps cumulé) est écrit dans le dossier et son nom renvoyé
+# dans l'en-tête `X-F1-Profile-Report`.
+import bisect
+import contextlib
+import cProfile
+import functools
+import io
+import math
+import os
+import pstats
+import re
+import threading
+import time
+
+import flask
+
+ENABLED = os.environ.get("F1_METRICS", "1") == "1"
+PROFILE_DIR = os.environ.get("F1_PROFILE_DIR")
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1e3, 5e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7)
+
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name, doc, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # valeurs des labels -> [effectif par seuil..., +Inf, somme]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    def render(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        for values, series in items:
+            total = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                total += count
+                le = 'le="+Inf"' if bound == math.inf else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {total}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {series[-1]!r}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, doc, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labels, values)} {value}" for values, value in items]
+        return lines
+
+
+CALLBACK_SECONDS = Histogram("f1dash_callback_duration_seconds", "Durée des callbacks Dash (s)", ["callback"])
+FIGURE_SECONDS = Histogram("f1dash_figure_build_duration_seconds", "Construction d'une figure absente du cache (s)", ["figure"])
+SESSION_SECONDS = Histogram("f1dash_fastf1_session_load_duration_seconds", "Chargement d'une session FastF1 (s)")
+DATA_SECONDS = Histogram("f1dash_data_load_duration_seconds", "Lecture d'une tranche de table (s)", ["table"])
+PAYLOAD_BYTES = Histogram("f1dash_response_payload_bytes", "Taille des réponses sérialisées, avant compression (octets)", ["handler"], SIZE_BUCKETS)
+DISK_CACHE = Counter("f1dash_figure_disk_cache_requests_total", "Lectures du cache disque des figures", ["result"])
+
+
+def _after_fork():
+    # Un worker forké ne compte que ses propres requêtes, pas le préchargement du maître
+    for metric in _registry:
+        metric.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+@contextlib.contextmanager
+def timer(histogram, *label_values):
+    """Mesure la durée du bloc dans `histogram` (y compris si le bloc lève une exception)."""
+    if not ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - t0, *label_values)
+
+
+def timed_callback(name):
+    """Décorateur des callbacks : durée dans CALLBACK_SECONDS, nom repris pour la taille de la réponse."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if flask.has_request_context():
+                flask.g.f1_handler = name
+            with timer(CALLBACK_SECONDS, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _cache_lines():
+    from f1dash.memo import cache_stats
+
+    stats = cache_stats()
+    lines = ["# HELP f1dash_cache_requests_total Lectures des caches mémoire (LRU)", "# TYPE f1dash_cache_requests_total counter"]
+    for cache, s in stats.items():
+        lines.append(f'f1dash_cache_requests_total{{cache="{cache}",result="hit"}} {s["hits"]}')
+        lines.append(f'f1dash_cache_requests_total{{cache="{cache}",result="miss"}} {s["misses"]}')
+    for metric, key, kind, doc in (
+        ("f1dash_cache_evictions_total", "evictions", "counter", "Entrées évincées des caches mémoire"),
+        ("f1dash_cache_entries", "entries", "gauge", "Entrées des caches mémoire"),
+        ("f1dash_cache_bytes", "bytes", "gauge", "Taille des caches mémoire (octets JSON)"),
+    ):
+        lines += [f"# HELP {metric} {doc}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{cache}"}} {s[key]}' for cache, s in stats.items()]
+    return lines
+
+
+def render():
+    lines = [line for metric in _registry for line in metric.render()]
+    return "\n".join(lines + _cache_lines()) + "\n"
+
+
+def metrics_route():
+    return flask.Response(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _handler():
+    """Label d'une requête : nom du callback (timed_callback), sinon motif de la route."""
+    handler = flask.g.get("f1_handler")
+    if handler is None:
+        rule = flask.request.url_rule
+        handler = rule.rule if rule is not None else "inconnue"
+    return handler
+
+
+class ProfilingMiddleware:
+    """Profile (cProfile) une requête marquée, une seule à la fois ; les autres passent telles quelles."""
+
+    def __init__(self, app, folder):
+        self.app = app
+        self.folder = folder
+        self._busy = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        wanted = environ.get("HTTP_X_F1_PROFILE") == "1" or "profile=1" in environ.get("QUERY_STRING", "").split("&")
+        if not wanted or not self._busy.acquire(blocking=False):
+            return self.app(environ, start_response)
+        try:
+            stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{re.sub(r'[^A-Za-z0-9]+', '_', environ.get('PATH_INFO', '')).strip('_') or 'root'}"
+
+            def start(status, headers, exc_info=None):
+                return start_response(status, headers + [("X-F1-Profile-Report", stem)], exc_info)
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                result = self.app(environ, start)
+                try:
+                    body = list(result)  # le corps est produit ici, donc profilé lui aussi
+                finally:
+                    if hasattr(result, "close"):
+                        result.close()
+            finally:
+                profiler.disable()
+            os.makedirs(self.folder, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.folder, stem + ".prof"))
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(50)
+            with open(os.path.join(self.folder, stem + ".txt"), "w", encoding="utf-8") as f:
+                f.write(f"{environ.get('REQUEST_METHOD')} {environ.get('PATH_INFO')}\n{report.getvalue()}")
+            return body
+        finally:
+            self._busy.release()
+
+
+def install(server):
+    """Route /metrics, taille des réponses et profilage à la demande sur `server` (Flask).
+
+    À appeler après f1dash.transport.install : Flask exécute les after_request dans
+    l'ordre inverse de leur déclaration, la taille est donc relevée avant compression.
+    """
+    server.add_url_rule("/metrics", view_func=metrics_route)
+
+    @server.after_request
+    def record_payload(response):
+        if not (response.direct_passthrough or response.is_streamed):
+            PAYLOAD_BYTES.observe(response.calculate_content_length() or 0, _handler())
+        return response
+
+    if PROFILE_DIR:
+        server.wsgi_app = ProfilingMiddleware(server.wsgi_app, PROFILE_DIR)
+    return record_payload
@@ -0,0 +1,87 @@
+# Conversion des fichiers à plat (<table>_<saison>.parquet) vers la disposition
+# partitionnée <table>/season=<saison>/round=<gp>/part-0.parquet lue par f1dash.data.
+# Les fichiers d'origine ne sont pas supprimés : le dossier partitionné prend le pas
+# dès qu'il existe. Les segments de vol, sans colonne round, sont rangés par GP
+# d'arrivée (comme les écrit f1dash.acquisition) ; un ancien fichier de saison
+# flightlegs/season=<saison>/part-0.parquet est redécoupé de la même façon.
+#
+#   python -m f1dash.migrate --data-dir data
+import argparse
+import glob
+import os
+
+import pandas as pd
+
+from f1dash import data
+
+
+def flight_rounds(legs, events):
+    """GP d'arrivée de chaque segment (`event_to` -> round de `events`, table round/event) ; NaN si inconnu."""
+    by_event = events.drop_duplicates("event").set_index("event")["round"]
+    return legs["event_to"].map(by_event)
+
+
+def _write_flights(legs, season, events, skip=()):
+    """Écrit les segments par GP d'arrivée (GP de `skip` ignorés) ; retourne le nombre de partitions."""
+    legs = legs.assign(round=flight_rounds(legs, events))
+    lost = int(legs["round"].isna().sum())
+    if lost:
+        print(f"  ⚠️ flights {season} : {lost} segment(s) vers un GP absent de results, ignoré(s)")
+    written = 0
+    for rnd, part in legs.dropna(subset=["round"]).groupby("round", sort=True):
+        if int(rnd) not in skip:
+            data.write_partition("flights", part, season, int(rnd))
+            written += 1
+    return written
+
+
+def split_flights(season):
+    """Redécoupe le fichier de saison des vols (ancienne disposition) en partitions par GP
+    d'arrivée, puis le supprime ; les GP déjà écrits par l'acquisition sont gardés."""
+    path = os.path.join(data.dataset_dir("flights"), f"season={season}", "part-0.parquet")
+    if not os.path.isfile(path):
+        return 0
+    events = data.read_table("results", ["round", "event"], season=season)
+    written = _write_flights(pd.read_parquet(path), season, events, skip=set(data.partition_rounds("flights", season)))
+    os.remove(path)
+    return written
+
+
+def migrate_table(name):
+    """Partitionne tous les fichiers à plat de `name` ; retourne le nombre de partitions écrites."""
+    prefix = os.path.join(data.DATA_DIR, f"{data.TABLES[name]}_")
+    written = 0
+    for path in sorted(glob.glob(f"{glob.escape(prefix)}*.parquet")):
+        season = path[len(prefix):-len(".parquet")]
+        if not season.isdigit():
+            continue
+        df = pd.read_parquet(path)
+        if name == "flights" and "round" not in df.columns:
+            events = data.read_table("results", ["round", "event"], season=int(season))
+            written += _write_flights(df, int(season), events)
+            continue
+        for rnd, part in df.groupby("round", sort=True):
+            data.write_partition(name, part, int(season), int(rnd))
+            written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partitionne data/ par saison et GP")
+    parser.add_argument("--data-dir", default=data.DATA_DIR)
+    args = parser.parse_args()
+    data.DATA_DIR = args.data_dir
+    # results d'abord (premier de data.TABLES) : les vols y trouvent le GP de chaque segment
+    for name in data.TABLES:
+        if data.is_partitioned(name):
+            print(f"{name:<18} déjà partitionnée, ignorée")
+            continue
+        print(f"{name:<18} {migrate_table(name)} partitions")
+    for season in data.seasons("flights"):
+        written = split_flights(season)
+        if written:
+            print(f"flights {season}      fichier de saison redécoupé en {written} partitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+# Index des arrêts aux stands par GP, pour le graphique "Stratégie de pneus".
+# Les agrégats (arrêts par écurie et pneu monté, total par écurie) sont calculés
+# en une seule passe groupby pour tous les GP : le callback ne fait plus qu'un
+# accès dictionnaire.
+def build_pit_index(pits):
+    """dict GP -> DataFrame (TeamName, CompoundIn, NbArrets, TeamTotal), trié pour l'affichage."""
+    counts = pits.groupby(["event", "TeamName", "CompoundIn"]).size().reset_index(name="NbArrets")
+    counts["TeamTotal"] = counts.groupby(["event", "TeamName"])["NbArrets"].transform("sum")
+    return {
+        event: (
+            bar_data
+            .drop(columns="event")
+            .sort_values(["TeamTotal", "TeamName"], ascending=[False, True])
+            .reset_index(drop=True)
+        )
+        for event, bar_data in counts.groupby("event", sort=False)
+    }
@@ -0,0 +1,261 @@
+# Projection PCA de la page Explorer, apprise sur toute l'archive et tenue à jour GP par GP.
+# Chaque résultat de course devient un vecteur de caractéristiques (départ, arrivée, points,
+# qualification, nombre d'arrêts, répartition des pneus montés, météo moyenne de la course),
+# standardisé puis appris par IncrementalPCA, par lots (F1_PCA_BATCH lignes) : l'archive
+# n'est jamais chargée en une seule matrice.
+#
+# L'état appris (standardisation, composantes, GP déjà vus avec leur empreinte) est gardé
+# dans `data/projection/model.pkl`, les coordonnées projetées dans
+# `data/projection/pca_<saison>.parquet`. À chaque rafraîchissement des données, seuls les
+# GP nouveaux sont appris (partial_fit) et projetés ; les coordonnées déjà calculées sont
+# reprises telles quelles (un GP réécrit est seulement reprojeté). Le signe des composantes
+# est conservé d'une mise à jour à l'autre. `refit()` repart de zéro sur toute l'archive et
+# corrige la dérive des composantes : `python -m f1dash.projection --refit`.
+import argparse
+import hashlib
+import os
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+
+from f1dash import data
+
+FEATURES = [
+    "GridPosition", "Position", "Points", "QualiPosition", "PitStops",
+    "SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET",
+    "AirTemp", "TrackTemp", "Humidity", "Rainfall",
+]
+COMPOUNDS = ["SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"]
+WEATHER = ["AirTemp", "TrackTemp", "Humidity", "Rainfall"]
+KEY_COLS = ["season", "round", "event", "FullName", "TeamName"]
+# Tables lues par les caractéristiques : leur empreinte par GP signale un GP nouveau ou réécrit
+FEATURE_TABLES = ("results", "qualifying", "pitstops", "weather")
+
+N_COMPONENTS = 2
+BATCH_ROWS = int(os.environ.get("F1_PCA_BATCH", "5000"))
+STORE_DIRNAME = "projection"
+
+_lock = threading.Lock()
+_state = None  # état appris, relu depuis model.pkl au premier usage
+_state_stamp = None  # (taille, mtime) de model.pkl quand _state a été lu ou écrit
+
+
+def _folder():
+    return os.path.join(data.DATA_DIR, STORE_DIRNAME)
+
+
+def race_features(season, rounds=None):
+    """Résultats des GP `rounds` (tous si None) de `season` : KEY_COLS + FEATURES (NaN si la table source manque)."""
+    res = data.read_table(
+        "results", ["Abbreviation", "FullName", "TeamName", "GridPosition", "Position", "Points", "round", "event"],
+        season=season, rounds=rounds,
+    )
+    out = res.assign(season=season)
+    keys = ["round", "Abbreviation"]
+    if data.has_table("qualifying", season):
+        quali = data.read_table("qualifying", ["Abbreviation", "Position", "round"], season=season, rounds=rounds)
+        quali = quali.rename(columns={"Position": "QualiPosition"}).drop_duplicates(keys)
+        out = out.merge(quali, on=keys, how="left")
+    if data.has_table("pitstops", season):
+        pits = data.read_table("pitstops", ["Driver", "CompoundOut", "round"], season=season, rounds=rounds)
+        pits = pits.rename(columns={"Driver": "Abbreviation"})
+        mix = pd.crosstab([pits["round"], pits["Abbreviation"]], pits["CompoundOut"]).reindex(columns=COMPOUNDS, fill_value=0)
+        mix = mix.div(mix.sum(axis=1).replace(0, 1), axis=0)  # part des arrêts sur chaque pneu
+        stops = pits.groupby(keys).size().rename("PitStops").to_frame().join(mix)
+        out = out.merge(stops.reset_index(), on=keys, how="left")
+        out[["PitStops", *COMPOUNDS]] = out[["PitStops", *COMPOUNDS]].fillna(0.0)  # aucun arrêt
+    if data.has_table("weather", season):
+        weather = data.read_table("weather", [*WEATHER, "round"], season=season, rounds=rounds)
+        weather = weather.astype({"Rainfall": float}).groupby("round")[WEATHER].mean()
+        out = out.merge(weather.reset_index(), on="round", how="left")
+    out = out.reindex(columns=KEY_COLS + FEATURES)
+    out[FEATURES] = out[FEATURES].astype(float)
+    return out
+
+
+def _round_fingerprints(season):
+    """GP de `season` -> empreinte de leurs données (par partition ; par fichier à plat sinon)."""
+    rounds = data.partition_rounds("results", season)
+    if not rounds:
+        rounds = sorted(int(r) for r in data.read_table("results", ["round"], season=season)["round"].unique())
+    out = {}
+    for rd in rounds:
+        h = hashlib.sha1()
+        for name in FEATURE_TABLES:
+            path = data.round_path(name, season, rd) if data.is_partitioned(name) else data.table_path(name, season)
+            h.update(data.path_fingerprint(path).encode())
+        out[rd] = h.hexdigest()
+    return out
+
+
+def _new_state():
+    from sklearn.decomposition import IncrementalPCA  # import lourd, seulement pour apprendre
+    from sklearn.preprocessing import StandardScaler
+
+    return {"features": FEATURES, "scaler": StandardScaler(), "ipca": IncrementalPCA(n_components=N_COMPONENTS), "rounds": {}}
+
+
+def _stamp():
+    try:
+        st = os.stat(os.path.join(_folder(), "model.pkl"))
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _load_state():
+    import sklearn
+
+    try:
+        with open(os.path.join(_folder(), "model.pkl"), "rb") as f:
+            state = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    # Autres caractéristiques ou autre version de scikit-learn : on réapprend
+    if state.get("features") != FEATURES or state.get("sklearn") != sklearn.__version__:
+        return None
+    return state
+
+
+def _save_state(state):
+    import sklearn
+
+    state["sklearn"] = sklearn.__version__
+
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f)
+
+    data.atomic_write(os.path.join(_folder(), "model.pkl"), write)
+
+
+def _scaled(state, features):
+    scaled = state["scaler"].transform(features[FEATURES].to_numpy())
+    return np.nan_to_num(scaled, nan=0.0)  # valeur manquante -> moyenne apprise
+
+
+def _learn(state, batches):
+    """partial_fit de la standardisation puis de la PCA sur les nouvelles lignes, par lots."""
+    new = pd.concat(batches, ignore_index=True)
+    if len(new) < N_COMPONENTS:
+        return 0
+    state["scaler"].partial_fit(new[FEATURES].to_numpy())
+    ipca = state["ipca"]
+    before = getattr(ipca, "components_", None)
+    before = None if before is None else before.copy()
+    scaled = _scaled(state, new)
+    # Lots de taille voisine de BATCH_ROWS, aucun plus petit que le nombre de composantes
+    for batch in np.array_split(scaled, max(1, len(scaled) // max(BATCH_ROWS, N_COMPONENTS))):
+        ipca.partial_fit(batch)
+    if before is not None:
+        flip = np.sign(np.sum(before * ipca.components_, axis=1))
+        ipca.components_ *= np.where(flip < 0, -1.0, 1.0)[:, np.newaxis]
+    return len(new)
+
+
+def _projection_path(season):
+    return os.path.join(_folder(), f"pca_{season}.parquet")
+
+
+def _read_projection(season):
+    path = _projection_path(season)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=KEY_COLS + ["PC1", "PC2"])
+    return pd.read_parquet(path)
+
+
+def update(season_list=None):
+    """Apprend et projette les GP nouveaux (ou réécrits) de `season_list` (toutes les saisons si None).
+
+    Retourne le nombre de lignes apprises (0 si rien n'a changé).
+    """
+    global _state, _state_stamp
+    season_list = data.seasons() if season_list is None else list(season_list)
+    with _lock:
+        stamp = _stamp()
+        # État relu si un autre worker l'a mis à jour entre-temps (sinon ses GP seraient réappris)
+        state = _state if _state is not None and stamp == _state_stamp else (_load_state() or _new_state())
+        _state, _state_stamp = state, stamp
+        pending = {}  # saison -> (GP nouveaux, réécrits, disparus, empreintes, caractéristiques des nouveaux)
+        for season in season_list:
+            current = _round_fingerprints(season)
+            known = {rd: fp for (s, rd), fp in state["rounds"].items() if s == season}
+            new = [rd for rd in current if rd not in known]
+            rewritten = [rd for rd in current if rd in known and known[rd] != current[rd]]
+            removed = [rd for rd in known if rd not in current]
+            if new or rewritten or removed:
+                fresh = race_features(season, new) if new else None
+                pending[season] = (new, rewritten, removed, current, fresh)
+        if not pending:
+            return 0
+        # Toutes les nouvelles lignes apprises avant de projeter : au premier passage, toute
+        # l'archive est projetée avec les mêmes composantes
+        learned = _learn(state, [p[4] for p in pending.values() if p[4] is not None])
+        if not hasattr(state["ipca"], "components_"):
+            return 0  # pas encore assez de lignes pour apprendre deux composantes
+        for season, (new, rewritten, removed, current, fresh) in pending.items():
+            frames = [f for f in (fresh, race_features(season, rewritten) if rewritten else None) if f is not None]
+            projection = _read_projection(season)
+            projection = projection[~projection["round"].isin(new + rewritten + removed)]
+            if frames:
+                rows = pd.concat(frames, ignore_index=True)
+                coords = state["ipca"].transform(_scaled(state, rows))
+                rows = rows[KEY_COLS].assign(PC1=coords[:, 0], PC2=coords[:, 1])
+                projection = pd.concat([projection, rows], ignore_index=True) if len(projection) else rows
+            projection = projection.sort_values("round", kind="stable", ignore_index=True)
+            data.atomic_write(_projection_path(season), lambda tmp: projection.to_parquet(tmp, index=False))
+            for rd in removed:
+                del state["rounds"][(season, rd)]
+            state["rounds"].update({(season, rd): current[rd] for rd in new + rewritten})
+        _save_state(state)
+        _state_stamp = _stamp()
+        return learned
+
+
+def refit(season_list=None):
+    """Oublie l'état appris et réapprend toute l'archive."""
+    global _state, _state_stamp
+    with _lock:
+        _state, _state_stamp = None, None
+        for path in [os.path.join(_folder(), "model.pkl")] + [_projection_path(s) for s in data.seasons()]:
+            if os.path.exists(path):
+                os.remove(path)
+    return update(season_list)
+
+
+def state_version():
+    """Empreinte de l'état appris après mise à jour ("absent" tant que rien n'est appris) :
+    change dès qu'un GP est appris ou réappris, quelle que soit sa saison."""
+    update()
+    return data.path_fingerprint(os.path.join(_folder(), "model.pkl"), max_age=0)
+
+
+def season_projection(season):
+    """Coordonnées (KEY_COLS, PC1, PC2) des résultats de `season`, après mise à jour de la projection."""
+    update()
+    return _read_projection(season)
+
+
+def explained_variance_ratio():
+    """Part de variance expliquée par chaque composante (None si rien n'a encore été appris)."""
+    with _lock:
+        ipca = _state["ipca"] if _state is not None else None
+    return getattr(ipca, "explained_variance_ratio_", None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Met à jour la projection PCA de l'Explorer")
+    parser.add_argument("--data-dir", default=data.DATA_DIR)
+    parser.add_argument("--refit", action="store_true", help="oublie l'état appris et réapprend toute l'archive")
+    args = parser.parse_args()
+    data.DATA_DIR = args.data_dir
+    learned = refit() if args.refit else update()
+    ratio = explained_variance_ratio()
+    variance = "" if ratio is None else " ; variance expliquée " + ", ".join(f"{r:.1%}" for r in ratio)
+    print(f"{learned} résultats appris{variance}")
+
+
+if __name__ == "__main__":
+    main()
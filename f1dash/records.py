@@ -0,0 +1,111 @@
+# Moteur des records (page Records) : séries consécutives et totaux pour n'importe quel
+# critère de course (points, podium, arrivée, top 10, devant son coéquipier), par pilote
+# ou par écurie, sur une saison ou sur plusieurs mises bout à bout.
+# Les séries sont des longueurs de plages (run-length) calculées en une passe sur les
+# tableaux triés (pilote, saison, GP) : une plage commence là où le critère devient vrai
+# ou là où l'entité change, sa longueur est un simple comptage par identifiant de plage.
+import numpy as np
+import pandas as pd
+
+from f1dash.data import load_table
+
+DNF_STATUSES = ("Retired", "Disqualified")
+
+RECORD_COLS = ["FullName", "TeamName", "TeamColor", "GridPosition", "Position", "Points", "Status", "round", "event"]
+
+
+def beat_teammate(results):
+    """Vrai si le pilote finit devant tous ses coéquipiers classés de la même course."""
+    race = [c for c in ("season", "round") if c in results.columns] + ["TeamName"]
+    grouped = results.groupby(race, sort=False)["Position"]
+    best, classified = grouped.transform("min"), grouped.transform("count")
+    return (results["Position"] == best) & (classified >= 2)
+
+
+# Critère -> fonction (résultats -> booléens ligne à ligne)
+PREDICATES = {
+    "points": lambda r: r["Points"] > 0,
+    "podium": lambda r: r["Position"] <= 3,
+    "top10": lambda r: r["Position"] <= 10,
+    "finish": lambda r: ~r["Status"].isin(DNF_STATUSES),
+    "dnf": lambda r: r["Status"].isin(DNF_STATUSES),
+    "beat_teammate": beat_teammate,
+}
+
+ENTITIES = {"driver": "FullName", "team": "TeamName"}
+
+
+def _flags(results, predicate):
+    flag = PREDICATES[predicate](results) if isinstance(predicate, str) else predicate(results)
+    return np.asarray(flag, dtype=bool)
+
+
+def _races(results, predicate, by):
+    """(entité, saison, GP, event, critère) triés par entité puis calendrier ; une ligne par
+    course et par entité (une écurie remplit le critère si l'un de ses pilotes le remplit)."""
+    key = ENTITIES.get(by, by)
+    frame = pd.DataFrame({
+        "entity": results[key].to_numpy(),
+        "season": results["season"].to_numpy() if "season" in results.columns else 0,
+        "round": results["round"].to_numpy(),
+        "event": results["event"].to_numpy(),
+        "flag": _flags(results, predicate),
+    })
+    if by == "team":
+        frame = frame.groupby(["entity", "season", "round"], as_index=False, sort=False).agg(event=("event", "first"), flag=("flag", "any"))
+    return frame.sort_values(["entity", "season", "round"], kind="stable", ignore_index=True)
+
+
+def longest_streaks(results, predicate="points", by="driver"):
+    """Plus longue série de courses consécutives remplissant `predicate` (nom de PREDICATES ou
+    fonction), par pilote (`by="driver"`) ou écurie (`by="team"`).
+
+    DataFrame indexé par entité (ordre alphabétique) : streak, et pour la série retenue
+    (la première en cas d'égalité) start_season, start_event, end_season, end_event.
+    Les entités sans aucune course remplissant le critère ont une série de 0.
+    """
+    races = _races(results, predicate, by)
+    codes, entities = pd.factorize(races["entity"], sort=True)
+    flag = races["flag"].to_numpy()
+    same = np.zeros(len(flag), dtype=bool)
+    same[1:] = codes[1:] == codes[:-1]
+    prev = np.zeros(len(flag), dtype=bool)
+    prev[1:] = flag[:-1]
+    starts = np.flatnonzero(flag & ~(prev & same))
+    run_of_row = np.cumsum(flag & ~(prev & same)) - 1
+    lengths = np.bincount(run_of_row[flag], minlength=len(starts))
+    run_entity = codes[starts]
+    # Meilleure plage par entité : tri (entité, longueur décroissante, ordre d'apparition)
+    order = np.lexsort((starts, -lengths, run_entity))
+    first = order[np.unique(run_entity[order], return_index=True)[1]]
+    ends = starts + lengths - 1
+
+    out = pd.DataFrame(index=pd.Index(entities, name=ENTITIES.get(by, by)))
+    out["streak"] = 0
+    for column in ("start_season", "start_event", "end_season", "end_event"):
+        out[column] = None
+    best = entities[run_entity[first]]
+    out.loc[best, "streak"] = lengths[first]
+    out.loc[best, "start_season"] = races["season"].to_numpy()[starts[first]]
+    out.loc[best, "start_event"] = races["event"].to_numpy()[starts[first]]
+    out.loc[best, "end_season"] = races["season"].to_numpy()[ends[first]]
+    out.loc[best, "end_event"] = races["event"].to_numpy()[ends[first]]
+    return out
+
+
+def tally(results, predicate, by="driver"):
+    """Nombre de courses remplissant `predicate` par entité (entités à 0 exclues), ordre alphabétique."""
+    races = _races(results, predicate, by)
+    counts = races["flag"].groupby(races["entity"].rename(ENTITIES.get(by, by))).sum()
+    return counts[counts > 0].astype(np.int64).rename(predicate if isinstance(predicate, str) else None)
+
+
+def top(values, n):
+    """Les `n` plus grandes valeurs, égalités départagées par ordre alphabétique de l'index."""
+    return values.sort_index(kind="stable").sort_values(ascending=False, kind="stable").head(n)
+
+
+def load_results(season_list):
+    """Résultats de plusieurs saisons mis bout à bout (colonne `season`), pour les records toutes saisons."""
+    frames = [load_table("results", RECORD_COLS, season=s).assign(season=s) for s in season_list]
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,79 @@
+# Nuages de points de l'Explorer sur de gros volumes (archive de plusieurs saisons) :
+#   - moins de WEBGL_ROWS points : un marqueur SVG par point (px.scatter, comme avant) ;
+#   - jusqu'à DENSITY_ROWS : mêmes traces en WebGL (scattergl), dessinées par le GPU ;
+#   - au-delà : densité 2D agrégée côté serveur (np.histogram2d, au plus BINS x BINS
+#     cases) envoyée comme une heatmap ; un zoom redemande les cases de la zone visible
+#     (callback update_explorer), le navigateur ne reçoit jamais plus de BINS² valeurs.
+# Seuils réglables par F1_WEBGL_ROWS, F1_DENSITY_ROWS et F1_DENSITY_BINS.
+import os
+
+import numpy as np
+
+WEBGL_ROWS = int(os.environ.get("F1_WEBGL_ROWS", "1000"))
+DENSITY_ROWS = int(os.environ.get("F1_DENSITY_ROWS", "10000"))
+BINS = int(os.environ.get("F1_DENSITY_BINS", "80"))
+
+
+def render_mode(n_rows):
+    """"svg", "webgl" ou "density" selon le nombre de points à dessiner."""
+    if n_rows > DENSITY_ROWS:
+        return "density"
+    return "webgl" if n_rows > WEBGL_ROWS else "svg"
+
+
+def _axis(values, bounds):
+    """(bornes, nombre de cases) d'un axe : toute l'étendue des valeurs si `bounds` est None.
+
+    Jamais plus de cases que de valeurs distinctes : des positions entières 1..20 donnent
+    20 cases, une par position, au lieu de bandes vides entre deux entiers.
+    """
+    finite = values[np.isfinite(values)]
+    if bounds is None:
+        bounds = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+    low, high = sorted(bounds)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    inside = finite[(finite >= low) & (finite <= high)]
+    return (low, high), int(min(BINS, max(1, len(np.unique(inside)))))
+
+
+def density(x, y, x_range=None, y_range=None):
+    """Effectifs par case de la zone (x_range, y_range) (tout le nuage si None).
+
+    Retourne (x des centres, y des centres, effectifs en lignes y / colonnes x, None pour
+    une case vide), prêts pour go.Heatmap.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    (x_range, x_bins), (y_range, y_bins) = _axis(x, x_range), _axis(y, y_range)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=[x_bins, y_bins], range=[x_range, y_range])
+    z = counts.T.astype(np.int64).astype(object)
+    z[z == 0] = None  # case vide transparente
+    return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, z.tolist()
+
+
+def _relayout_range(relayout, axis):
+    """Plage demandée pour `axis` ("xaxis"...) : (bas, haut), None (autorange) ou False (inchangée)."""
+    if relayout.get(f"{axis}.autorange"):
+        return None
+    if f"{axis}.range[0]" in relayout and f"{axis}.range[1]" in relayout:
+        return (float(relayout[f"{axis}.range[0]"]), float(relayout[f"{axis}.range[1]"]))
+    if f"{axis}.range" in relayout:
+        return tuple(float(v) for v in relayout[f"{axis}.range"])
+    return False
+
+
+def zoom_ranges(current, relayout):
+    """Plages {"x": ..., "y": ...} après l'événement relayoutData `relayout` d'un graphique.
+
+    `current` : plages en cours (None = étendue complète). Retourne None si l'événement ne
+    touche aucun axe (redimensionnement, changement d'outil...).
+    """
+    current = dict(current or {"x": None, "y": None})
+    changed = False
+    for key, axis in (("x", "xaxis"), ("y", "yaxis")):
+        value = _relayout_range(relayout or {}, axis)
+        if value is not False:
+            current[key] = value
+            changed = True
+    return current if changed else None
@@ -0,0 +1,35 @@
+# Chargement des sessions FastF1, limité aux données réellement affichées.
+# Le backend est remplaçable (set_backend) : les benchmarks et tests locaux
+# peuvent fournir des tours sans accès réseau.
+import os
+
+from f1dash.metrics import SESSION_SECONDS, timer
+
+FASTF1_CACHE_DIR = os.environ.get("F1_FASTF1_CACHE", ".cache_f1")
+
+_backend = None
+
+
+def fastf1_race_laps(year, event):
+    """Tours de la course via FastF1 : ni télémétrie, ni météo, ni messages de course."""
+    import fastf1  # import lourd, uniquement quand une session doit être chargée
+
+    os.makedirs(FASTF1_CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
+    # Niveau de log plutôt que redirect_stdout : la redirection est globale au
+    # processus et avalerait la sortie des autres threads du serveur.
+    fastf1.set_log_level("ERROR")
+    session = fastf1.get_session(year, event, "R")
+    session.load(laps=True, telemetry=False, weather=False, messages=False)
+    return session.laps
+
+
+def set_backend(func):
+    """Remplace le chargeur de tours : func(year, event) -> fastf1.core.Laps."""
+    global _backend
+    _backend = func
+
+
+def load_race_laps(year, event):
+    with timer(SESSION_SECONDS):
+        return (_backend or fastf1_race_laps)(year, event)
@@ -0,0 +1,192 @@
+# Télémétrie voiture (vitesse, accélérateur, frein, rapport) par tour, pour la page Télémétrie.
+# Une session FastF1 n'est chargée qu'une fois : toute sa télémétrie est découpée par tour
+# puis gardée dans un cache Parquet local, colonne par colonne :
+#   data/telemetry/season=<saison>/round=<gp>/session=<R|Q>/driver=<abrégé>.parquet
+# avec un row group par tour (la lecture d'un tour ne décode que son row group), plus
+# laps.parquet, l'index des tours (écrit en dernier : sa présence signale une session prête).
+# Les traces sont ensuite réduites par Largest-Triangle-Three-Buckets (lttb) à la largeur du
+# graphique en pixels : un zoom relit la plage de distance visible, à pleine résolution,
+# et la réduit de nouveau.
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from f1dash import data
+from f1dash.metrics import SESSION_SECONDS, timer
+from f1dash.sessions import FASTF1_CACHE_DIR
+
+CHANNELS = ["Speed", "Throttle", "Brake", "nGear"]
+SESSIONS = {"R": "Course", "Q": "Qualifications"}
+STORE_DIRNAME = "telemetry"
+
+# Types du cache : float32 suffit à la précision des capteurs, et divise la taille par deux
+SCHEMA = pa.schema([
+    ("LapNumber", pa.int16()), ("Distance", pa.float32()), ("Speed", pa.float32()),
+    ("Throttle", pa.float32()), ("Brake", pa.uint8()), ("nGear", pa.int8()),
+])
+
+_backend = None
+
+
+def fastf1_session_telemetry(year, event, session):
+    """(tours, télémétrie) de la session via FastF1.
+
+    tours : Driver, LapNumber, LapTime, LapStartTime, Time (fin du tour) ;
+    télémétrie : Driver, SessionTime + CHANNELS, échantillons de toute la session.
+    """
+    import fastf1  # import lourd, uniquement quand une session doit être chargée
+
+    os.makedirs(FASTF1_CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
+    fastf1.set_log_level("ERROR")
+    ses = fastf1.get_session(year, event, session)
+    ses.load(laps=True, telemetry=True, weather=False, messages=False)
+    laps = pd.DataFrame(ses.laps[["Driver", "DriverNumber", "LapNumber", "LapTime", "LapStartTime", "Time"]])
+    number_to_driver = laps.drop_duplicates("DriverNumber").set_index("DriverNumber")["Driver"]
+    car = pd.concat([
+        pd.DataFrame(ses.car_data[number][["SessionTime", *CHANNELS]]).assign(Driver=number_to_driver[number])
+        for number in ses.drivers if number in ses.car_data and number in number_to_driver.index
+    ], ignore_index=True)
+    return laps.drop(columns="DriverNumber"), car
+
+
+def set_backend(func):
+    """Remplace le chargeur de télémétrie : func(year, event, session) -> (tours, télémétrie)."""
+    global _backend
+    _backend = func
+
+
+def session_dir(season, round, session):
+    return os.path.join(data.DATA_DIR, STORE_DIRNAME, f"season={season}", f"round={round}", f"session={session}")
+
+
+def _driver_path(season, round, session, driver):
+    return os.path.join(session_dir(season, round, session), f"driver={driver}.parquet")
+
+
+def split_laps(laps, car):
+    """Télémétrie de session -> (Driver, LapNumber, Distance, CHANNELS), triée par pilote, tour, temps.
+
+    Chaque échantillon est rattaché au tour dont il tombe entre le début et la fin
+    (recherche dichotomique sur les débuts de tour de son pilote) ; la distance est
+    intégrée depuis le début du tour (vitesse x durée, comme Telemetry.add_distance).
+    """
+    laps = laps.dropna(subset=["LapStartTime", "Time"]).sort_values(["Driver", "LapStartTime"], ignore_index=True)
+    car = car.sort_values(["Driver", "SessionTime"], kind="stable", ignore_index=True)
+    # Temps et pilotes en entiers : une seule recherche pour tous les pilotes (clé pilote, puis temps)
+    drivers = pd.Index(sorted(set(laps["Driver"]) | set(car["Driver"])))
+    span = int(max(car["SessionTime"].max(), laps["Time"].max()).value) + 1
+    lap_code = drivers.get_indexer(laps["Driver"]).astype(np.int64) * span
+    car_code = drivers.get_indexer(car["Driver"]).astype(np.int64) * span
+    starts = lap_code + laps["LapStartTime"].to_numpy().astype("timedelta64[ns]").astype(np.int64)
+    ends = lap_code + laps["Time"].to_numpy().astype("timedelta64[ns]").astype(np.int64)
+    t = car_code + car["SessionTime"].to_numpy().astype("timedelta64[ns]").astype(np.int64)
+    lap_of = np.searchsorted(starts, t, side="right") - 1
+    inside = (lap_of >= 0) & (t <= ends[np.clip(lap_of, 0, None)])
+    out = car.loc[inside, ["Driver", *CHANNELS]].reset_index(drop=True)
+    t, lap_of = t[inside], lap_of[inside]
+    out.insert(1, "LapNumber", laps["LapNumber"].to_numpy()[lap_of].astype(np.int16))
+    # Durée depuis l'échantillon précédent du même tour (depuis le début du tour pour le premier)
+    previous = np.empty_like(t)
+    previous[1:] = t[:-1]
+    first = np.ones(len(t), dtype=bool)
+    first[1:] = lap_of[1:] != lap_of[:-1]
+    previous[first] = starts[lap_of[first]]
+    step = out["Speed"].to_numpy(dtype=float) / 3.6 * (t - previous) / 1e9
+    out.insert(2, "Distance", pd.Series(step).groupby(lap_of).cumsum().to_numpy())
+    return out
+
+
+def _write_driver(path, frame):
+    """Un fichier par pilote, un row group par tour (statistiques LapNumber par row group)."""
+    table = pa.Table.from_pandas(frame[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+    bounds = np.flatnonzero(np.diff(frame["LapNumber"].to_numpy(), prepend=-1, append=-1)) if len(frame) else [0]
+
+    def write(tmp):
+        with pq.ParquetWriter(tmp, SCHEMA) as writer:
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                writer.write_table(table.slice(lo, hi - lo))
+
+    data.atomic_write(path, write)
+
+
+def build_session(season, round, event, session="R"):
+    """Charge la session (backend) et écrit sa télémétrie découpée par tour dans le cache."""
+    with timer(SESSION_SECONDS):
+        laps, car = (_backend or fastf1_session_telemetry)(season, event, session)
+    telemetry = split_laps(laps, car)
+    telemetry["Brake"] = telemetry["Brake"].astype(np.uint8)
+    telemetry["nGear"] = telemetry["nGear"].fillna(0).astype(np.int8)
+    for driver, frame in telemetry.groupby("Driver", sort=True):
+        _write_driver(_driver_path(season, round, session, driver), frame)
+    index = pd.DataFrame({
+        "Driver": laps["Driver"].to_numpy(),
+        "LapNumber": laps["LapNumber"].to_numpy().astype(np.int16),
+        "LapTime": pd.to_timedelta(laps["LapTime"]).dt.total_seconds().to_numpy(),
+    })
+    has_samples = set(zip(telemetry["Driver"], telemetry["LapNumber"]))
+    index = index[[key in has_samples for key in zip(index["Driver"], index["LapNumber"])]]
+    data.atomic_write(os.path.join(session_dir(season, round, session), "laps.parquet"), lambda tmp: index.to_parquet(tmp, index=False))
+    return index
+
+
+def laps_index(season, round, session="R"):
+    """Tours en cache (Driver, LapNumber, LapTime en s) de la session, None si elle n'est pas encore chargée."""
+    path = os.path.join(session_dir(season, round, session), "laps.parquet")
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def lap_trace(season, round, session, driver, lap, distance=None):
+    """Échantillons (Distance + CHANNELS) d'un tour, limités à la plage `distance` (bas, haut) si donnée."""
+    filters = [("LapNumber", "=", int(lap))]
+    if distance is not None:
+        filters += [("Distance", ">=", float(distance[0])), ("Distance", "<=", float(distance[1]))]
+    table = pq.read_table(_driver_path(season, round, session, driver), columns=["Distance", *CHANNELS], filters=filters)
+    return table.to_pandas()
+
+
+def lttb(x, ys, n_out):
+    """Indices retenus par Largest-Triangle-Three-Buckets, pour chaque ligne de `ys` (canaux x échantillons).
+
+    Premier et dernier points gardés ; entre les deux, n_out - 2 paquets consécutifs dont on
+    garde le point qui forme le plus grand triangle avec le point retenu au paquet précédent
+    et la moyenne du paquet suivant. Les canaux partagent x : une seule boucle sur les
+    paquets, tous les canaux traités ensemble. Retourne un tableau (canaux, n_out) ou, si
+    rien n'est à réduire, (canaux, n).
+    """
+    x = np.asarray(x, dtype=float)
+    ys = np.atleast_2d(np.asarray(ys, dtype=float))
+    n, k = len(x), ys.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.tile(np.arange(n), (k, 1))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 paquets hors extrémités
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(ys[:, :-1], edges[:-1], axis=1) / counts
+    # Moyenne du paquet suivant ; après le dernier paquet, le dernier point
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.concatenate([mean_y[:, 1:], ys[:, -1:]], axis=1)
+    rows = np.arange(k)
+    out = np.empty((k, n_out), dtype=np.int64)
+    out[:, 0], out[:, -1] = 0, n - 1
+    a = np.zeros(k, dtype=np.int64)
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a][:, np.newaxis], ys[rows, a][:, np.newaxis]
+        area = np.abs((ax - next_x[i]) * (ys[:, lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[:, i:i + 1] - ay))
+        a = lo + np.argmax(area, axis=1)
+        out[:, i + 1] = a
+    return out
+
+
+def downsample(trace, n_out):
+    """Trace d'un tour -> {canal: (distances, valeurs)} d'au plus `n_out` points par canal.
+
+    Les valeurs gardent les types du cache (float32, uint8, int8) : moins d'octets envoyés.
+    """
+    x = trace["Distance"].to_numpy()
+    keep = lttb(x, trace[CHANNELS].to_numpy(dtype=float).T, n_out)
+    return {channel: (x[keep[c]], trace[channel].to_numpy()[keep[c]]) for c, channel in enumerate(CHANNELS)}
@@ -0,0 +1,182 @@
+# Transport des figures vers le navigateur (F1_TRANSPORT, actif par défaut ; F1_TRANSPORT=0
+# pour comparer avec l'envoi d'origine) :
+#   - figures et layouts mis en cache sous forme JSON pure, tableaux numériques en binaire
+#     base64 ({"dtype", "bdata"}, décodé par plotly.js en tableaux typés) : plotly >= 6 le
+#     fait déjà pour les tableaux numpy, pas pour les listes Python passées aux go.* ;
+#   - un arbre JSON pur est sérialisé directement par orjson (plotly.io.json, moteur "auto"),
+#     sans le nettoyage récursif ni le to_dict() de chaque go.Figure à chaque réponse ;
+#   - réponses compressées (gzip, ou brotli si le module est installé) selon l'en-tête
+#     Accept-Encoding du navigateur, voir install().
+import base64
+import gzip
+import json
+import os
+import threading
+
+import flask
+import numpy as np
+import plotly.io as pio
+
+from f1dash.clientside import to_json_data
+
+try:
+    import brotli
+except ImportError:  # optionnel : gzip (bibliothèque standard) suffit
+    brotli = None
+
+ENABLED = os.environ.get("F1_TRANSPORT", "1") == "1"
+
+# Attributs de trace qui sont des tableaux de données plotly.js (les autres listes,
+# domain, range..., restent des listes JSON)
+DATA_ARRAYS = {
+    "x", "y", "z", "customdata", "values", "lat", "lon", "r", "theta",
+    "base", "width", "color", "size", "open", "high", "low", "close",
+}
+# En dessous, l'enveloppe {"dtype", "bdata"} coûte plus que la liste elle-même
+MIN_TYPED = 16
+
+# Réponses plus petites qu'un paquet TCP : pas de compression
+COMPRESS_MIN_BYTES = 1400
+COMPRESS_MIMETYPES = {
+    "application/json", "text/html", "text/css",
+    "application/javascript", "text/javascript",
+}
+
+# Dtypes plotly.js, et plus petit entier qui contient les valeurs (comme plotly.py pour int64)
+_SHORT_TYPES = {"int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2", "int32": "i4", "uint32": "u4", "float64": "f8"}
+_INT_TYPES = (np.int8, np.int16, np.int32)
+
+
+def _typed(values):
+    """Liste (ou liste de listes) de nombres -> {"dtype", "bdata"[, "shape"]}, sinon None."""
+    if len(values) < MIN_TYPED:
+        return None
+    flat = values[0] if isinstance(values[0], list) else values
+    if any(type(v) not in (int, float) for v in flat):
+        return None  # texte, None, booléens : laissés tels quels
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        return None  # lignes de longueurs différentes
+    if array.dtype.kind == "i":
+        low, high = array.min(), array.max()
+        for kind in _INT_TYPES:
+            info = np.iinfo(kind)
+            if info.min <= low and high <= info.max:
+                array = array.astype(kind)
+                break
+        else:
+            return None
+    elif array.dtype.kind != "f" or array.ndim > 2:
+        return None
+    spec = {"dtype": _SHORT_TYPES[str(array.dtype)], "bdata": base64.b64encode(np.ascontiguousarray(array)).decode("ascii")}
+    if array.ndim > 1:
+        spec["shape"] = str(array.shape)[1:-1]
+    return spec
+
+
+def _pack_trace(obj):
+    packed = {}
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            value = _pack_trace(value)
+        elif key in DATA_ARRAYS and isinstance(value, list) and value:
+            value = _typed(value) or value
+        packed[key] = value
+    return packed
+
+
+def pack_figure(fig):
+    """go.Figure ou dict -> figure JSON pure, tableaux numériques en binaire.
+
+    Sans F1_TRANSPORT, la figure est rendue telle quelle.
+    """
+    if not ENABLED:
+        return fig
+    if not isinstance(fig, dict):
+        fig = to_json_data(fig)
+    packed = dict(fig, data=[_pack_trace(trace) for trace in fig.get("data", [])])
+    if "frames" in fig:
+        packed["frames"] = [dict(frame, data=[_pack_trace(t) for t in frame.get("data", [])]) for frame in fig["frames"]]
+    return packed
+
+
+def _pack_node(node):
+    if isinstance(node, list):
+        return [_pack_node(child) for child in node]
+    if not isinstance(node, dict):
+        return node
+    if node.get("namespace") == "dash_core_components" and node.get("type") == "Graph":
+        figure = node["props"].get("figure")
+        if isinstance(figure, dict):
+            return dict(node, props=dict(node["props"], figure=pack_figure(figure)))
+    return {key: _pack_node(value) for key, value in node.items()}
+
+
+def pack_tree(component):
+    """Arbre de composants Dash -> JSON pur (figures des dcc.Graph comprises), prêt pour orjson."""
+    if not ENABLED:
+        return component
+    return _pack_node(to_json_data(component))
+
+
+def figure_from_json(text):
+    """Figure relue du cache disque : dict compact si F1_TRANSPORT, go.Figure sinon."""
+    if not ENABLED:
+        return pio.from_json(text)
+    return pack_figure(json.loads(text))
+
+
+# Corps compressés des fichiers statiques (bundles Dash, assets/), par (encodage, chemin, ETag)
+_static = {}
+_static_lock = threading.Lock()
+
+
+def _encode(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def _negotiate(accept):
+    """Meilleur encodage accepté par le navigateur parmi ceux disponibles, ou None."""
+    offers = (["br"] if brotli is not None else []) + ["gzip"]
+    best = max(offers, key=accept.quality)
+    return best if accept.quality(best) > 0 else None
+
+
+def install(server):
+    """Compresse les réponses texte de `server` (Flask) selon Accept-Encoding."""
+
+    @server.after_request
+    def compress_response(response):
+        if (
+            response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = _negotiate(flask.request.accept_encodings)
+        body = response.get_data()
+        if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+            return response
+        etag = response.get_etag()[0]
+        if etag or response.cache_control.max_age:
+            # Bundle versionné (URL avec empreinte) ou marqué par un ETag : même contenu
+            # à chaque requête, compressé une seule fois
+            key = (encoding, flask.request.path, etag)
+            with _static_lock:
+                packed = _static.get(key)
+            if packed is None:
+                packed = _encode(body, encoding)
+                with _static_lock:
+                    _static[key] = packed
+        else:
+            packed = _encode(body, encoding)
+        response.set_data(packed)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    return compress_response
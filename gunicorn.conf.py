@@ -0,0 +1,41 @@
+# Serveur de production (pré-fork) :
+#   gunicorn -c gunicorn.conf.py
+# Le maître importe le dashboard puis construit une seule fois modèles, layouts et figures
+# (preload_app + dashboard.preload) ; les workers sont forkés ensuite et partagent ces
+# données en copy-on-write au lieu de tout relire et recalculer chacun de leur côté.
+# Ni mode debug ni rechargement automatique ici : `python dashboard.py` reste le serveur
+# de développement.
+#
+# Variables : F1_BIND (0.0.0.0:8050), F1_WORKERS (nb de cœurs), F1_THREADS (4),
+# F1_PRELOAD_SEASONS (saisons à préparer, ex. "2024,2025" ; toutes par défaut),
+# F1_PRELOAD_JOB_TIMEOUT (attente max. des sessions FastF1 avant le fork, 120 s).
+import gc
+import multiprocessing
+import os
+import time
+
+wsgi_app = "dashboard:server"
+bind = os.environ.get("F1_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("F1_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("F1_THREADS", "4"))
+preload_app = True
+reload = False
+timeout = 120
+
+
+def when_ready(server):
+    """Maître : application importée (preload_app), workers pas encore forkés."""
+    import dashboard
+
+    seasons = os.environ.get("F1_PRELOAD_SEASONS", "")
+    season_list = [int(s) for s in seasons.split(",") if s.strip()] or None
+    t0 = time.perf_counter()
+    idle = dashboard.preload(season_list, job_timeout=float(os.environ.get("F1_PRELOAD_JOB_TIMEOUT", "120")))
+    server.log.info("Dashboard préchargé en %.1f s", time.perf_counter() - t0)
+    if not idle:
+        server.log.warning("Session FastF1 encore en cours au fork : elle sera relancée par les workers")
+    # Objets construits avant le fork sortis du ramasse-miettes : un cycle de GC dans un
+    # worker ne réécrit plus leurs en-têtes, leurs pages mémoire restent partagées
+    gc.collect()
+    gc.freeze()